@@ -0,0 +1,130 @@
+"""
+Armazenamento de notícias coletadas em SQLite
+Histórico consultável por índices (hash, fonte, data de coleta e de
+publicação) em vez de recarregar arquivos CSV/JSON inteiros
+"""
+
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Iterable, Optional, Set
+import logging
+
+import pandas as pd
+
+from news_collector import NewsArticle, ArticleBatch
+
+logger = logging.getLogger(__name__)
+
+# Linhas por executemany e limite de parâmetros por consulta
+_INSERT_CHUNK_SIZE = 1000
+_QUERY_CHUNK_SIZE = 900
+
+_COLUMNS = NewsArticle.FIELDS + ('collection_id',)
+
+
+class ArticleStore:
+    """Histórico de notícias em SQLite (modo WAL) com inserções em lote"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode = WAL')
+        self._conn.execute('PRAGMA synchronous = NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS articles ('
+            '  hash_id TEXT PRIMARY KEY,'
+            '  title TEXT NOT NULL,'
+            '  url TEXT NOT NULL,'
+            '  source TEXT NOT NULL,'
+            '  published_date TEXT,'
+            '  summary TEXT,'
+            '  content TEXT,'
+            '  collected_at TEXT,'
+            '  collection_id TEXT NOT NULL'
+            ')'
+        )
+        for column in ('source', 'collected_at', 'published_date', 'collection_id'):
+            self._conn.execute(f'CREATE INDEX IF NOT EXISTS idx_articles_{column} ON articles ({column})')
+        self._conn.commit()
+
+    def add(self, articles, collection_id: str = None) -> str:
+        """Grava as notícias de uma coleta e devolve o identificador da coleta
+
+        Notícias já armazenadas mantêm a data de coleta original, mas passam a
+        pertencer à coleta mais recente.
+        """
+        # Microssegundos evitam que duas coletas no mesmo segundo virem uma só
+        collection_id = collection_id or datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+        frame = ArticleBatch.from_articles(articles).to_frame().astype(object)
+        frame = frame.where(frame.notna(), None)
+        frame['collection_id'] = collection_id
+
+        rows = list(frame.itertuples(index=False, name=None))
+        placeholders = ','.join('?' * len(_COLUMNS))
+        with self._lock:
+            with self._conn:
+                for start in range(0, len(rows), _INSERT_CHUNK_SIZE):
+                    self._conn.executemany(
+                        f'INSERT INTO articles ({",".join(_COLUMNS)}) VALUES ({placeholders}) '
+                        'ON CONFLICT (hash_id) DO UPDATE SET collection_id = excluded.collection_id',
+                        rows[start:start + _INSERT_CHUNK_SIZE]
+                    )
+        logger.info(f"{len(rows)} notícias gravadas no histórico (coleta {collection_id})")
+        return collection_id
+
+    def find_existing(self, hash_ids: Iterable[str]) -> Set[str]:
+        """Retorna quais dos hashes informados já estão armazenados"""
+        hash_ids = list(hash_ids)
+        found = set()
+        with self._lock:
+            for start in range(0, len(hash_ids), _QUERY_CHUNK_SIZE):
+                chunk = hash_ids[start:start + _QUERY_CHUNK_SIZE]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self._conn.execute(f'SELECT hash_id FROM articles WHERE hash_id IN ({placeholders})', chunk)
+                found.update(row[0] for row in rows)
+        return found
+
+    def latest_collection_id(self) -> Optional[str]:
+        with self._lock:
+            return self._conn.execute('SELECT MAX(collection_id) FROM articles').fetchone()[0]
+
+    def load(self, collection_id: str = None, since: datetime = None, source: str = None,
+             limit: int = None) -> ArticleBatch:
+        """Consulta notícias por coleta, data de coleta e/ou fonte"""
+        conditions, params = [], []
+        if collection_id is not None:
+            conditions.append('collection_id = ?')
+            params.append(collection_id)
+        if since is not None:
+            conditions.append('collected_at >= ?')
+            params.append(since.isoformat())
+        if source is not None:
+            conditions.append('source = ?')
+            params.append(source)
+
+        query = f'SELECT {",".join(NewsArticle.FIELDS)} FROM articles'
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+        query += ' ORDER BY collected_at, rowid'
+        if limit is not None:
+            query += ' LIMIT ?'
+            params.append(limit)
+
+        with self._lock:
+            frame = pd.read_sql_query(query, self._conn, params=params)
+        return ArticleBatch(frame)
+
+    def load_latest_collection(self) -> ArticleBatch:
+        collection_id = self.latest_collection_id()
+        return self.load(collection_id=collection_id) if collection_id else ArticleBatch()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM articles').fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
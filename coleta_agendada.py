@@ -15,6 +15,7 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from config import LOG_CONFIG, OUTPUT_CONFIG
 from news_collector import NewsCollectionManager
 from data_processor import DataProcessor
+from output_stage import OutputStage, SINK_LABELS, default_sinks
 
 
 def setup_logging():
@@ -57,17 +58,18 @@ def executar_coleta_agendada():
         
         print(f"✅ Coletadas {len(articles)} notícias")
         
-        # Salva resultados (opcional - para backup)
-        if OUTPUT_CONFIG.get('save_to_file', False):
+        # Histórico em data/ (restaurado entre execuções pelo workflow) e,
+        # opcionalmente, arquivos em output/ para backup
+        save_to_file = OUTPUT_CONFIG.get('save_to_file', False)
+        if save_to_file:
             print("💾 Salvando resultados...")
-            csv_file = data_processor.save_to_csv(articles)
-            json_file = data_processor.save_to_json(articles)
-            html_file = data_processor.save_to_html(articles)
-            
+        output, results = OutputStage(data_processor).run(articles, default_sinks(include_files=save_to_file))
+        
+        if save_to_file:
             print(f"✅ Resultados salvos:")
-            print(f"   CSV: {os.path.basename(csv_file)}")
-            print(f"   JSON: {os.path.basename(json_file)}")
-            print(f"   HTML: {os.path.basename(html_file)}")
+            for sink, result in results.items():
+                if result:
+                    print(f"   {SINK_LABELS[sink]}: {os.path.basename(result)}")
         
         # Gera resumo
         summary = data_processor.generate_daily_summary(articles)
@@ -78,14 +80,18 @@ def executar_coleta_agendada():
         # Envia email
         if OUTPUT_CONFIG.get('save_to_email', False):
             print("\n📧 Enviando email...")
-            if data_processor.send_email_report(articles):
+            if data_processor.send_email_report(articles, html_content=output.html):
                 print("✅ Email enviado com sucesso!")
+                # Só notícias enviadas deixam de ser reenviadas nas próximas execuções
+                collection_manager.mark_delivered(output.batch)
                 return True
             else:
                 print("❌ Erro ao enviar email")
                 return False
         else:
             print("\n📧 Email não configurado para envio automático")
+            if not output.failed_sinks:
+                collection_manager.mark_delivered(output.batch)
             return False
         
     except Exception as e:
@@ -15,7 +15,7 @@ def getenv_int(name: str, default: int) -> int:
 
 def getenv_bool(name: str, default: bool = False) -> bool:
     raw = os.getenv(name, "")
-    if raw is None:
+    if raw is None or not str(raw).strip():
         return default
     return str(raw).strip().lower() in ("1", "true", "yes", "on")
 
@@ -23,31 +23,60 @@ def getenv_bool(name: str, default: bool = False) -> bool:
 
 
 # URLs das fontes de notícias
+# Regras opcionais por fonte: 'link_patterns' / 'exclude_patterns' (regex da URL),
+# 'date_tags', 'summary_tags', 'summary_class_pattern', 'container_tags',
+# 'min_title_length', 'max_articles', 'parser', 'url_rewrites' e 'enabled'
+# Fontes 'rss'/'atom' leem 'feed_url' e usam 'url' (HTML) como alternativa
 NEWS_SOURCES = {
     'g1_tecnologia': {
         'url': 'https://g1.globo.com/tecnologia/',
         'name': 'G1 Tecnologia',
-        'type': 'html'
+        'type': 'rss',
+        'feed_url': 'https://g1.globo.com/rss/g1/tecnologia/',
+        'rate_limit': {'requests_per_second': 0.5, 'burst': 1},
+        'link_patterns': [r'/tecnologia/noticia/', r'/tecnologia/', r'/noticia/'],
+        'url_rewrites': [(r'^https?://g1\.globo\.com/google/amp/', 'https://g1.globo.com/')]
     },
     'folha_tec': {
         'url': 'https://www1.folha.uol.com.br/tec/',
         'name': 'Folha de S.Paulo - Tec',
-        'type': 'html'
+        'type': 'rss',
+        'feed_url': 'https://feeds.folha.uol.com.br/tec/rss091.xml',
+        'rate_limit': {'requests_per_second': 0.5, 'burst': 1},
+        'link_patterns': [r'/tec/', r'/noticias/', r'/colunas/']
     },
     'uol_tilt': {
         'url': 'https://www.uol.com.br/tilt/',
         'name': 'UOL Tilt',
-        'type': 'html'
+        'type': 'html',
+        'rate_limit': {'requests_per_second': 0.5, 'burst': 1},
+        'link_patterns': [r'/tilt/', r'/noticias/', r'/colunas/']
     }
 }
 
 # Configurações de coleta
 COLLECTION_CONFIG = {
     'max_articles_per_source': 20,
+    'max_concurrent_sources': getenv_int('MAX_CONCURRENT_SOURCES', 4),  # 1 = coleta sequencial
+    # Limite padrão por host (token bucket) para hosts sem 'rate_limit' próprio
+    'default_rate_limit': {'requests_per_second': 0.5, 'burst': 1},
+    'parser_engine': 'lxml',           # 'lxml' (XPath) ou 'soup' (BeautifulSoup + lxml)
+    'force_https': True,               # URLs canônicas sempre em https
+    'max_response_bytes': 5 * 1024 * 1024,  # Limite de download por página (ou 'max_bytes' na fonte)
+    'early_abort_link_factor': 3,      # Para o download após max_articles x fator links candidatos (0 = nunca)
+    # Coleta incremental: só processa notícias ainda não vistas em cada fonte
+    'incremental_collection': getenv_bool('INCREMENTAL_COLLECTION', True),
+    'incremental_stop_after_known': 5, # Para a varredura após N notícias conhecidas seguidas
+    'incremental_max_ids': 500,        # Identificadores guardados por fonte
+    'source_state_file': 'source_state.json',  # Arquivo em DATA_DIR
+    'max_article_age_hours': getenv_int('MAX_ARTICLE_AGE_HOURS', 24),  # Janela de publicação (0 = sem limite)
+    'keep_undated_articles': True,     # Mantém notícias sem data reconhecível
     'collection_interval_hours': 24,   # Coleta 1 vez por dia
     'daily_summary_time': '13:00',     # Resumo diário às 13h (coerente com BR)
     'remove_duplicates': True,
     'min_title_length': 10,
+    'keywords_fold_accents': True,     # "inovacao" casa com "inovação"
+    'keywords_word_boundaries': True,  # "IA" não casa dentro de "Bahia"
     'keywords_filter': [
         'tecnologia', 'inovação', 'startup', 'IA', 'inteligência artificial',
         'machine learning', 'blockchain', 'fintech', 'edtech', 'healthtech',
@@ -63,11 +92,46 @@ OUTPUT_CONFIG = {
 
     'save_to_email': True,                  # Enviar por e-mail
     'output_directory': 'output',
-    'file_format': os.getenv('FILE_FORMAT', 'html'),  # 'html' é ideal p/ e-mail
+    # Formatos gravados em output/, separados por vírgula: csv, json, html, parquet
+    'file_format': os.getenv('FILE_FORMAT', '') or 'csv,json,html',
+    'parquet_directory': 'parquet',         # Dataset particionado por data e fonte (em output/)
+    'parquet_compression': 'zstd',
+    'parquet_row_group_size': 50000,
+    'output_workers': getenv_int('OUTPUT_WORKERS', 4),  # Destinos gravados em paralelo (1 = sequencial)
+    'report_cache_size': 8,                 # Relatórios HTML mantidos em memória por conjunto de notícias
+    'manifest_file': 'manifest.json',       # Índice dos arquivos de output/ (último por tipo e execuções)
+    'manifest_max_runs': 100,
     'email_recipients': [os.getenv('EMAIL_TO', 'sheila.moraes@templo.cc')],
     'email_subject_prefix': os.getenv('EMAIL_SUBJECT_PREFIX', '[News Auto] Resumo Diário de Tecnologia')
 }
 
+# Histórico de notícias em SQLite (consultas indexadas em vez de reler CSV/JSON)
+STORAGE_CONFIG = {
+    'article_store': getenv_bool('ARTICLE_STORE', True),
+    'db_file': 'articles.db'           # Arquivo em DATA_DIR
+}
+
+# Diário append-only (JSON Lines) com um arquivo por dia
+JOURNAL_CONFIG = {
+    'enabled': getenv_bool('ARTICLE_JOURNAL', True),
+    'directory': 'journal',            # Subdiretório de DATA_DIR
+    'compression': os.getenv('JOURNAL_COMPRESSION', 'gzip') or None,  # 'gzip', 'zstd' (pip install zstandard) ou vazio
+    'buffer_kb': 64
+}
+
+# Compactação e retenção dos arquivos de output/
+ARCHIVE_CONFIG = {
+    'enabled': getenv_bool('OUTPUT_COMPACTION', True),
+    'directory': 'archive',                           # Subdiretório de output/
+    'period': os.getenv('ARCHIVE_PERIOD', '') or 'monthly',  # 'daily' ou 'monthly'
+    'compact_after_days': getenv_int('COMPACT_AFTER_DAYS', 2),  # Execuções mais recentes ficam em output/
+    'archive_retention_days': getenv_int('ARCHIVE_RETENTION_DAYS', 365),  # 0 = manter para sempre
+    'summary_retention_days': getenv_int('SUMMARY_RETENTION_DAYS', 90),   # Resumos diários; 0 = manter
+    'report_retention_days': getenv_int('REPORT_RETENTION_DAYS', 90),     # Relatórios HTML; 0 = manter
+    'max_open_runs': 32,                              # Execuções lidas por vez em cada junção
+    'maintenance_time': '03:30'                       # Horário da manutenção no agendador
+}
+
 # Configurações de e-mail (lidas de variáveis de ambiente / Secrets no GitHub)
 EMAIL_CONFIG = {
     'smtp_server': os.getenv('SMTP_HOST', 'smtp.gmail.com'),
@@ -79,6 +143,45 @@ EMAIL_CONFIG = {
     'from_name': os.getenv('EMAIL_FROM_NAME', 'Sistema de Coleta de Notícias')
 }
 
+# Deduplicação entre execuções (índice persistente de notícias já coletadas)
+DEDUP_CONFIG = {
+    'persistent_index': getenv_bool('PERSISTENT_DEDUP', True),
+    'index_file': 'seen_articles.db',  # Arquivo SQLite em DATA_DIR
+    'ttl_days': 30,                    # Após esse prazo a notícia pode voltar a ser enviada
+    'near_duplicates': True,           # Remove a mesma notícia vinda de outra fonte/URL
+    'near_duplicate_threshold': 0.6    # Similaridade (Jaccard) mínima entre títulos ou resumos
+}
+
+# Cliente HTTP compartilhado (pool de conexões, keep-alive e compressão)
+HTTP_CONFIG = {
+    'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'pool_connections': 10,            # Quantidade de hosts com pool mantido
+    'pool_maxsize': 4,                 # Conexões mantidas por host
+    'host_pool_sizes': {},             # Ex.: {'www.uol.com.br': 8}
+    'http2': getenv_bool('HTTP2', False)  # Requer: pip install 'httpx[http2]'
+}
+
+# Resiliência das requisições (timeouts, retentativas e circuit breaker)
+# 'connect_timeout' e 'read_timeout' também podem ser definidos por fonte
+RESILIENCE_CONFIG = {
+    'connect_timeout': 5,              # Segundos para estabelecer a conexão
+    'read_timeout': 20,                # Segundos aguardando dados do servidor
+    'max_retries': 3,
+    'backoff_base_seconds': 1,         # Espera máxima dobra a cada tentativa (com jitter)
+    'backoff_max_seconds': 30,
+    'retry_statuses': [429, 500, 502, 503, 504],
+    'failure_threshold': 3,            # Falhas seguidas até abrir o circuito da fonte
+    'recovery_timeout_minutes': 30,    # Tempo com o circuito aberto antes de nova tentativa
+    'circuit_state_file': 'circuit_breakers.json'  # Arquivo em DATA_DIR
+}
+
+# Cache HTTP (requisições condicionais com ETag / Last-Modified)
+CACHE_CONFIG = {
+    'enabled': getenv_bool('HTTP_CACHE', True),
+    'directory': 'http_cache',         # Subdiretório de DATA_DIR
+    'max_size_mb': 50
+}
+
 # Configurações de log
 LOG_CONFIG = {
     'log_level': 'INFO',
@@ -91,8 +194,9 @@ LOG_CONFIG = {
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 OUTPUT_DIR = os.path.join(BASE_DIR, OUTPUT_CONFIG['output_directory'])
 LOGS_DIR = os.path.join(BASE_DIR, 'logs')
+DATA_DIR = os.path.join(BASE_DIR, 'data')  # Estado persistente entre execuções
 
 # Criar diretórios se não existirem
-for directory in [OUTPUT_DIR, LOGS_DIR]:
+for directory in [OUTPUT_DIR, LOGS_DIR, DATA_DIR]:
     if not os.path.exists(directory):
         os.makedirs(directory)
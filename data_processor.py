@@ -4,24 +4,32 @@ Inclui filtragem, remoção de duplicatas e geração de relatórios
 """
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
 import json
 import os
-from datetime import datetime, timedelta
-from typing import List, Dict, Set
+from datetime import date, datetime, timedelta
+from typing import Iterator, List, Dict, Optional, Set
 import logging
-from collections import defaultdict
-import re
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
 from email import encoders
 
-from config import OUTPUT_CONFIG, OUTPUT_DIR, COLLECTION_CONFIG, EMAIL_CONFIG
-from news_collector import NewsArticle
+from config import OUTPUT_CONFIG, OUTPUT_DIR, COLLECTION_CONFIG, EMAIL_CONFIG, STORAGE_CONFIG, JOURNAL_CONFIG, ARCHIVE_CONFIG, DATA_DIR
+from news_collector import NewsArticle, ArticleBatch
+from article_store import ArticleStore
+from journal import ArticleJournal
+from report_renderer import ReportRenderer
+from output_manifest import OutputManifest
+from output_compactor import OutputCompactor
 
 logger = logging.getLogger(__name__)
 
+PARQUET_SCHEMA = pa.schema([(field, pa.string()) for field in NewsArticle.FIELDS])
+PARQUET_PARTITIONING = ds.partitioning(pa.schema([('date', pa.string()), ('source', pa.string())]), flavor='hive')
+
 
 class DataProcessor:
     """Processa e organiza os dados coletados"""
@@ -29,6 +37,27 @@ class DataProcessor:
     def __init__(self):
         self.output_dir = OUTPUT_DIR
         self.ensure_output_directory()
+        self.article_store = ArticleStore(
+            os.path.join(DATA_DIR, STORAGE_CONFIG['db_file'])
+        ) if STORAGE_CONFIG['article_store'] else None
+        self.journal = ArticleJournal(
+            os.path.join(DATA_DIR, JOURNAL_CONFIG['directory']),
+            compression=JOURNAL_CONFIG['compression'],
+            buffer_size=JOURNAL_CONFIG['buffer_kb'] * 1024
+        ) if JOURNAL_CONFIG['enabled'] else None
+        self.report_renderer = ReportRenderer(OUTPUT_CONFIG['report_cache_size'])
+        self.manifest = OutputManifest(self.output_dir, OUTPUT_CONFIG['manifest_file'], OUTPUT_CONFIG['manifest_max_runs'])
+        self.compactor = OutputCompactor(
+            self.output_dir,
+            os.path.join(self.output_dir, ARCHIVE_CONFIG['directory']),
+            period=ARCHIVE_CONFIG['period'],
+            compact_after_days=ARCHIVE_CONFIG['compact_after_days'],
+            archive_retention_days=ARCHIVE_CONFIG['archive_retention_days'],
+            summary_retention_days=ARCHIVE_CONFIG['summary_retention_days'],
+            report_retention_days=ARCHIVE_CONFIG['report_retention_days'],
+            max_open_runs=ARCHIVE_CONFIG['max_open_runs'],
+            manifest=self.manifest
+        ) if ARCHIVE_CONFIG['enabled'] else None
     
     def ensure_output_directory(self):
         """Garante que o diretório de saída existe"""
@@ -43,19 +72,42 @@ class DataProcessor:
         
         filepath = os.path.join(self.output_dir, filename)
         
-        # Converte artigos para lista de dicionários
-        articles_data = [article.to_dict() for article in articles]
-        
-        # Cria DataFrame
-        df = pd.DataFrame(articles_data)
+        # O lote já é um DataFrame: grava as colunas diretamente
+        df = ArticleBatch.from_articles(articles).to_frame()
         
         # Salva CSV
         df.to_csv(filepath, index=False, encoding='utf-8-sig')
         logger.info(f"Notícias salvas em CSV: {filepath}")
+        self.manifest.record_file('csv', filepath, len(df))
         
         return filepath
     
-    def save_to_json(self, articles: List[NewsArticle], filename: str = None) -> str:
+    def save_to_store(self, articles) -> Optional[str]:
+        """Grava as notícias no histórico SQLite e devolve o identificador da coleta"""
+        if self.article_store is None:
+            return None
+        return self.article_store.add(articles)
+    
+    def append_to_journal(self, articles, records: List[Dict] = None) -> Optional[str]:
+        """Acrescenta as notícias ao diário do dia, sem reescrever o que já foi gravado"""
+        if self.journal is None:
+            return None
+        return self.journal.append(records if records is not None else ArticleBatch.from_articles(articles).iter_records())
+    
+    def compact_outputs(self) -> Optional[Dict[str, int]]:
+        """Compacta as execuções antigas de output/ e aplica a retenção configurada"""
+        if self.compactor is None:
+            return None
+        return self.compactor.run()
+    
+    def iter_journal(self, start: date = None, end: date = None) -> Iterator[NewsArticle]:
+        """Lê o diário em streaming, uma notícia por vez"""
+        if self.journal is None:
+            return
+        for record in self.journal.iter_records(start, end):
+            yield NewsArticle.from_dict(record)
+    
+    def save_to_json(self, articles: List[NewsArticle], filename: str = None, records: List[Dict] = None) -> str:
         """Salva notícias em arquivo JSON"""
         if not filename:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -63,17 +115,67 @@ class DataProcessor:
         
         filepath = os.path.join(self.output_dir, filename)
         
-        # Converte artigos para lista de dicionários
-        articles_data = [article.to_dict() for article in articles]
+        # Converte artigos para lista de dicionários (se ainda não convertidos)
+        articles_data = records if records is not None else ArticleBatch.from_articles(articles).to_records()
         
         # Salva JSON
         with open(filepath, 'w', encoding='utf-8') as f:
             json.dump(articles_data, f, ensure_ascii=False, indent=2)
         
         logger.info(f"Notícias salvas em JSON: {filepath}")
+        self.manifest.record_file('json', filepath, len(articles_data))
         return filepath
     
-    def save_to_html(self, articles: List[NewsArticle], filename: str = None) -> str:
+    def save_to_parquet(self, articles, directory: str = None) -> str:
+        """Acrescenta as notícias ao dataset Parquet particionado por data de coleta e fonte
+        
+        Cada gravação cria novos arquivos nas partições (date=AAAA-MM-DD/source=...),
+        sem reescrever os existentes.
+        """
+        directory = directory or os.path.join(self.output_dir, OUTPUT_CONFIG['parquet_directory'])
+        frame = ArticleBatch.from_articles(articles).to_frame()
+        table = pa.Table.from_pandas(frame, schema=PARQUET_SCHEMA, preserve_index=False)
+        table = table.append_column('date', pa.array(frame['collected_at'].astype(str).str[:10], pa.string()))
+        
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        ds.write_dataset(
+            table, directory,
+            format='parquet',
+            partitioning=PARQUET_PARTITIONING,
+            basename_template=f"part-{timestamp}-{{i}}.parquet",
+            existing_data_behavior='overwrite_or_ignore',
+            file_options=ds.ParquetFileFormat().make_write_options(compression=OUTPUT_CONFIG['parquet_compression']),
+            max_rows_per_group=OUTPUT_CONFIG['parquet_row_group_size'],
+            min_rows_per_group=0
+        )
+        
+        logger.info(f"Notícias salvas em Parquet: {directory}")
+        self.manifest.record_file('parquet', directory, len(frame))
+        return directory
+    
+    def read_parquet(self, start: date = None, end: date = None, sources: List[str] = None,
+                     columns: List[str] = None, directory: str = None) -> pd.DataFrame:
+        """Lê o dataset Parquet lendo apenas as partições e colunas necessárias"""
+        directory = directory or os.path.join(self.output_dir, OUTPUT_CONFIG['parquet_directory'])
+        if not os.path.isdir(directory):
+            return pd.DataFrame(columns=columns or list(NewsArticle.FIELDS))
+        
+        dataset = ds.dataset(directory, format='parquet', partitioning=PARQUET_PARTITIONING)
+        conditions = []
+        if start:
+            conditions.append(ds.field('date') >= start.isoformat())
+        if end:
+            conditions.append(ds.field('date') <= end.isoformat())
+        if sources:
+            conditions.append(ds.field('source').isin(sources))
+        
+        expression = None
+        for condition in conditions:
+            expression = condition if expression is None else expression & condition
+        
+        return dataset.to_table(columns=columns, filter=expression).to_pandas()
+    
+    def save_to_html(self, articles: List[NewsArticle], filename: str = None, html_content: str = None) -> str:
         """Salva notícias em arquivo HTML formatado"""
         if not filename:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -81,24 +183,26 @@ class DataProcessor:
         
         filepath = os.path.join(self.output_dir, filename)
         
-        # Gera HTML
-        html_content = self._generate_html_report(articles)
-        
-        # Salva arquivo
+        # Salva arquivo (sem relatório pronto, grava em blocos direto no arquivo)
         with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+            if html_content is None:
+                self.report_renderer.render_to(f, articles, self._period_label())
+            else:
+                f.write(html_content)
         
         logger.info(f"Notícias salvas em HTML: {filepath}")
+        self.manifest.record_file('html', filepath, len(articles))
         return filepath
     
-    def send_email_report(self, articles: List[NewsArticle], subject: str = None) -> bool:
+    def send_email_report(self, articles: List[NewsArticle], subject: str = None, html_content: str = None) -> bool:
         """Envia relatório por email"""
         try:
             if not subject:
                 subject = OUTPUT_CONFIG['email_subject_prefix']
             
-            # Gera HTML para email
-            html_content = self._generate_html_report(articles)
+            # Gera HTML para email (ou reaproveita o relatório já gerado)
+            if html_content is None:
+                html_content = self.render_html_report(articles)
             
             # Configura mensagem
             msg = MIMEMultipart('alternative')
@@ -128,76 +232,23 @@ class DataProcessor:
             logger.error(f"Erro ao enviar email: {str(e)}")
             return False
     
-    def _generate_html_report(self, articles: List[NewsArticle]) -> str:
+    def render_html_report(self, articles: List[NewsArticle]) -> str:
         """Gera relatório HTML formatado"""
-        timestamp = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
-        
-        html = f"""
-        <!DOCTYPE html>
-        <html lang="pt-BR">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>Relatório de Notícias de Tecnologia</title>
-            <style>
-                body {{ font-family: Arial, sans-serif; margin: 20px; background-color: #f5f5f5; }}
-                .container {{ max-width: 800px; margin: 0 auto; background: white; padding: 20px; border-radius: 10px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }}
-                .header {{ text-align: center; border-bottom: 3px solid #007bff; padding-bottom: 20px; margin-bottom: 30px; }}
-                .header h1 {{ color: #007bff; margin: 0; }}
-                .header .timestamp {{ color: #666; font-size: 14px; }}
-                .stats {{ background: #f8f9fa; padding: 15px; border-radius: 5px; margin-bottom: 20px; }}
-                .stats h3 {{ margin-top: 0; color: #495057; }}
-                .article {{ border-left: 4px solid #007bff; padding: 15px; margin: 15px 0; background: #f8f9fa; border-radius: 0 5px 5px 0; }}
-                .article h3 {{ margin: 0 0 10px 0; color: #212529; }}
-                .article .source {{ color: #6c757d; font-size: 12px; margin-bottom: 5px; }}
-                .article .url {{ color: #007bff; text-decoration: none; }}
-                .article .url:hover {{ text-decoration: underline; }}
-                .footer {{ text-align: center; margin-top: 30px; padding-top: 20px; border-top: 1px solid #dee2e6; color: #6c757d; }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <h1>📰 Resumo Diário de Tecnologia</h1>
-                    <div class="timestamp">Gerado em: {timestamp}</div>
-                </div>
-                
-                <div class="stats">
-                    <h3>📊 Estatísticas da Coleta</h3>
-                    <p><strong>Total de notícias:</strong> {len(articles)}</p>
-                    <p><strong>Fontes consultadas:</strong> G1, Folha, UOL Tilt</p>
-                    <p><strong>Período:</strong> Últimas 24 horas</p>
-                </div>
-                
-                <h2>🔍 Notícias Coletadas</h2>
-        """
-        
-        # Adiciona cada artigo
-        for i, article in enumerate(articles, 1):
-            summary_text = article.summary[:200] + '...' if article.summary and len(article.summary) > 200 else (article.summary or 'Resumo não disponível')
-            html += f"""
-                <div class="article">
-                    <div class="source">📰 Fonte: {article.source}</div>
-                    <h3>{i}. {article.title}</h3>
-                    <p>{summary_text}</p>
-                    <a href="{article.url}" class="url" target="_blank">🔗 Ler notícia completa</a>
-                </div>
-            """
-        
-        html += """
-                <div class="footer">
-                    <p>📧 Sistema de Coleta Automatizada de Notícias</p>
-                    <p>🤖 Coletado automaticamente via Python</p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
-        
-        return html
+        return self.report_renderer.render(articles, self._period_label())
+    
+    def _period_label(self) -> str:
+        """Descrição da janela de tempo aplicada na coleta"""
+        hours = COLLECTION_CONFIG['max_article_age_hours']
+        if not hours:
+            return "Todas as notícias coletadas"
+        if hours % 24 == 0 and hours > 24:
+            return f"Últimos {hours // 24} dias"
+        return f"Últimas {hours} horas"
     
-    def load_existing_data(self, filepath: str) -> List[Dict]:
-        """Carrega dados existentes de um arquivo"""
+    def load_existing_data(self, filepath: str = None) -> List[Dict]:
+        """Carrega dados existentes de um arquivo ou, sem arquivo, da última coleta no histórico"""
+        if filepath is None:
+            return self.load_existing_batch().to_records()
         try:
             if filepath.endswith('.csv'):
                 df = pd.read_csv(filepath, encoding='utf-8-sig')
@@ -212,78 +263,79 @@ class DataProcessor:
             logger.error(f"Erro ao carregar arquivo {filepath}: {e}")
             return []
     
-    def merge_with_existing(self, new_articles: List[NewsArticle], existing_filepath: str) -> List[NewsArticle]:
-        """Combina novas notícias com dados existentes"""
-        existing_data = self.load_existing_data(existing_filepath)
-        
-        if not existing_data:
-            return new_articles
-        
-        # Converte dados existentes para objetos NewsArticle
-        existing_articles = []
-        for data in existing_data:
+    def load_existing_batch(self, filepath: str = None) -> ArticleBatch:
+        """Carrega um arquivo de coleta (ou a última coleta do histórico) como lote colunar"""
+        if filepath is None:
+            return self.article_store.load_latest_collection() if self.article_store is not None else ArticleBatch()
+        if filepath.endswith('.csv'):
             try:
-                article = NewsArticle(
-                    title=data['title'],
-                    url=data['url'],
-                    source=data['source'],
-                    published_date=data.get('published_date'),
-                    summary=data.get('summary'),
-                    content=data.get('content')
-                )
-                article.collected_at = datetime.fromisoformat(data['collected_at'])
-                article.hash_id = data['hash_id']
-                existing_articles.append(article)
+                batch = ArticleBatch(pd.read_csv(filepath, encoding='utf-8-sig'))
             except Exception as e:
-                logger.warning(f"Erro ao converter artigo existente: {e}")
-                continue
+                logger.error(f"Erro ao carregar arquivo {filepath}: {e}")
+                return ArticleBatch()
+        else:
+            batch = ArticleBatch.from_records(self.load_existing_data(filepath))
+        
+        valid = batch.frame[['title', 'url', 'source']].notna().all(axis=1).to_numpy()
+        if not valid.all():
+            logger.warning(f"Ignoradas {int((~valid).sum())} notícias incompletas em {filepath}")
+            batch = batch.filter(valid)
+        return batch
+    
+    def merge_with_existing(self, new_articles, existing_filepath: str = None) -> ArticleBatch:
+        """Combina novas notícias com dados existentes
         
-        # Combina listas
-        all_articles = existing_articles + new_articles
+        Sem arquivo, os dados existentes são a última coleta do histórico
+        SQLite (apenas lida; o histórico não é alterado).
+        """
+        new_batch = ArticleBatch.from_articles(new_articles)
+        existing_batch = self.load_existing_batch(existing_filepath)
         
-        # Remove duplicatas
-        seen_hashes = set()
-        unique_articles = []
+        if not existing_batch:
+            return new_batch
         
-        for article in all_articles:
-            if article.hash_id not in seen_hashes:
-                seen_hashes.add(article.hash_id)
-                unique_articles.append(article)
+        # Combina os lotes e remove duplicatas
+        unique_articles = ArticleBatch.concat([existing_batch, new_batch]).drop_duplicates('hash_id')
         
-        logger.info(f"Combinadas {len(existing_articles)} notícias existentes com {len(new_articles)} novas")
+        logger.info(f"Combinadas {len(existing_batch)} notícias existentes com {len(new_batch)} novas")
         logger.info(f"Total após remoção de duplicatas: {len(unique_articles)}")
         
         return unique_articles
     
+    def load_recent_articles(self, hours: int = 24) -> ArticleBatch:
+        """Notícias coletadas nas últimas horas, consultadas no histórico"""
+        if self.article_store is None:
+            return ArticleBatch()
+        return self.article_store.load(since=datetime.now() - timedelta(hours=hours))
+    
     def generate_daily_summary(self, articles: List[NewsArticle]) -> Dict:
         """Gera resumo diário das notícias"""
         if not articles:
             return {}
         
+        batch = ArticleBatch.from_articles(articles)
+        
         # Estatísticas por fonte
-        source_stats = defaultdict(int)
-        for article in articles:
-            source_stats[article.source] += 1
-        
-        # Palavras-chave mais frequentes
-        keyword_freq = defaultdict(int)
-        for article in articles:
-            title_words = re.findall(r'\b\w+\b', article.title.lower())
-            for word in title_words:
-                if len(word) > 3:  # Ignora palavras muito curtas
-                    keyword_freq[word] += 1
+        source_stats = batch.source_counts()
+        
+        # Palavras-chave mais frequentes (ordem de aparição desempata)
+        words = batch.frame['title'].str.lower().str.findall(r'\b\w+\b').explode()
+        words = words[words.str.len() > 3]  # Ignora palavras muito curtas
+        keyword_freq = words.value_counts(sort=False).sort_values(ascending=False, kind='stable')
         
         # Top 10 palavras-chave
-        top_keywords = sorted(keyword_freq.items(), key=lambda x: x[1], reverse=True)[:10]
+        top_keywords = [(word, int(count)) for word, count in keyword_freq.head(10).items()]
         
         # Notícias mais recentes
-        recent_articles = sorted(articles, key=lambda x: x.collected_at or datetime.now(), reverse=True)[:5]
+        collected_at = pd.to_datetime(batch.frame['collected_at'], errors='coerce')
+        order = collected_at.fillna(pd.Timestamp.now()).sort_values(ascending=False, kind='stable').index
+        recent_articles = ArticleBatch(batch.frame.loc[order[:5]])
         
         summary = {
-            'total_articles': len(articles),
-            'sources': dict(source_stats),
+            'total_articles': len(batch),
+            'sources': source_stats,
             'top_keywords': top_keywords,
-            'recent_articles': [article.to_dict() for article in recent_articles],
+            'recent_articles': recent_articles.to_records(),
             'generated_at': datetime.now().isoformat(),
             'date': datetime.now().strftime('%d/%m/%Y')
         }
@@ -302,6 +354,7 @@ class DataProcessor:
             json.dump(summary, f, ensure_ascii=False, indent=2)
         
         logger.info(f"Resumo diário salvo: {filepath}")
+        self.manifest.record_file('summary', filepath, summary.get('total_articles'))
         return filepath
 
 
@@ -0,0 +1,139 @@
+"""
+Normalização de datas de publicação para o sistema de coleta de notícias
+Converte ISO 8601, RFC 2822 e formatos em português ("há 3 horas",
+"ontem às 10h30", "12/05/2024 10h30", "12 de maio de 2024") em datetimes
+com fuso horário
+"""
+
+import re
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from keyword_matcher import fold_text
+
+# Horário de Brasília (sem horário de verão desde 2019)
+BRT = timezone(timedelta(hours=-3), 'BRT')
+
+MONTHS = {
+    'janeiro': 1, 'fevereiro': 2, 'marco': 3, 'abril': 4, 'maio': 5, 'junho': 6,
+    'julho': 7, 'agosto': 8, 'setembro': 9, 'outubro': 10, 'novembro': 11, 'dezembro': 12,
+    'jan': 1, 'fev': 2, 'mar': 3, 'abr': 4, 'mai': 5, 'jun': 6,
+    'jul': 7, 'ago': 8, 'set': 9, 'out': 10, 'nov': 11, 'dez': 12
+}
+
+UNITS = {
+    'segundo': timedelta(seconds=1), 's': timedelta(seconds=1), 'seg': timedelta(seconds=1),
+    'minuto': timedelta(minutes=1), 'min': timedelta(minutes=1),
+    'hora': timedelta(hours=1), 'h': timedelta(hours=1),
+    'dia': timedelta(days=1), 'semana': timedelta(weeks=1)
+}
+
+_TIME = r'(?:\s*(?:as|a|-|,)?\s*(\d{1,2})\s*(?:h|:)\s*(\d{2})?(?:min)?)?'
+_NUMERIC_DATE = re.compile(r'\b(\d{1,2})[/.-](\d{1,2})[/.-](\d{2}|\d{4})\b' + _TIME)
+_WRITTEN_DATE = re.compile(r'\b(\d{1,2})\s+(?:de\s+)?([a-z]+)\.?\s+(?:de\s+)?(\d{4})\b' + _TIME)
+_RELATIVE = re.compile(r'\bha\s+(\d+|um|uma|poucos|poucas)\s+(segundo|seg|s|minuto|min|hora|h|dia|semana)s?\b')
+_DAY_WORD = re.compile(r'\b(hoje|ontem|anteontem)\b' + _TIME)
+_JUST_NOW = re.compile(r'\b(agora|agora mesmo|neste momento)\b')
+_ISO_DATE = re.compile(r'^\d{4}-\d{2}-\d{2}')
+
+_DAY_OFFSETS = {'hoje': 0, 'ontem': 1, 'anteontem': 2}
+
+# Resultado memoizado: ('abs', datetime), ('rel', timedelta) ou ('day', dias, hora, minuto)
+Parsed = Tuple
+
+
+def _with_time(hour: Optional[str], minute: Optional[str]) -> Tuple[Optional[int], int]:
+    return (int(hour) if hour else None), (int(minute) if minute else 0)
+
+
+@lru_cache(maxsize=4096)
+def _parse(text: str) -> Optional[Parsed]:
+    """Interpreta o texto sem depender do horário atual, para poder ser memoizado"""
+    value = text.strip()
+    if _ISO_DATE.match(value):
+        try:
+            parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+            return ('abs', parsed if parsed.tzinfo else parsed.replace(tzinfo=BRT))
+        except ValueError:
+            pass
+
+    try:
+        parsed = parsedate_to_datetime(value)
+        if parsed is not None:
+            return ('abs', parsed if parsed.tzinfo else parsed.replace(tzinfo=BRT))
+    except (TypeError, ValueError, IndexError):
+        pass
+
+    folded = fold_text(value)
+
+    match = _RELATIVE.search(folded)
+    if match:
+        amount = match.group(1)
+        count = 0 if amount in ('poucos', 'poucas') else 1 if amount in ('um', 'uma') else int(amount)
+        return ('rel', UNITS[match.group(2)] * count)
+
+    if _JUST_NOW.search(folded):
+        return ('rel', timedelta(0))
+
+    match = _DAY_WORD.search(folded)
+    if match:
+        hour, minute = _with_time(match.group(2), match.group(3))
+        return ('day', _DAY_OFFSETS[match.group(1)], hour, minute)
+
+    match = _NUMERIC_DATE.search(folded)
+    if match:
+        day, month, year = int(match.group(1)), int(match.group(2)), int(match.group(3))
+        return _absolute(year, month, day, *_with_time(match.group(4), match.group(5)))
+
+    match = _WRITTEN_DATE.search(folded)
+    if match and match.group(2) in MONTHS:
+        day, month, year = int(match.group(1)), MONTHS[match.group(2)], int(match.group(3))
+        return _absolute(year, month, day, *_with_time(match.group(4), match.group(5)))
+
+    return None
+
+
+def _absolute(year: int, month: int, day: int, hour: Optional[int], minute: int) -> Optional[Parsed]:
+    if year < 100:
+        year += 2000
+    try:
+        return ('abs', datetime(year, month, day, hour or 0, minute, tzinfo=BRT))
+    except ValueError:
+        return None
+
+
+def parse_published_date(text: Optional[str], now: Optional[datetime] = None) -> Optional[datetime]:
+    """Converte a data de publicação em datetime com fuso, ou None se não reconhecida
+
+    Datas relativas ("há 3 horas", "ontem") são resolvidas a partir de now
+    (padrão: agora, no horário de Brasília); datas sem fuso são tratadas
+    como horário de Brasília.
+    """
+    if not text:
+        return None
+    parsed = _parse(text)
+    if parsed is None:
+        return None
+    if parsed[0] == 'abs':
+        return parsed[1]
+
+    now = (now or datetime.now(BRT)).astimezone(BRT)
+    if parsed[0] == 'rel':
+        return now - parsed[1]
+
+    _, days_ago, hour, minute = parsed
+    moment = now - timedelta(days=days_ago)
+    if hour is None:
+        return moment
+    try:
+        return moment.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    except ValueError:
+        return moment
+
+
+def normalize_published_date(text: Optional[str], now: Optional[datetime] = None) -> Optional[str]:
+    """Data de publicação em ISO 8601; textos não reconhecidos são mantidos"""
+    parsed = parse_published_date(text, now)
+    return parsed.isoformat() if parsed else text
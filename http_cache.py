@@ -0,0 +1,196 @@
+"""
+Cache HTTP em disco para o sistema de coleta de notícias
+Armazena corpos com ETag/Last-Modified para requisições condicionais (304)
+e guarda o resultado já processado de cada página para reutilização
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+import logging
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__name__)
+
+
+class HTTPCache:
+    """Cache persistente com validação condicional e remoção LRU por tamanho"""
+
+    INDEX_FILENAME = 'index.json'
+
+    def __init__(self, directory: str, max_size_bytes: int):
+        self.directory = directory
+        self.max_size_bytes = max_size_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._index = self._load_index()
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Retorna os cabeçalhos If-None-Match / If-Modified-Since da URL"""
+        with self._lock:
+            entry = self._index.get(self._key(url))
+        if not entry:
+            return {}
+
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def load_response(self, url: str) -> Optional[requests.Response]:
+        """Reconstrói a resposta armazenada após um 304 (conta como acerto)"""
+        key = self._key(url)
+        with self._lock:
+            entry = self._index.get(key)
+            if not entry:
+                return None
+            try:
+                with open(self._path(key, '.body'), 'rb') as f:
+                    body = f.read()
+            except OSError:
+                self._index.pop(key, None)
+                return None
+
+            entry['last_access'] = time.time()
+            self.hits += 1
+
+        response = requests.Response()
+        response.status_code = 200
+        response._content = body
+        response.url = url
+        response.encoding = entry.get('encoding')
+        response.headers = CaseInsensitiveDict(entry.get('headers', {}))
+        response.from_cache = True
+        return response
+
+    def store(self, url: str, response: requests.Response):
+        """Armazena uma resposta completa (conta como falha do cache)"""
+        key = self._key(url)
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+
+        with self._lock:
+            self.misses += 1
+            if not etag and not last_modified:
+                # Sem validadores não há como revalidar: descarta entrada antiga
+                self._remove_entry(key)
+                self._save_index()
+                return
+
+            body = response.content
+            self._write_file(self._path(key, '.body'), body)
+            self._remove_file(self._path(key, '.parsed.json'))
+
+            self._index[key] = {
+                'url': url,
+                'etag': etag,
+                'last_modified': last_modified,
+                'encoding': response.encoding,
+                'headers': {'Content-Type': response.headers.get('Content-Type', '')},
+                'size': len(body),
+                'last_access': time.time(),
+                'has_parsed': False
+            }
+            self._evict()
+            self._save_index()
+
+    def get_parsed(self, url: str) -> Optional[List[Dict]]:
+        """Retorna o resultado processado associado à versão em cache da URL"""
+        key = self._key(url)
+        with self._lock:
+            entry = self._index.get(key)
+            if not entry or not entry.get('has_parsed'):
+                return None
+        try:
+            with open(self._path(key, '.parsed.json'), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def store_parsed(self, url: str, records: List[Dict]):
+        """Associa o resultado processado à versão em cache da URL"""
+        key = self._key(url)
+        with self._lock:
+            entry = self._index.get(key)
+            if not entry:
+                return
+            data = json.dumps(records, ensure_ascii=False).encode('utf-8')
+            self._write_file(self._path(key, '.parsed.json'), data)
+            entry['has_parsed'] = True
+            entry['size'] = entry['size'] + len(data)
+            self._evict()
+            self._save_index()
+
+    def get_stats(self) -> Dict:
+        """Retorna contadores de acertos/falhas e ocupação do cache"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'entries': len(self._index),
+                'size_bytes': sum(entry['size'] for entry in self._index.values())
+            }
+
+    def _evict(self):
+        """Remove as entradas menos usadas até respeitar o tamanho máximo"""
+        total = sum(entry['size'] for entry in self._index.values())
+        if total <= self.max_size_bytes:
+            return
+
+        for key, entry in sorted(self._index.items(), key=lambda item: item[1]['last_access']):
+            if total <= self.max_size_bytes:
+                break
+            total -= entry['size']
+            self._remove_entry(key)
+            logger.debug(f"Cache HTTP: removida entrada {entry['url']}")
+
+    def _remove_entry(self, key: str):
+        """Remove uma entrada do índice e seus arquivos"""
+        self._index.pop(key, None)
+        self._remove_file(self._path(key, '.body'))
+        self._remove_file(self._path(key, '.parsed.json'))
+
+    def _load_index(self) -> Dict:
+        """Carrega o índice do disco"""
+        try:
+            with open(os.path.join(self.directory, self.INDEX_FILENAME), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_index(self):
+        """Grava o índice de forma atômica"""
+        data = json.dumps(self._index, ensure_ascii=False).encode('utf-8')
+        self._write_file(os.path.join(self.directory, self.INDEX_FILENAME), data)
+
+    def _write_file(self, path: str, data: bytes):
+        """Escreve arquivo via arquivo temporário + rename"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _remove_file(self, path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _path(self, key: str, suffix: str) -> str:
+        return os.path.join(self.directory, key + suffix)
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha1(url.encode('utf-8')).hexdigest()
@@ -0,0 +1,259 @@
+"""
+Cliente HTTP compartilhado pelo sistema de coleta de notícias
+Um único pool de conexões para todos os coletores, com tamanhos por host,
+keep-alive, negociação de compressão e HTTP/2 opcional via httpx
+"""
+
+import threading
+from typing import Callable, Dict, Optional, Tuple, Union
+import logging
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3 import HTTPConnectionPool, HTTPSConnectionPool
+
+logger = logging.getLogger(__name__)
+
+try:
+    import httpx
+except ImportError:  # HTTP/2 é opcional
+    httpx = None
+
+
+def _accept_encoding() -> str:
+    """Codificações que o urllib3 consegue descompactar neste ambiente"""
+    encodings = ['gzip', 'deflate']
+    try:
+        import brotli  # noqa: F401
+        encodings.append('br')
+    except ImportError:
+        try:
+            import brotlicffi  # noqa: F401
+            encodings.append('br')
+        except ImportError:
+            pass
+    return ', '.join(encodings)
+
+
+Timeout = Union[float, Tuple[float, float]]
+
+# Recebe cada bloco baixado e retorna True para interromper o download
+StopCondition = Callable[[bytes], bool]
+
+CHUNK_SIZE = 64 * 1024
+
+
+class _ConnectCountingPool:
+    """Conta as conexões TCP realmente abertas pelo pool
+
+    num_connections do urllib3 só conta as conexões criadas pelo pool; a
+    reconexão silenciosa de uma conexão fechada (download interrompido,
+    servidor HTTP/1.0 ou com Connection: close) passa por connect() sem
+    aparecer ali.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.num_connects = 0
+        counter_lock = threading.Lock()
+        pool = self
+
+        class CountingConnection(self.ConnectionCls):
+            def connect(self):
+                super().connect()
+                with counter_lock:
+                    pool.num_connects += 1
+
+        self.ConnectionCls = CountingConnection
+
+
+class _CountingHTTPConnectionPool(_ConnectCountingPool, HTTPConnectionPool):
+    pass
+
+
+class _CountingHTTPSConnectionPool(_ConnectCountingPool, HTTPSConnectionPool):
+    pass
+
+
+class _CountingAdapter(HTTPAdapter):
+    """HTTPAdapter cujos pools contam as conexões abertas"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _CountingHTTPConnectionPool,
+            'https': _CountingHTTPSConnectionPool
+        }
+
+
+class HTTPClient:
+    """Cliente HTTP thread-safe com pools de conexão compartilhados"""
+
+    def __init__(self, user_agent: str, pool_connections: int = 10, pool_maxsize: int = 4,
+                 host_pool_sizes: Optional[Dict[str, int]] = None, http2: bool = False):
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': user_agent,
+            'Accept-Encoding': _accept_encoding(),
+            'Connection': 'keep-alive'
+        })
+
+        # Adaptador padrão: pool_connections hosts em cache, pool_maxsize conexões por host
+        default_adapter = _CountingAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session.mount('http://', default_adapter)
+        self.session.mount('https://', default_adapter)
+        self._adapters = [default_adapter]
+
+        # Hosts com tamanho de pool próprio (prefixo mais longo tem prioridade)
+        for host, pool_size in (host_pool_sizes or {}).items():
+            adapter = _CountingAdapter(pool_connections=1, pool_maxsize=pool_size)
+            self.session.mount(f'https://{host}/', adapter)
+            self.session.mount(f'http://{host}/', adapter)
+            self._adapters.append(adapter)
+
+        self._http2_client = None
+        if http2:
+            if httpx is None:
+                logger.warning("HTTP/2 solicitado, mas httpx não está instalado (pip install 'httpx[http2]')")
+            else:
+                try:
+                    self._http2_client = httpx.Client(
+                        http2=True,
+                        headers=dict(self.session.headers),
+                        limits=httpx.Limits(max_keepalive_connections=pool_connections * pool_maxsize),
+                        follow_redirects=True
+                    )
+                except ImportError:
+                    logger.warning("HTTP/2 requer o pacote h2 (pip install 'httpx[http2]')")
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._requests = 0
+        self._http2_requests = 0
+        self._truncated = 0
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None, timeout: Timeout = 30,
+            max_bytes: Optional[int] = None, stop_condition: Optional[StopCondition] = None) -> requests.Response:
+        """Executa um GET em streaming e devolve sempre um requests.Response
+
+        O corpo é lido em blocos e o download é interrompido ao atingir
+        max_bytes ou quando stop_condition retornar True; nesses casos a
+        resposta recebe o atributo truncated = True.
+        """
+        with self._lock:
+            self._requests += 1
+
+        if self._http2_client is not None:
+            response = self._get_http2(url, headers, timeout, max_bytes, stop_condition)
+        else:
+            response = self.session.get(url, headers=headers, timeout=timeout, stream=True)
+            try:
+                body, response.truncated = self._read_body(response.raw, max_bytes, stop_condition)
+            finally:
+                # Download interrompido: a conexão é descartada em vez de voltar ao pool
+                response.close()
+            response._content = body
+            response._content_consumed = True
+
+        if response.truncated:
+            with self._lock:
+                self._truncated += 1
+        return response
+
+    def _read_body(self, raw, max_bytes: Optional[int], stop_condition: Optional[StopCondition]) -> Tuple[bytes, bool]:
+        """Lê o corpo em blocos usando um buffer reaproveitado por thread"""
+        buffer = getattr(self._local, 'buffer', None)
+        if buffer is None:
+            buffer = self._local.buffer = memoryview(bytearray(CHUNK_SIZE))
+
+        raw.decode_content = True
+        body = bytearray()
+        while True:
+            size = raw.readinto(buffer)
+            if not size:
+                return bytes(body), False
+            body += buffer[:size]
+            if max_bytes is not None and len(body) >= max_bytes:
+                return bytes(body[:max_bytes]), True
+            if stop_condition is not None and stop_condition(bytes(buffer[:size])):
+                return bytes(body), True
+
+    def _get_http2(self, url: str, headers: Optional[Dict[str, str]], timeout: Timeout,
+                   max_bytes: Optional[int], stop_condition: Optional[StopCondition]) -> requests.Response:
+        """GET via httpx, convertendo resposta e exceções para o formato do requests"""
+        connect_timeout, read_timeout = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+        truncated = False
+        try:
+            with self._http2_client.stream(
+                'GET', url,
+                headers=headers,
+                timeout=httpx.Timeout(read_timeout, connect=connect_timeout)
+            ) as result:
+                body = bytearray()
+                for chunk in result.iter_bytes(CHUNK_SIZE):
+                    body += chunk
+                    if max_bytes is not None and len(body) >= max_bytes:
+                        del body[max_bytes:]
+                        truncated = True
+                        break
+                    if stop_condition is not None and stop_condition(chunk):
+                        truncated = True
+                        break
+        except httpx.ConnectTimeout as e:
+            raise requests.ConnectTimeout(str(e))
+        except httpx.TimeoutException as e:
+            raise requests.ReadTimeout(str(e))
+        except httpx.TransportError as e:
+            raise requests.ConnectionError(str(e))
+        except httpx.HTTPError as e:
+            raise requests.RequestException(str(e))
+
+        if result.http_version == 'HTTP/2':
+            with self._lock:
+                self._http2_requests += 1
+
+        response = requests.Response()
+        response.status_code = result.status_code
+        response._content = bytes(body)
+        response.truncated = truncated
+        response.headers = CaseInsensitiveDict(result.headers)
+        response.url = str(result.url)
+        response.encoding = result.charset_encoding
+        response.reason = result.reason_phrase
+        return response
+
+    def get_stats(self) -> Dict:
+        """Estatísticas de reutilização das conexões por host
+
+        connections conta cada conexão TCP aberta, inclusive reconexões; as
+        contagens de hosts cujo pool saiu do cache (mais de pool_connections
+        hosts) são perdidas.
+        """
+        hosts = {}
+        for adapter in self._adapters:
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                stats = hosts.setdefault(pool.host, {'connections': 0, 'requests': 0})
+                stats['connections'] += pool.num_connects
+                stats['requests'] += pool.num_requests
+
+        connections = sum(stats['connections'] for stats in hosts.values())
+        pooled_requests = sum(stats['requests'] for stats in hosts.values())
+        with self._lock:
+            return {
+                'requests': self._requests,
+                'http2_requests': self._http2_requests,
+                'truncated_downloads': self._truncated,
+                'connections_opened': connections,
+                'connection_reuse_rate': 1 - connections / pooled_requests if pooled_requests else 0.0,
+                'hosts': hosts
+            }
+
+    def close(self):
+        self.session.close()
+        if self._http2_client is not None:
+            self._http2_client.close()
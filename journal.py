@@ -0,0 +1,108 @@
+"""
+Diário append-only de notícias em JSON Lines
+Cada coleta acrescenta apenas as notícias novas ao arquivo do dia, com
+compressão gzip ou zstd opcional, e a leitura é feita em streaming
+"""
+
+import gzip
+import io
+import json
+import os
+from datetime import date, datetime
+from typing import Dict, Iterable, Iterator, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+try:
+    import zstandard
+except ImportError:  # zstd é opcional
+    zstandard = None
+
+FILE_PREFIX = 'noticias_'
+EXTENSIONS = {None: '.jsonl', 'gzip': '.jsonl.gz', 'zstd': '.jsonl.zst'}
+
+
+class ArticleJournal:
+    """Diário de notícias com um arquivo por dia
+
+    Arquivos gzip e zstd aceitam novos membros/frames concatenados ao final,
+    então cada gravação só comprime as linhas novas.
+    """
+
+    def __init__(self, directory: str, compression: Optional[str] = 'gzip', buffer_size: int = 64 * 1024):
+        if compression not in EXTENSIONS:
+            raise ValueError(f"Compressão desconhecida: {compression}")
+        if compression == 'zstd' and zstandard is None:
+            logger.warning("Compressão zstd requer o pacote zstandard (pip install zstandard), usando gzip")
+            compression = 'gzip'
+
+        self.directory = directory
+        self.compression = compression
+        self.buffer_size = buffer_size
+        os.makedirs(directory, exist_ok=True)
+
+    def path_for(self, day: date) -> str:
+        return os.path.join(self.directory, f"{FILE_PREFIX}{day.strftime('%Y%m%d')}{EXTENSIONS[self.compression]}")
+
+    def append(self, records: Iterable[Dict], day: date = None) -> str:
+        """Acrescenta os registros ao arquivo do dia e devolve o caminho"""
+        path = self.path_for(day or datetime.now().date())
+        count = 0
+        with self._open_writer(path) as writer:
+            for record in records:
+                writer.write(json.dumps(record, ensure_ascii=False).encode('utf-8'))
+                writer.write(b'\n')
+                count += 1
+        logger.info(f"{count} notícias acrescentadas ao diário {os.path.basename(path)}")
+        return path
+
+    def iter_records(self, start: date = None, end: date = None) -> Iterator[Dict]:
+        """Lê em streaming os registros dos arquivos entre start e end (inclusive)"""
+        for path in self.files(start, end):
+            try:
+                with self._open_reader(path) as reader:
+                    for line_number, line in enumerate(reader, 1):
+                        if not line.strip():
+                            continue
+                        try:
+                            yield json.loads(line)
+                        except ValueError:
+                            logger.warning(f"Linha inválida ignorada em {path}:{line_number}")
+            except (EOFError, OSError) as e:
+                # Arquivo truncado (ex.: processo interrompido durante a gravação)
+                logger.warning(f"Leitura de {path} interrompida: {e}")
+
+    def files(self, start: date = None, end: date = None) -> List[str]:
+        """Arquivos do diário em ordem cronológica, opcionalmente limitados por data"""
+        paths = []
+        for filename in sorted(os.listdir(self.directory)):
+            if not filename.startswith(FILE_PREFIX) or '.jsonl' not in filename:
+                continue
+            try:
+                day = datetime.strptime(filename[len(FILE_PREFIX):len(FILE_PREFIX) + 8], '%Y%m%d').date()
+            except ValueError:
+                continue
+            if (start and day < start) or (end and day > end):
+                continue
+            paths.append(os.path.join(self.directory, filename))
+        return paths
+
+    def _open_writer(self, path: str):
+        if path.endswith('.gz'):
+            return io.BufferedWriter(gzip.open(path, 'ab'), self.buffer_size)
+        if path.endswith('.zst'):
+            compressor = zstandard.ZstdCompressor().stream_writer(open(path, 'ab'), write_return_read=True)
+            return io.BufferedWriter(compressor, self.buffer_size)
+        return open(path, 'ab', buffering=self.buffer_size)
+
+    @staticmethod
+    def _open_reader(path: str):
+        if path.endswith('.gz'):
+            return gzip.open(path, 'rt', encoding='utf-8')
+        if path.endswith('.zst'):
+            if zstandard is None:
+                raise OSError("pacote zstandard não instalado")
+            raw = zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), read_across_frames=True)
+            return io.TextIOWrapper(raw, encoding='utf-8')
+        return open(path, 'r', encoding='utf-8')
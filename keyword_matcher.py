@@ -0,0 +1,119 @@
+"""
+Casamento de palavras-chave para o sistema de coleta de notícias
+Autômato Aho-Corasick construído uma única vez, com normalização de acentos
+e limites de palavra, varrendo cada texto em uma única passada
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List
+import unicodedata
+
+
+def fold_text(text: str) -> str:
+    """Converte para minúsculas e remove acentos ("Inovação" -> "inovacao")"""
+    decomposed = unicodedata.normalize('NFKD', text.casefold())
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+class KeywordMatcher:
+    """Autômato Aho-Corasick para busca simultânea de várias palavras-chave
+
+    Com limites de palavra ativos, toda palavra-chave precisa começar no início
+    de uma palavra. Palavras-chave curtas (menores que prefix_min_length, como
+    "IA" e "5G") também precisam terminar no fim da palavra, aceitando apenas o
+    plural com "s"; as demais podem casar como prefixo para cobrir flexões
+    ("startup" em "startups", "inteligência" em "inteligências"). Plurais que
+    mudam o radical ("inovação" -> "inovações") precisam de palavra-chave própria.
+    """
+
+    def __init__(self, keywords: Iterable[str], fold_accents: bool = True,
+                 word_boundaries: bool = True, prefix_min_length: int = 4):
+        self.keywords = list(dict.fromkeys(keywords))
+        self.fold_accents = fold_accents
+        self.word_boundaries = word_boundaries
+        self.prefix_min_length = prefix_min_length
+
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+        self._lengths: List[int] = []
+
+        for index, keyword in enumerate(self.keywords):
+            self._add(self._normalize(keyword), index)
+        self._build_failure_links()
+
+    def find(self, text: str) -> List[str]:
+        """Retorna as palavras-chave encontradas, na ordem da configuração"""
+        found = set()
+        for index in self._scan(text):
+            found.add(index)
+            if len(found) == len(self.keywords):
+                break
+        return [self.keywords[index] for index in sorted(found)]
+
+    def matches(self, text: str) -> bool:
+        """Indica se ao menos uma palavra-chave aparece no texto"""
+        for _ in self._scan(text):
+            return True
+        return False
+
+    def _scan(self, text: str):
+        """Gera os índices das palavras-chave encontradas no texto"""
+        if not text:
+            return
+        text = self._normalize(text)
+        goto, fail, output, lengths = self._goto, self._fail, self._output, self._lengths
+        state = 0
+
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+
+            for index in output[state]:
+                if not self.word_boundaries or self._at_boundaries(text, position, lengths[index]):
+                    yield index
+
+    def _at_boundaries(self, text: str, end: int, length: int) -> bool:
+        """Verifica os limites de palavra de uma ocorrência terminada em end"""
+        start = end - length + 1
+        if start > 0 and text[start - 1].isalnum():
+            return False
+        if length >= self.prefix_min_length:
+            return True
+
+        following = end + 1
+        if following < len(text) and text[following] == 's':
+            following += 1
+        return following >= len(text) or not text[following].isalnum()
+
+    def _normalize(self, text: str) -> str:
+        return fold_text(text) if self.fold_accents else text.lower()
+
+    def _add(self, keyword: str, index: int):
+        """Insere a palavra-chave na trie"""
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append(index)
+        self._lengths.append(len(keyword))
+
+    def _build_failure_links(self):
+        """Calcula os links de falha em largura (BFS)"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
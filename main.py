@@ -12,9 +12,11 @@ from datetime import datetime
 # Adiciona o diretório atual ao path para importações
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from config import LOG_CONFIG, OUTPUT_CONFIG
+from config import LOG_CONFIG, OUTPUT_CONFIG, OUTPUT_DIR
 from news_collector import NewsCollectionManager
 from data_processor import DataProcessor
+from output_stage import OutputStage, SINK_LABELS
+from output_manifest import OutputManifest
 from scheduler import NewsScheduler, run_single_collection
 
 
@@ -49,15 +51,28 @@ def show_status():
     print(f"📁 Diretório de saída: {output_dir}")
     print(f"📁 Diretório de logs: {logs_dir}")
     
-    # Verifica arquivos existentes
-    if os.path.exists(output_dir):
-        files = [f for f in os.listdir(output_dir) if f.endswith(('.csv', '.json', '.html'))]
+    # Verifica arquivos existentes (pelo manifesto; sem ele, lista o diretório)
+    manifest = OutputManifest(OUTPUT_DIR, OUTPUT_CONFIG['manifest_file']).load()
+    if manifest['counts']:
+        run_files = sum(manifest['counts'].get(kind, 0) for kind in ('csv', 'json', 'html'))
+        print(f"📄 Arquivos de saída: {run_files}")
+        print("   Últimos arquivos:")
+        for kind, entry in sorted(manifest['latest'].items(), key=lambda item: item[1]['written_at'], reverse=True):
+            written_at = datetime.fromisoformat(entry['written_at'])
+            print(f"   - {entry['file']} (modificado: {written_at.strftime('%d/%m/%Y %H:%M')})")
+        if manifest['runs']:
+            last_run = manifest['runs'][-1]
+            print(f"   Última execução: {last_run['run_id']} ({last_run['articles']} notícias)")
+    elif os.path.exists(output_dir):
+        files = []
+        for file in os.listdir(output_dir):
+            if file.endswith(('.csv', '.json', '.html')):
+                files.append((file, os.path.getmtime(os.path.join(output_dir, file))))
         print(f"📄 Arquivos de saída: {len(files)}")
         if files:
             print("   Últimos arquivos:")
-            for file in sorted(files, key=lambda x: os.path.getmtime(os.path.join(output_dir, x)), reverse=True)[:5]:
-                filepath = os.path.join(output_dir, file)
-                mtime = datetime.fromtimestamp(os.path.getmtime(filepath))
+            for file, mtime in sorted(files, key=lambda x: x[1], reverse=True)[:5]:
+                mtime = datetime.fromtimestamp(mtime)
                 print(f"   - {file} (modificado: {mtime.strftime('%d/%m/%Y %H:%M')})")
     else:
         print("📄 Diretório de saída não existe")
@@ -65,6 +80,23 @@ def show_status():
     print("\n" + "="*60)
 
 
+def run_compaction():
+    """Compacta as execuções antigas de output/ e aplica a retenção"""
+    print("\n🗜️  Compactando arquivos de saída...")
+    
+    stats = DataProcessor().compact_outputs()
+    if stats is None:
+        print("⚠️ Compactação desativada (OUTPUT_COMPACTION=false)")
+        return
+    
+    print(f"✅ Execuções compactadas: {stats['runs_compacted']}")
+    print(f"   Notícias nos arquivos atualizados: {stats['articles_archived']}")
+    print(f"   Arquivos removidos: {stats['files_removed']}")
+    print(f"   Arquivos compactados expirados: {stats['archives_removed']}")
+    print(f"   Resumos diários expirados: {stats['summaries_removed']}")
+    print(f"   Relatórios HTML expirados: {stats['reports_removed']}")
+
+
 def run_test_collection():
     """Executa uma coleta de teste"""
     print("\n🧪 Executando coleta de teste...")
@@ -96,14 +128,12 @@ def run_test_collection():
         
         # Salva resultados
         print("💾 Salvando resultados...")
-        csv_file = data_processor.save_to_csv(articles)
-        json_file = data_processor.save_to_json(articles)
-        html_file = data_processor.save_to_html(articles)
+        output, results = OutputStage(data_processor).run(articles)
         
         print(f"✅ Resultados salvos:")
-        print(f"   CSV: {os.path.basename(csv_file)}")
-        print(f"   JSON: {os.path.basename(json_file)}")
-        print(f"   HTML: {os.path.basename(html_file)}")
+        for sink, result in results.items():
+            if result:
+                print(f"   {SINK_LABELS[sink]}: {os.path.basename(result)}")
         
         # Gera resumo
         summary = data_processor.generate_daily_summary(articles)
@@ -116,7 +146,7 @@ def run_test_collection():
         # Envia email se configurado
         if OUTPUT_CONFIG.get('save_to_email', False):
             print("\n📧 Enviando email...")
-            if data_processor.send_email_report(articles):
+            if data_processor.send_email_report(articles, html_content=output.html):
                 print("✅ Email enviado com sucesso!")
             else:
                 print("❌ Erro ao enviar email")
@@ -212,6 +242,7 @@ Exemplos de uso:
   python main.py --background              # Inicia agendador em background
   python main.py --stop-background         # Para agendador em background
   python main.py --status                  # Mostra status do sistema
+  python main.py --compact                 # Compacta arquivos antigos de output/
   python main.py                           # Mostra ajuda
         """
     )
@@ -226,6 +257,8 @@ Exemplos de uso:
                        help='Para o agendador em background')
     parser.add_argument('--status', action='store_true',
                        help='Mostra status do sistema')
+    parser.add_argument('--compact', action='store_true',
+                       help='Compacta execuções antigas e aplica a retenção em output/')
     
     args = parser.parse_args()
     
@@ -249,6 +282,8 @@ Exemplos de uso:
             stop_background_scheduler()
         elif args.status:
             show_status()
+        elif args.compact:
+            run_compaction()
         else:
             # Mostra ajuda se nenhum argumento for fornecido
             parser.print_help()
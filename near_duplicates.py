@@ -0,0 +1,162 @@
+"""
+Detecção de notícias quase duplicadas para o sistema de coleta de notícias
+Assinaturas MinHash sobre títulos e resumos normalizados, com índice LSH em
+faixas para localizar candidatos sem comparar todos os pares
+"""
+
+import hashlib
+import re
+from collections import defaultdict
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from keyword_matcher import fold_text
+
+# Palavras muito frequentes que não ajudam a distinguir manchetes
+STOPWORDS = frozenset("""
+    a ao aos as com como da das de do dos e em entre na nas no nos o os ou
+    para pela pelas pelo pelos por que se sem sob sobre um uma umas uns
+""".split())
+
+_TOKEN_PATTERN = re.compile(r'\w+')
+
+# Resumos curtos e genéricos ("Leia mais") não servem para comparação
+MIN_SUMMARY_TOKENS = 5
+
+# Primo de Mersenne 2^31 - 1: a * x cabe em int64 para x de 32 bits
+_PRIME = (1 << 31) - 1
+
+
+def normalize_tokens(text: Optional[str]) -> FrozenSet[str]:
+    """Conjunto de palavras sem acentos, em minúsculas e sem stopwords"""
+    if not text:
+        return frozenset()
+    return frozenset(token for token in _TOKEN_PATTERN.findall(fold_text(text)) if token not in STOPWORDS)
+
+
+def jaccard(first: FrozenSet[str], second: FrozenSet[str]) -> float:
+    if not first or not second:
+        return 0.0
+    return len(first & second) / len(first | second)
+
+
+def _token_hash(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode('utf-8'), digest_size=4).digest(), 'big')
+
+
+class MinHashLSH:
+    """Índice LSH de assinaturas MinHash
+
+    A assinatura de num_perm valores é dividida em faixas de rows valores;
+    dois conjuntos viram candidatos quando coincidem em alguma faixa inteira.
+    O número de linhas por faixa é escolhido para que o limiar efetivo do LSH
+    fique logo abaixo do limiar de similaridade, privilegiando a revocação.
+    """
+
+    def __init__(self, threshold: float = 0.6, num_perm: int = 64, seed: int = 1):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.rows = self._choose_rows(threshold, num_perm)
+        self.band_count = num_perm // self.rows
+
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, _PRIME, size=num_perm, dtype=np.int64)
+        self._b = rng.randint(0, _PRIME, size=num_perm, dtype=np.int64)
+        self._tables: List[Dict[bytes, List[object]]] = [defaultdict(list) for _ in range(self.band_count)]
+
+    @staticmethod
+    def _choose_rows(threshold: float, num_perm: int) -> int:
+        """Maior quantidade de linhas por faixa com limiar (1/b)^(1/r) <= threshold"""
+        best = 1
+        for rows in range(1, num_perm + 1):
+            if num_perm % rows:
+                continue
+            if (1 / (num_perm // rows)) ** (1 / rows) <= threshold:
+                best = rows
+        return best
+
+    def signature(self, tokens: FrozenSet[str]) -> Optional[np.ndarray]:
+        """Calcula a assinatura MinHash de um conjunto de palavras"""
+        if not tokens:
+            return None
+        hashes = np.fromiter((_token_hash(token) for token in tokens), dtype=np.int64, count=len(tokens))
+        permuted = (hashes[:, None] * self._a[None, :] + self._b[None, :]) % _PRIME
+        return permuted.min(axis=0)
+
+    def candidates(self, signature: np.ndarray) -> List[object]:
+        """Itens indexados que compartilham ao menos uma faixa com a assinatura"""
+        found = []
+        for band, table in enumerate(self._tables):
+            found.extend(table.get(self._band_key(signature, band), ()))
+        return found
+
+    def add(self, signature: np.ndarray, item: object):
+        for band, table in enumerate(self._tables):
+            table[self._band_key(signature, band)].append(item)
+
+    def _band_key(self, signature: np.ndarray, band: int) -> bytes:
+        return signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+
+class NearDuplicateDetector:
+    """Detecta notícias quase iguais pelo título ou, quando houver, pelo resumo"""
+
+    def __init__(self, threshold: float = 0.6, num_perm: int = 64):
+        self.threshold = threshold
+        self._title_index = MinHashLSH(threshold, num_perm)
+        self._summary_index = MinHashLSH(threshold, num_perm)
+
+    def check_and_add(self, title: str, summary: Optional[str], item: object) -> Optional[object]:
+        """Registra a notícia se for inédita; caso contrário retorna a original"""
+        title_tokens = normalize_tokens(title)
+        summary_tokens = normalize_tokens(summary)
+        if len(summary_tokens) < MIN_SUMMARY_TOKENS:
+            summary_tokens = frozenset()
+        duplicate, title_signature, summary_signature = self._find(title_tokens, summary_tokens)
+        if duplicate is None:
+            self._add(title_tokens, summary_tokens, item, title_signature, summary_signature)
+        return duplicate
+
+    def _find(self, title_tokens, summary_tokens) -> Tuple[Optional[object], object, object]:
+        title_signature = self._title_index.signature(title_tokens)
+        summary_signature = self._summary_index.signature(summary_tokens)
+
+        if title_signature is not None:
+            for entry in self._title_index.candidates(title_signature):
+                if jaccard(title_tokens, entry[0]) >= self.threshold:
+                    return entry[2], title_signature, summary_signature
+        if summary_signature is not None:
+            for entry in self._summary_index.candidates(summary_signature):
+                if jaccard(summary_tokens, entry[1]) >= self.threshold:
+                    return entry[2], title_signature, summary_signature
+        return None, title_signature, summary_signature
+
+    def _add(self, title_tokens, summary_tokens, item, title_signature, summary_signature):
+        entry = (title_tokens, summary_tokens, item)
+        if title_signature is not None:
+            self._title_index.add(title_signature, entry)
+        if summary_signature is not None:
+            self._summary_index.add(summary_signature, entry)
+
+
+def near_duplicate_mask(titles: Iterable[str], summaries: Iterable[Optional[str]],
+                        threshold: float = 0.6) -> List[bool]:
+    """Indica, para cada notícia, se ela é a primeira do seu grupo de quase iguais"""
+    detector = NearDuplicateDetector(threshold)
+    return [
+        detector.check_and_add(title, summary, position) is None
+        for position, (title, summary) in enumerate(zip(titles, summaries))
+    ]
+
+
+def remove_near_duplicates(articles: Iterable, threshold: float = 0.6) -> Tuple[List, int]:
+    """Mantém a primeira ocorrência de cada grupo de notícias quase iguais
+
+    Retorna a lista filtrada e a quantidade de notícias removidas.
+    """
+    articles = list(articles)
+    keep = near_duplicate_mask((article.title for article in articles),
+                               (article.summary for article in articles), threshold)
+    unique_articles = [article for article, kept in zip(articles, keep) if kept]
+    return unique_articles, len(articles) - len(unique_articles)
@@ -4,16 +4,35 @@ Coleta notícias de múltiplas fontes, remove duplicatas e gera relatórios
 """
 
 import requests
+import sys
 import time
 import hashlib
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Iterator, List, Dict, Optional
 import logging
+import os
 from urllib.parse import urljoin, urlparse
 import re
 
-from bs4 import BeautifulSoup
-from config import NEWS_SOURCES, COLLECTION_CONFIG, LOG_CONFIG
+import feedparser
+import numpy as np
+import pandas as pd
+from config import (
+    NEWS_SOURCES, COLLECTION_CONFIG, LOG_CONFIG, HTTP_CONFIG, CACHE_CONFIG, DEDUP_CONFIG, RESILIENCE_CONFIG,
+    DATA_DIR
+)
+from http_client import HTTPClient
+from rate_limiter import HostRateLimiter
+from http_cache import HTTPCache
+from page_parser import get_page_parser, html_to_text, LinkCounter
+from keyword_matcher import KeywordMatcher
+from seen_index import SeenArticleIndex
+from near_duplicates import near_duplicate_mask
+from url_utils import canonicalize_url
+from resilience import RetryPolicy, CircuitBreaker, CircuitBreakerRegistry
+from source_state import SourceStateStore
+from date_parser import BRT, normalize_published_date, parse_published_date
 
 # Configurar logging
 logging.basicConfig(
@@ -26,25 +45,142 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Cliente HTTP com pool de conexões compartilhado por todos os coletores
+http_client = HTTPClient(
+    user_agent=HTTP_CONFIG['user_agent'],
+    pool_connections=HTTP_CONFIG['pool_connections'],
+    pool_maxsize=HTTP_CONFIG['pool_maxsize'],
+    host_pool_sizes=HTTP_CONFIG['host_pool_sizes'],
+    http2=HTTP_CONFIG['http2']
+)
+
+# Limitador compartilhado por todos os coletores, indexado por hostname
+host_rate_limiter = HostRateLimiter(**COLLECTION_CONFIG['default_rate_limit'])
+
+# Cache HTTP compartilhado (None quando desabilitado)
+http_cache = HTTPCache(
+    os.path.join(DATA_DIR, CACHE_CONFIG['directory']),
+    CACHE_CONFIG['max_size_mb'] * 1024 * 1024
+) if CACHE_CONFIG['enabled'] else None
+
+# Retentativas e circuit breakers por fonte (estado persiste entre execuções)
+retry_policy = RetryPolicy(
+    max_retries=RESILIENCE_CONFIG['max_retries'],
+    backoff_base=RESILIENCE_CONFIG['backoff_base_seconds'],
+    backoff_max=RESILIENCE_CONFIG['backoff_max_seconds'],
+    retry_statuses=RESILIENCE_CONFIG['retry_statuses']
+)
+circuit_breakers = CircuitBreakerRegistry(
+    os.path.join(DATA_DIR, RESILIENCE_CONFIG['circuit_state_file']),
+    failure_threshold=RESILIENCE_CONFIG['failure_threshold'],
+    recovery_timeout=RESILIENCE_CONFIG['recovery_timeout_minutes'] * 60
+)
+
+# Marcas incrementais por fonte (últimas notícias vistas e data mais recente)
+source_states = SourceStateStore(
+    os.path.join(DATA_DIR, COLLECTION_CONFIG['source_state_file']),
+    max_ids=COLLECTION_CONFIG['incremental_max_ids'],
+    stop_after=COLLECTION_CONFIG['incremental_stop_after_known'],
+    enabled=COLLECTION_CONFIG['incremental_collection']
+)
+
+_WHITESPACE = re.compile(r'\s+')
+_SPECIAL_CHARS = re.compile(r'[^\w\s\-.,!?]')
+
+
+def _missing_to_none(value):
+    """Valores ausentes em CSV chegam como NaN pelo pandas"""
+    return None if value != value else value
+
+
+def _isoformat(value) -> Optional[str]:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _md5(text: str) -> str:
+    return hashlib.md5(text.encode('utf-8')).hexdigest()
+
 
 class NewsArticle:
-    """Classe para representar uma notícia"""
+    """Classe para representar uma notícia
+    
+    Usa __slots__ para reduzir a memória de históricos grandes; o nome da
+    fonte é internado, o hash é calculado só quando usado e collected_at
+    vindo de arquivos é convertido apenas quando lido.
+    """
+    
+    # Ordem das colunas em to_dict e from_row
+    FIELDS = ('title', 'url', 'source', 'published_date', 'summary', 'content', 'collected_at', 'hash_id')
+    
+    __slots__ = ('title', 'url', 'source', 'published_date', 'summary', 'content',
+                 '_collected_at', '_hash_id', 'matched_keywords')
     
     def __init__(self, title: str, url: str, source: str, published_date: str = None, 
-                 summary: str = None, content: str = None):
+                 summary: str = None, content: str = None, collected_at: datetime = None):
         self.title = title.strip()
         self.url = url
-        self.source = source
+        self.source = sys.intern(source)
         self.published_date = published_date
         self.summary = summary
         self.content = content
-        self.collected_at = datetime.now()
-        self.hash_id = self._generate_hash()
+        self._collected_at = collected_at or datetime.now()
+        self._hash_id = None
+        self.matched_keywords = ()
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'NewsArticle':
+        """Reconstrói uma notícia salva por to_dict sem recalcular o hash"""
+        article = cls.__new__(cls)
+        article.title = data['title']
+        article.url = data['url']
+        article.source = sys.intern(data['source'])
+        article.published_date = _missing_to_none(data.get('published_date'))
+        article.summary = _missing_to_none(data.get('summary'))
+        article.content = _missing_to_none(data.get('content'))
+        article._collected_at = _missing_to_none(data.get('collected_at'))
+        article._hash_id = _missing_to_none(data.get('hash_id'))
+        article.matched_keywords = ()
+        return article
+    
+    @classmethod
+    def from_row(cls, row) -> 'NewsArticle':
+        """Reconstrói uma notícia a partir de uma tupla na ordem de FIELDS"""
+        title, url, source, published_date, summary, content, collected_at, hash_id = row
+        article = cls.__new__(cls)
+        article.title = title
+        article.url = url
+        article.source = sys.intern(source)
+        article.published_date = _missing_to_none(published_date)
+        article.summary = _missing_to_none(summary)
+        article.content = _missing_to_none(content)
+        article._collected_at = _missing_to_none(collected_at)
+        article._hash_id = _missing_to_none(hash_id)
+        article.matched_keywords = ()
+        return article
+    
+    @property
+    def hash_id(self) -> str:
+        if self._hash_id is None:
+            self._hash_id = self._generate_hash()
+        return self._hash_id
+    
+    @hash_id.setter
+    def hash_id(self, value: str):
+        self._hash_id = value
+    
+    @property
+    def collected_at(self) -> Optional[datetime]:
+        if isinstance(self._collected_at, str):
+            self._collected_at = datetime.fromisoformat(self._collected_at)
+        return self._collected_at
+    
+    @collected_at.setter
+    def collected_at(self, value: datetime):
+        self._collected_at = value
     
     def _generate_hash(self) -> str:
         """Gera um hash único baseado no título e URL"""
-        content = f"{self.title}{self.url}{self.source}"
-        return hashlib.md5(content.encode('utf-8')).hexdigest()
+        return _md5(f"{self.title}{self.url}{self.source}")
     
     def to_dict(self) -> Dict:
         """Converte para dicionário"""
@@ -55,7 +191,7 @@ class NewsArticle:
             'published_date': self.published_date,
             'summary': self.summary,
             'content': self.content,
-            'collected_at': self.collected_at.isoformat(),
+            'collected_at': _isoformat(self._collected_at),
             'hash_id': self.hash_id
         }
     
@@ -63,320 +199,513 @@ class NewsArticle:
         return f"{self.title} - {self.source}"
 
 
+class ArticleBatch:
+    """Lote colunar de notícias apoiado em um DataFrame do pandas
+    
+    Percorre o pipeline (filtros, deduplicação, estatísticas e gravação) como
+    colunas; iterar ou indexar um item devolve objetos NewsArticle e fatias
+    devolvem novos lotes.
+    """
+    
+    COLUMNS = NewsArticle.FIELDS + ('matched_keywords',)
+    
+    def __init__(self, frame: pd.DataFrame = None):
+        if frame is None:
+            frame = pd.DataFrame(columns=list(self.COLUMNS))
+        frame = frame.reindex(columns=list(self.COLUMNS)).reset_index(drop=True)
+        if frame.empty:
+            # Lote vazio: colunas sem dados viriam como float64 e quebrariam as operações de texto
+            frame = frame.astype(object)
+        
+        # Arquivos antigos podem não ter o hash: calcula só para as linhas sem ele
+        missing_hash = frame['hash_id'].isna()
+        if missing_hash.any():
+            keys = (frame['title'].astype(str) + frame['url'].astype(str) + frame['source'].astype(str))[missing_hash]
+            frame.loc[missing_hash, 'hash_id'] = keys.map(_md5)
+        self.frame = frame
+    
+    @classmethod
+    def from_articles(cls, articles) -> 'ArticleBatch':
+        """Monta o lote a partir de objetos NewsArticle (ou devolve o próprio lote)"""
+        if isinstance(articles, cls):
+            return articles
+        articles = list(articles)
+        return cls(pd.DataFrame({
+            'title': [article.title for article in articles],
+            'url': [article.url for article in articles],
+            'source': [article.source for article in articles],
+            'published_date': [article.published_date for article in articles],
+            'summary': [article.summary for article in articles],
+            'content': [article.content for article in articles],
+            'collected_at': [_isoformat(article._collected_at) for article in articles],
+            'hash_id': [article.hash_id for article in articles],
+            'matched_keywords': [list(article.matched_keywords) for article in articles]
+        }, columns=list(cls.COLUMNS)))
+    
+    @classmethod
+    def from_records(cls, records: List[Dict]) -> 'ArticleBatch':
+        """Monta o lote a partir de dicionários no formato de NewsArticle.to_dict"""
+        return cls(pd.DataFrame.from_records(records, columns=list(NewsArticle.FIELDS)) if records else None)
+    
+    @classmethod
+    def concat(cls, batches) -> 'ArticleBatch':
+        frames = [cls.from_articles(batch).frame for batch in batches]
+        return cls(pd.concat(frames, ignore_index=True) if frames else None)
+    
+    def __len__(self) -> int:
+        return len(self.frame)
+    
+    def __bool__(self) -> bool:
+        return len(self.frame) > 0
+    
+    def __iter__(self):
+        for row in self.frame.itertuples(index=False, name=None):
+            yield self._article(row)
+    
+    def __getitem__(self, key):
+        if isinstance(key, int):
+            return self._article(next(self.frame.iloc[[key]].itertuples(index=False, name=None)))
+        if isinstance(key, slice):
+            return ArticleBatch(self.frame.iloc[key])
+        return self.filter(key)
+    
+    @staticmethod
+    def _article(row) -> NewsArticle:
+        article = NewsArticle.from_row(row[:-1])
+        if isinstance(row[-1], list):
+            article.matched_keywords = row[-1]
+        return article
+    
+    def filter(self, mask) -> 'ArticleBatch':
+        """Novo lote apenas com as linhas em que mask é verdadeira"""
+        return ArticleBatch(self.frame[np.asarray(mask, dtype=bool)])
+    
+    def drop_duplicates(self, column: str = 'hash_id') -> 'ArticleBatch':
+        """Mantém a primeira ocorrência de cada valor da coluna"""
+        return self.filter(~self.frame.duplicated(column).to_numpy())
+    
+    def source_counts(self) -> Dict[str, int]:
+        """Quantidade de notícias por fonte, na ordem em que aparecem"""
+        return {source: int(count) for source, count in self.frame['source'].value_counts(sort=False).items()}
+    
+    def to_frame(self) -> pd.DataFrame:
+        """Colunas de NewsArticle.to_dict, prontas para gravação"""
+        return self.frame[list(NewsArticle.FIELDS)]
+    
+    def to_records(self) -> List[Dict]:
+        """Lista de dicionários no formato de NewsArticle.to_dict"""
+        frame = self.to_frame().astype(object)
+        return frame.where(frame.notna(), None).to_dict('records')
+    
+    def iter_records(self) -> Iterator[Dict]:
+        """Gera os dicionários no formato de NewsArticle.to_dict, um por vez"""
+        for row in self.to_frame().itertuples(index=False, name=None):
+            yield {field: _missing_to_none(value) for field, value in zip(NewsArticle.FIELDS, row)}
+    
+    def to_articles(self) -> List[NewsArticle]:
+        return list(self)
+
+
+class SourceRules:
+    """Regras de extração de uma fonte, compiladas uma única vez na inicialização"""
+    
+    def __init__(self, source_config: Dict):
+        self.link_pattern = self._compile_any(source_config.get('link_patterns', []))
+        self.exclude_pattern = self._compile_any(source_config.get('exclude_patterns', []))
+        self.min_title_length = source_config.get('min_title_length', COLLECTION_CONFIG['min_title_length'])
+        self.max_articles = source_config.get('max_articles', COLLECTION_CONFIG['max_articles_per_source'])
+        self.url_rewrites = [
+            (re.compile(pattern), replacement)
+            for pattern, replacement in source_config.get('url_rewrites', [])
+        ]
+        self.parser_options = {
+            'date_tags': source_config.get('date_tags'),
+            'summary_tags': source_config.get('summary_tags'),
+            'summary_class_pattern': source_config.get('summary_class_pattern'),
+            'container_tags': source_config.get('container_tags')
+        }
+    
+    def is_news_link(self, href: str) -> bool:
+        """Verifica se o link é de uma notícia"""
+        if self.link_pattern is not None and not self.link_pattern.search(href):
+            return False
+        return self.exclude_pattern is None or not self.exclude_pattern.search(href)
+    
+    def canonical_url(self, url: str) -> str:
+        """Aplica a canonicalização geral e as reescritas da fonte"""
+        return canonicalize_url(url, self.url_rewrites, COLLECTION_CONFIG['force_https'])
+    
+    @staticmethod
+    def _compile_any(patterns: List[str]) -> Optional[re.Pattern]:
+        """Combina vários padrões em uma única expressão regular"""
+        if not patterns:
+            return None
+        return re.compile('|'.join(f'(?:{pattern})' for pattern in patterns))
+
+
 class BaseNewsCollector:
     """Classe base para coletores de notícias"""
     
     def __init__(self, source_config: Dict):
         self.source_config = source_config
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+        self.http_client = http_client
+        
+        # Registra o limite de taxa do host desta fonte
+        rate_limit = source_config.get('rate_limit')
+        if rate_limit:
+            host_rate_limiter.configure(urlparse(source_config['url']).hostname or '', **rate_limit)
+        
+        # Timeouts separados de conexão e leitura
+        self.timeout = (
+            source_config.get('connect_timeout', RESILIENCE_CONFIG['connect_timeout']),
+            source_config.get('read_timeout', RESILIENCE_CONFIG['read_timeout'])
+        )
+        self.circuit_breaker = circuit_breakers.get(source_config['name'])
+        
+        # Limite de bytes baixados por resposta
+        self.max_bytes = source_config.get('max_bytes', COLLECTION_CONFIG['max_response_bytes'])
+        
+        self.rules = SourceRules(source_config)
+        self.page_parser = get_page_parser(
+            source_config.get('parser', COLLECTION_CONFIG['parser_engine']),
+            **self.rules.parser_options
+        )
     
     def collect_news(self) -> List[NewsArticle]:
         """Método base para coleta de notícias"""
         raise NotImplementedError("Subclasses devem implementar este método")
     
-    def _make_request(self, url: str) -> Optional[requests.Response]:
-        """Faz requisição HTTP com tratamento de erro"""
-        try:
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
-            return response
-        except requests.RequestException as e:
-            logger.error(f"Erro ao acessar {url}: {e}")
+    def _make_request(self, url: str, stop_condition_factory: Callable = None,
+                      circuit_breaker: CircuitBreaker = None) -> Optional[requests.Response]:
+        """Faz requisição HTTP com retentativas e circuit breaker da fonte
+        
+        stop_condition_factory, se informado, cria a cada tentativa a função
+        que decide interromper o download antes do fim da página;
+        circuit_breaker substitui o circuito da página da fonte (ex.: feed).
+        """
+        circuit_breaker = circuit_breaker or self.circuit_breaker
+        if not circuit_breaker.allow_request():
+            logger.warning(f"Circuito aberto para {circuit_breaker.name}, ignorando {url}")
             return None
+        
+        for attempt in range(retry_policy.max_retries + 1):
+            can_retry = attempt < retry_policy.max_retries
+            try:
+                stop_condition = stop_condition_factory() if stop_condition_factory else None
+                response = self._fetch(url, stop_condition)
+                circuit_breaker.record_success()
+                return response
+            except requests.HTTPError as e:
+                status_code = e.response.status_code
+                if not (can_retry and retry_policy.should_retry_status(status_code)):
+                    logger.error(f"Erro ao acessar {url}: {e}")
+                    break
+                delay = retry_policy.delay(attempt, e.response.headers.get('Retry-After'))
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if not can_retry:
+                    logger.error(f"Erro ao acessar {url}: {e}")
+                    break
+                delay = retry_policy.delay(attempt)
+            except requests.RequestException as e:
+                logger.error(f"Erro ao acessar {url}: {e}")
+                break
+            
+            logger.warning(f"Falha temporária em {url}, nova tentativa em {delay:.1f}s "
+                           f"({attempt + 1}/{retry_policy.max_retries})")
+            time.sleep(delay)
+        
+        circuit_breaker.record_failure()
+        return None
+    
+    def _fetch(self, url: str, stop_condition: Callable = None) -> requests.Response:
+        """Executa uma tentativa de requisição, usando o cache HTTP se disponível"""
+        host_rate_limiter.acquire(url)
+        headers = http_cache.conditional_headers(url) if http_cache else {}
+        response = self.http_client.get(url, headers=headers, timeout=self.timeout,
+                                        max_bytes=self.max_bytes, stop_condition=stop_condition)
+        
+        # Página não mudou: reutiliza o corpo armazenado
+        if response.status_code == 304 and http_cache:
+            cached_response = http_cache.load_response(url)
+            if cached_response is not None:
+                return cached_response
+            host_rate_limiter.acquire(url)
+            response = self.http_client.get(url, timeout=self.timeout,
+                                            max_bytes=self.max_bytes, stop_condition=stop_condition)
+        
+        response.raise_for_status()
+        if getattr(response, 'truncated', False) and self.max_bytes and len(response.content) >= self.max_bytes:
+            logger.warning(f"Download de {url} interrompido no limite de {self.max_bytes} bytes")
+        if http_cache:
+            http_cache.store(url, response)
+        return response
+    
+    def _load_cached_articles(self, url: str, response: requests.Response) -> Optional[List[NewsArticle]]:
+        """Reaproveita as notícias já extraídas de uma página que não mudou"""
+        if not http_cache or not getattr(response, 'from_cache', False):
+            return None
+        
+        records = http_cache.get_parsed(url)
+        if records is None:
+            return None
+        
+        articles = [
+            NewsArticle(
+                title=record['title'],
+                url=record['url'],
+                source=record['source'],
+                published_date=record.get('published_date'),
+                summary=record.get('summary')
+            )
+            for record in records
+        ]
+        logger.info(f"Página sem alterações, reutilizadas {len(articles)} notícias de {self.source_config['name']}")
+        return articles
+    
+    def _store_parsed_articles(self, url: str, articles: List[NewsArticle]):
+        """Guarda as notícias extraídas junto à versão em cache da página"""
+        if http_cache:
+            http_cache.store_parsed(url, [article.to_dict() for article in articles])
+    
+    def _only_new(self, articles: List[NewsArticle], state) -> List[NewsArticle]:
+        """Aplica as marcas incrementais da fonte a notícias já extraídas
+        
+        Usa as mesmas regras da coleta ao vivo: em páginas HTML só a URL
+        decide, então a página dá o mesmo resultado com ou sem resposta 304.
+        """
+        new_articles = []
+        for article in articles:
+            if state.is_known(article.url, article.published_date):
+                if state.exhausted:
+                    break
+                continue
+            state.record(article.url, article.published_date)
+            new_articles.append(article)
+        logger.info(f"{len(new_articles)} notícias novas de {self.source_config['name']} (página sem alterações)")
+        return new_articles
+    
+    def _declared_encoding(self, response: requests.Response) -> Optional[str]:
+        """Retorna o charset declarado no cabeçalho, se houver"""
+        # Sem charset explícito, deixa o parser detectar pelo <meta> da página
+        if 'charset' in response.headers.get('Content-Type', '').lower():
+            return response.encoding
+        return None
     
     def _clean_text(self, text: str) -> str:
         """Limpa texto removendo caracteres especiais e espaços extras"""
         if not text:
             return ""
         # Remove caracteres especiais e normaliza espaços
-        text = re.sub(r'\s+', ' ', text.strip())
-        text = re.sub(r'[^\w\s\-.,!?]', '', text)
+        text = _WHITESPACE.sub(' ', text.strip())
+        text = _SPECIAL_CHARS.sub('', text)
         return text
 
 
-class G1TecnologiaCollector(BaseNewsCollector):
-    """Coletor específico para G1 Tecnologia"""
+class GenericNewsCollector(BaseNewsCollector):
+    """Coletor de páginas HTML guiado pelas regras da fonte em NEWS_SOURCES"""
     
     def collect_news(self) -> List[NewsArticle]:
-        """Coleta notícias do G1 Tecnologia"""
+        """Coleta notícias da página configurada"""
         articles = []
-        response = self._make_request(self.source_config['url'])
+        state = source_states.begin(self.source_config['name'])
+        response = self._make_request(self.source_config['url'], self._link_counter_factory(state))
         
         if not response:
             return articles
         
-        soup = BeautifulSoup(response.content, 'html.parser')
+        cached_articles = self._load_cached_articles(self.source_config['url'], response)
+        if cached_articles is not None:
+            return self._only_new(cached_articles, state)
         
-        # Busca por links de notícias
-        news_links = soup.find_all('a', href=True)
+        # Links de notícias com título, data e resumo extraídos em uma única passada
+        candidates = self.page_parser.iter_articles(
+            response.content, self._declared_encoding(response), self.rules.is_news_link
+        )
+        seen_urls = set()
+        collected_at = datetime.now()
         
-        for link in news_links:
+        for candidate in candidates:
             try:
-                href = link.get('href')
-                if not href or href.startswith('#'):
+                title = candidate.title
+                if len(title) < self.rules.min_title_length:
                     continue
                 
-                # Filtra apenas links de notícias
-                if self._is_news_link(href):
-                    title = link.get_text(strip=True)
-                    if len(title) < COLLECTION_CONFIG['min_title_length']:
-                        continue
-                    
-                    # Constrói URL completa
-                    full_url = urljoin(self.source_config['url'], href)
-                    
-                    # Busca por data de publicação
-                    published_date = self._extract_published_date(link)
-                    
-                    # Busca por resumo
-                    summary = self._extract_summary(link)
-                    
-                    article = NewsArticle(
-                        title=title,
-                        url=full_url,
-                        source=self.source_config['name'],
-                        published_date=published_date,
-                        summary=summary
-                    )
-                    
-                    articles.append(article)
+                # Constrói URL completa e canônica
+                full_url = self.rules.canonical_url(urljoin(self.source_config['url'], candidate.href))
+                if full_url in seen_urls:
+                    continue
+                seen_urls.add(full_url)
+                
+                # Notícia já coletada em execução anterior (a página não é
+                # cronológica, então a varredura continua até o fim)
+                if state.is_known(full_url):
+                    continue
+                
+                published_date = normalize_published_date(candidate.published_date)
+                summary = self._clean_text(candidate.summary) or None
+                
+                article = NewsArticle(
+                    title=title,
+                    url=full_url,
+                    source=self.source_config['name'],
+                    published_date=published_date,
+                    summary=summary,
+                    collected_at=collected_at
+                )
+                
+                state.record(full_url, published_date)
+                articles.append(article)
+                
+                if len(articles) >= self.rules.max_articles:
+                    break
                     
-                    if len(articles) >= COLLECTION_CONFIG['max_articles_per_source']:
-                        break
-                        
             except Exception as e:
-                logger.error(f"Erro ao processar link do G1: {e}")
+                logger.error(f"Erro ao processar link de {self.source_config['name']}: {e}")
                 continue
         
-        logger.info(f"Coletadas {len(articles)} notícias do G1 Tecnologia")
+        self._store_parsed_articles(self.source_config['url'], articles)
+        logger.info(f"Coletadas {len(articles)} notícias de {self.source_config['name']}")
         return articles
     
-    def _is_news_link(self, href: str) -> bool:
-        """Verifica se o link é de uma notícia"""
-        # Padrões típicos de URLs de notícias do G1
-        patterns = [
-            r'/tecnologia/noticia/',
-            r'/tecnologia/',
-            r'/noticia/'
-        ]
-        return any(re.search(pattern, href) for pattern in patterns)
-    
-    def _extract_published_date(self, link_element) -> Optional[str]:
-        """Extrai data de publicação do elemento"""
-        try:
-            # Busca por elementos de data próximos
-            parent = link_element.parent
-            if parent:
-                time_element = parent.find('time')
-                if time_element:
-                    return time_element.get('datetime') or time_element.get_text(strip=True)
-        except:
-            pass
-        return None
-    
-    def _extract_summary(self, link_element) -> Optional[str]:
-        """Extrai resumo da notícia"""
-        try:
-            # Busca por resumo próximo ao link
-            parent = link_element.parent
-            if parent:
-                summary_element = parent.find(['p', 'div'], class_=re.compile(r'summary|resumo|desc'))
-                if summary_element:
-                    return self._clean_text(summary_element.get_text())
-        except:
-            pass
-        return None
+    def _link_counter_factory(self, state) -> Optional[Callable]:
+        """Interrompe o download ao encontrar links candidatos suficientes
+        
+        Links já coletados em execuções anteriores não contam para o limite:
+        as primeiras manchetes da página podem ser todas conhecidas, e as
+        novas mais abaixo precisam ser baixadas.
+        """
+        factor = COLLECTION_CONFIG['early_abort_link_factor']
+        if not factor:
+            return None
+        limit = self.rules.max_articles * factor
+        base_url = self.source_config['url']
+        
+        def is_new_link(href: str) -> bool:
+            if not self.rules.is_news_link(href):
+                return False
+            return not state.has_seen(self.rules.canonical_url(urljoin(base_url, href)))
+        
+        return lambda: LinkCounter(is_new_link, limit)
 
 
-class FolhaTecCollector(BaseNewsCollector):
-    """Coletor específico para Folha de S.Paulo - Tec"""
+class FeedCollector(GenericNewsCollector):
+    """Coletor de feeds RSS/Atom, com a página HTML da fonte como alternativa"""
+    
+    def __init__(self, source_config: Dict):
+        super().__init__(source_config)
+        # Circuito próprio: um feed quebrado não pode bloquear a coleta HTML alternativa
+        self.feed_circuit_breaker = circuit_breakers.get(f"{source_config['name']} (feed)")
     
     def collect_news(self) -> List[NewsArticle]:
-        """Coleta notícias da Folha Tec"""
-        articles = []
-        response = self._make_request(self.source_config['url'])
-        
-        if not response:
+        """Coleta notícias do feed, recorrendo ao HTML se o feed falhar"""
+        articles = self._collect_from_feed()
+        if articles is not None:
             return articles
         
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Busca por links de notícias
-        news_links = soup.find_all('a', href=True)
-        
-        for link in news_links:
-            try:
-                href = link.get('href')
-                if not href or href.startswith('#'):
-                    continue
-                
-                # Filtra apenas links de notícias
-                if self._is_news_link(href):
-                    title = link.get_text(strip=True)
-                    if len(title) < COLLECTION_CONFIG['min_title_length']:
-                        continue
-                    
-                    # Constrói URL completa
-                    full_url = urljoin(self.source_config['url'], href)
-                    
-                    # Busca por data de publicação
-                    published_date = self._extract_published_date(link)
-                    
-                    # Busca por resumo
-                    summary = self._extract_summary(link)
-                    
-                    article = NewsArticle(
-                        title=title,
-                        url=full_url,
-                        source=self.source_config['name'],
-                        published_date=published_date,
-                        summary=summary
-                    )
-                    
-                    articles.append(article)
-                    
-                    if len(articles) >= COLLECTION_CONFIG['max_articles_per_source']:
-                        break
-                        
-            except Exception as e:
-                logger.error(f"Erro ao processar link da Folha: {e}")
-                continue
+        if not self.source_config.get('url'):
+            return []
         
-        logger.info(f"Coletadas {len(articles)} notícias da Folha Tec")
-        return articles
-    
-    def _is_news_link(self, href: str) -> bool:
-        """Verifica se o link é de uma notícia"""
-        # Padrões típicos de URLs de notícias da Folha
-        patterns = [
-            r'/tec/',
-            r'/noticias/',
-            r'/colunas/'
-        ]
-        return any(re.search(pattern, href) for pattern in patterns)
-    
-    def _extract_published_date(self, link_element) -> Optional[str]:
-        """Extrai data de publicação do elemento"""
-        try:
-            # Busca por elementos de data próximos
-            parent = link_element.parent
-            if parent:
-                time_element = parent.find('time')
-                if time_element:
-                    return time_element.get('datetime') or time_element.get_text(strip=True)
-        except:
-            pass
-        return None
-    
-    def _extract_summary(self, link_element) -> Optional[str]:
-        """Extrai resumo da notícia"""
-        try:
-            # Busca por resumo próximo ao link
-            parent = link_element.parent
-            if parent:
-                summary_element = parent.find(['p', 'div'], class_=re.compile(r'summary|resumo|desc'))
-                if summary_element:
-                    return self._clean_text(summary_element.get_text())
-        except:
-            pass
-        return None
-
-
-class UOLTiltCollector(BaseNewsCollector):
-    """Coletor específico para UOL Tilt"""
+        logger.warning(f"Feed de {self.source_config['name']} sem notícias, usando coleta HTML")
+        return super().collect_news()
     
-    def collect_news(self) -> List[NewsArticle]:
-        """Coleta notícias do UOL Tilt"""
+    def _collect_from_feed(self) -> Optional[List[NewsArticle]]:
+        """Lê as entradas do feed configurado em 'feed_url'
+        
+        Retorna None quando o feed não está disponível ou não tem entradas;
+        uma lista vazia significa apenas que não há entradas novas.
+        """
         articles = []
-        response = self._make_request(self.source_config['url'])
+        feed_url = self.source_config.get('feed_url')
+        if not feed_url:
+            return None
         
+        response = self._make_request(feed_url, circuit_breaker=self.feed_circuit_breaker)
         if not response:
-            return articles
+            return None
         
-        soup = BeautifulSoup(response.content, 'html.parser')
+        state = source_states.begin(self.source_config['name'], ordered=True)
+        cached_articles = self._load_cached_articles(feed_url, response)
+        if cached_articles is not None:
+            return self._only_new(cached_articles, state)
         
-        # Busca por links de notícias
-        news_links = soup.find_all('a', href=True)
+        feed = feedparser.parse(response.content)
+        if feed.bozo and not feed.entries:
+            logger.error(f"Feed inválido em {feed_url}: {feed.get('bozo_exception')}")
+            return None
+        if not feed.entries:
+            return None
         
-        for link in news_links:
+        seen_urls = set()
+        collected_at = datetime.now()
+        
+        for entry in feed.entries:
             try:
-                href = link.get('href')
-                if not href or href.startswith('#'):
+                title = html_to_text(entry.get('title', ''))
+                link = entry.get('link')
+                if not link or len(title) < self.rules.min_title_length:
                     continue
                 
-                # Filtra apenas links de notícias
-                if self._is_news_link(href):
-                    title = link.get_text(strip=True)
-                    if len(title) < COLLECTION_CONFIG['min_title_length']:
-                        continue
-                    
-                    # Constrói URL completa
-                    full_url = urljoin(self.source_config['url'], href)
-                    
-                    # Busca por data de publicação
-                    published_date = self._extract_published_date(link)
-                    
-                    # Busca por resumo
-                    summary = self._extract_summary(link)
-                    
-                    article = NewsArticle(
-                        title=title,
-                        url=full_url,
-                        source=self.source_config['name'],
-                        published_date=published_date,
-                        summary=summary
-                    )
-                    
-                    articles.append(article)
-                    
-                    if len(articles) >= COLLECTION_CONFIG['max_articles_per_source']:
+                full_url = self.rules.canonical_url(urljoin(feed_url, link))
+                if full_url in seen_urls:
+                    continue
+                seen_urls.add(full_url)
+                
+                # Feeds vêm em ordem cronológica: para ao alcançar as entradas já vistas
+                published_date = self._entry_published_date(entry)
+                if state.is_known(full_url, published_date):
+                    if state.exhausted:
                         break
-                        
+                    continue
+                
+                summary = html_to_text(entry.get('summary', ''))
+                
+                article = NewsArticle(
+                    title=title,
+                    url=full_url,
+                    source=self.source_config['name'],
+                    published_date=published_date,
+                    summary=self._clean_text(summary) or None,
+                    collected_at=collected_at
+                )
+                
+                state.record(full_url, published_date)
+                articles.append(article)
+                
+                if len(articles) >= self.rules.max_articles:
+                    break
+                    
             except Exception as e:
-                logger.error(f"Erro ao processar link do UOL Tilt: {e}")
+                logger.error(f"Erro ao processar entrada do feed de {self.source_config['name']}: {e}")
                 continue
         
-        logger.info(f"Coletadas {len(articles)} notícias do UOL Tilt")
+        self._store_parsed_articles(feed_url, articles)
+        logger.info(f"Coletadas {len(articles)} notícias do feed de {self.source_config['name']}")
         return articles
     
-    def _is_news_link(self, href: str) -> bool:
-        """Verifica se o link é de uma notícia"""
-        # Padrões típicos de URLs de notícias do UOL Tilt
-        patterns = [
-            r'/tilt/',
-            r'/noticias/',
-            r'/colunas/'
-        ]
-        return any(re.search(pattern, href) for pattern in patterns)
-    
-    def _extract_published_date(self, link_element) -> Optional[str]:
-        """Extrai data de publicação do elemento"""
-        try:
-            # Busca por elementos de data próximos
-            parent = link_element.parent
-            if parent:
-                time_element = parent.find('time')
-                if time_element:
-                    return time_element.get('datetime') or time_element.get_text(strip=True)
-        except:
-            pass
-        return None
-    
-    def _extract_summary(self, link_element) -> Optional[str]:
-        """Extrai resumo da notícia"""
-        try:
-            # Busca por resumo próximo ao link
-            parent = link_element.parent
-            if parent:
-                summary_element = parent.find(['p', 'div'], class_=re.compile(r'summary|resumo|desc'))
-                if summary_element:
-                    return self._clean_text(summary_element.get_text())
-        except:
-            pass
-        return None
+    def _entry_published_date(self, entry) -> Optional[str]:
+        """Retorna a data da entrada em ISO 8601 ou o texto original"""
+        parsed = entry.get('published_parsed') or entry.get('updated_parsed')
+        if parsed:
+            return datetime(*parsed[:6], tzinfo=timezone.utc).isoformat()
+        return normalize_published_date(entry.get('published') or entry.get('updated'))
+
+
+# Coletores disponíveis, selecionados pelo campo 'type' de cada fonte
+COLLECTOR_TYPES = {
+    'html': GenericNewsCollector,
+    'rss': FeedCollector,
+    'atom': FeedCollector
+}
+
+
+def create_collector(source_config: Dict) -> BaseNewsCollector:
+    """Instancia o coletor adequado ao tipo da fonte"""
+    source_type = source_config.get('type', 'html')
+    collector_class = COLLECTOR_TYPES.get(source_type)
+    if collector_class is None:
+        logger.warning(f"Tipo de fonte desconhecido '{source_type}' em {source_config['name']}, usando HTML")
+        collector_class = GenericNewsCollector
+    return collector_class(source_config)
 
 
 class NewsCollectionManager:
@@ -384,70 +713,162 @@ class NewsCollectionManager:
     
     def __init__(self):
         self.collectors = {
-            'g1_tecnologia': G1TecnologiaCollector(NEWS_SOURCES['g1_tecnologia']),
-            'folha_tec': FolhaTecCollector(NEWS_SOURCES['folha_tec']),
-            'uol_tilt': UOLTiltCollector(NEWS_SOURCES['uol_tilt'])
+            source_key: create_collector(source_config)
+            for source_key, source_config in NEWS_SOURCES.items()
+            if source_config.get('enabled', True)
         }
-        self.collected_articles = []
+        self.keyword_matcher = KeywordMatcher(
+            COLLECTION_CONFIG['keywords_filter'],
+            fold_accents=COLLECTION_CONFIG['keywords_fold_accents'],
+            word_boundaries=COLLECTION_CONFIG['keywords_word_boundaries']
+        )
+        self.seen_index = SeenArticleIndex(
+            os.path.join(DATA_DIR, DEDUP_CONFIG['index_file']),
+            DEDUP_CONFIG['ttl_days']
+        ) if DEDUP_CONFIG['persistent_index'] else None
+        self.collected_articles = ArticleBatch()
+        self.collection_started_at = datetime.now(BRT)
     
-    def collect_all_news(self) -> List[NewsArticle]:
-        """Coleta notícias de todas as fontes"""
+    def collect_all_news(self) -> ArticleBatch:
+        """Coleta notícias de todas as fontes e as processa como um lote colunar"""
         all_articles = []
+        self.collection_started_at = datetime.now(BRT)
+        max_workers = min(COLLECTION_CONFIG['max_concurrent_sources'], len(self.collectors))
         
-        for source_name, collector in self.collectors.items():
-            try:
-                logger.info(f"Iniciando coleta de {source_name}")
-                articles = collector.collect_news()
-                all_articles.extend(articles)
-                
-                # Pausa entre coletas para não sobrecarregar os servidores
-                time.sleep(2)
-                
-            except Exception as e:
-                logger.error(f"Erro na coleta de {source_name}: {e}")
-                continue
+        if max_workers <= 1:
+            for source_name, collector in self.collectors.items():
+                all_articles.extend(self._collect_from_source(source_name, collector))
+        else:
+            # O ritmo de cada host é controlado pelo limitador de taxa,
+            # então a coleta total leva o tempo da fonte mais lenta
+            results = {}
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='coleta') as executor:
+                futures = {
+                    executor.submit(self._collect_from_source, source_name, collector): source_name
+                    for source_name, collector in self.collectors.items()
+                }
+                for future in as_completed(futures):
+                    results[futures[future]] = future.result()
+            
+            # Mantém a ordem das fontes definida na configuração
+            for source_name in self.collectors:
+                all_articles.extend(results.get(source_name, []))
+        
+        all_articles = ArticleBatch.from_articles(all_articles)
+        
+        # Sem notícias novas (respostas 304, circuitos abertos ou estado
+        # incremental) não há o que filtrar
+        if len(all_articles) > 0:
+            all_articles = self._process(all_articles)
+        
+        self.collected_articles = all_articles
+        logger.info(f"Coleta concluída. Total de {len(all_articles)} notícias únicas")
+        
+        pool_stats = http_client.get_stats()
+        logger.info(f"Conexões HTTP: {pool_stats['requests']} requisições em {pool_stats['connections_opened']} conexões "
+                    f"(reutilização {pool_stats['connection_reuse_rate']:.0%})")
+        
+        if http_cache:
+            stats = http_cache.get_stats()
+            logger.info(f"Cache HTTP: {stats['hits']} acertos, {stats['misses']} falhas, "
+                        f"{stats['entries']} entradas ({stats['size_bytes'] / 1024:.0f} KB)")
+        
+        return all_articles
+    
+    def _process(self, all_articles: ArticleBatch) -> ArticleBatch:
+        """Aplica ao lote coletado os filtros de idade, duplicatas e palavras-chave"""
+        # Descarta notícias fora da janela de tempo antes das demais etapas
+        if COLLECTION_CONFIG['max_article_age_hours']:
+            all_articles = self._filter_by_age(all_articles)
         
         # Remove duplicatas se configurado
         if COLLECTION_CONFIG['remove_duplicates']:
             all_articles = self._remove_duplicates(all_articles)
+            if DEDUP_CONFIG['near_duplicates']:
+                all_articles = self._remove_near_duplicates(all_articles)
         
         # Filtra por palavras-chave
         all_articles = self._filter_by_keywords(all_articles)
         
-        self.collected_articles = all_articles
-        logger.info(f"Coleta concluída. Total de {len(all_articles)} notícias únicas")
+        # Descarta notícias já entregues em execuções anteriores
+        if self.seen_index is not None:
+            all_articles = self._filter_already_seen(all_articles)
         
         return all_articles
     
-    def _remove_duplicates(self, articles: List[NewsArticle]) -> List[NewsArticle]:
+    def _collect_from_source(self, source_name: str, collector: BaseNewsCollector) -> List[NewsArticle]:
+        """Coleta notícias de uma única fonte, isolando falhas"""
+        try:
+            logger.info(f"Iniciando coleta de {source_name}")
+            return collector.collect_news()
+        except Exception as e:
+            logger.error(f"Erro na coleta de {source_name}: {e}")
+            return []
+    
+    def _filter_by_age(self, batch: ArticleBatch) -> ArticleBatch:
+        """Remove notícias publicadas antes da janela de max_article_age_hours"""
+        cutoff = self.collection_started_at - timedelta(hours=COLLECTION_CONFIG['max_article_age_hours'])
+        published = pd.to_datetime(
+            batch.frame['published_date'].map(lambda text: parse_published_date(text, self.collection_started_at)
+                                              if isinstance(text, str) else None),
+            utc=True
+        )
+        keep = (published >= cutoff) | (published.isna() & COLLECTION_CONFIG['keep_undated_articles'])
+        recent = batch.filter(keep)
+        
+        logger.info(f"Descartadas {len(batch) - len(recent)} notícias com mais de "
+                    f"{COLLECTION_CONFIG['max_article_age_hours']} horas")
+        return recent
+    
+    def _remove_duplicates(self, batch: ArticleBatch) -> ArticleBatch:
         """Remove notícias duplicadas baseado no hash"""
-        seen_hashes = set()
-        unique_articles = []
+        unique = batch.drop_duplicates('hash_id')
+        logger.info(f"Removidas {len(batch) - len(unique)} duplicatas")
+        return unique
+    
+    def _remove_near_duplicates(self, batch: ArticleBatch) -> ArticleBatch:
+        """Remove a mesma notícia publicada por outra fonte ou em outra URL"""
+        summaries = batch.frame['summary'].astype(object).where(batch.frame['summary'].notna(), None)
+        unique = batch.filter(near_duplicate_mask(batch.frame['title'], summaries,
+                                                  DEDUP_CONFIG['near_duplicate_threshold']))
+        logger.info(f"Removidas {len(batch) - len(unique)} notícias quase duplicadas")
+        return unique
+    
+    def _filter_already_seen(self, batch: ArticleBatch) -> ArticleBatch:
+        """Remove notícias presentes no índice persistente (já entregues)"""
+        self.seen_index.compact()
         
-        for article in articles:
-            if article.hash_id not in seen_hashes:
-                seen_hashes.add(article.hash_id)
-                unique_articles.append(article)
+        hashes = batch.frame['hash_id']
+        seen_hashes = self.seen_index.find_seen(hashes.tolist())
+        new = batch.filter(~hashes.isin(seen_hashes).to_numpy())
+        
+        logger.info(f"Ignoradas {len(batch) - len(new)} notícias já entregues anteriormente")
+        return new
+    
+    def mark_delivered(self, batch):
+        """Registra as notícias como entregues, para não reenviá-las nem recoletá-las
         
-        logger.info(f"Removidas {len(articles) - len(unique_articles)} duplicatas")
-        return unique_articles
+        Deve ser chamado só depois que os resultados foram gravados ou enviados;
+        coletas de teste não chamam, então não consomem notícias.
+        """
+        if self.seen_index is not None:
+            self.seen_index.add(ArticleBatch.from_articles(batch).frame['hash_id'].tolist())
+        
+        # Só agora as notícias desta coleta passam a contar como conhecidas pelas fontes
+        source_states.save()
     
-    def _filter_by_keywords(self, articles: List[NewsArticle]) -> List[NewsArticle]:
+    def _filter_by_keywords(self, batch: ArticleBatch) -> ArticleBatch:
         """Filtra notícias por palavras-chave relevantes"""
-        keywords = COLLECTION_CONFIG['keywords_filter']
-        filtered_articles = []
+        # Título e resumo são varridos juntos pelo autômato em uma passada
+        texts = batch.frame['title'] + '\n' + batch.frame['summary'].fillna('')
+        matched = texts.map(self.keyword_matcher.find)
+        keep = matched.map(bool).to_numpy()
         
-        for article in articles:
-            title_lower = article.title.lower()
-            summary_lower = (article.summary or "").lower()
-            
-            # Verifica se alguma palavra-chave está presente
-            if any(keyword.lower() in title_lower or keyword.lower() in summary_lower 
-                   for keyword in keywords):
-                filtered_articles.append(article)
+        filtered = batch.filter(keep)
+        filtered.frame['matched_keywords'] = matched[keep].tolist()
         
-        logger.info(f"Filtradas {len(articles) - len(filtered_articles)} notícias por palavras-chave")
-        return filtered_articles
+        logger.info(f"Filtradas {len(batch) - len(filtered)} notícias por palavras-chave")
+        return filtered
 
 
 if __name__ == "__main__":
@@ -0,0 +1,211 @@
+"""
+Compactação e retenção dos arquivos de saída
+Junta os dados de cada execução (CSV/JSON) em arquivos compactados por dia
+ou por mês, sem duplicatas, e remove arquivos antigos conforme a retenção
+(relatórios HTML e resumos diários têm retenção própria)
+"""
+
+import gzip
+import heapq
+import json
+import os
+import re
+import threading
+from datetime import datetime, timedelta
+from itertools import groupby
+from typing import Dict, Iterable, Iterator, List, Optional
+import logging
+
+import pandas as pd
+
+from news_collector import ArticleBatch
+
+logger = logging.getLogger(__name__)
+
+RUN_FILE = re.compile(r'^noticias_tecnologia_(\d{8})_(\d{6})\.(csv|json)$')
+REPORT_FILE = re.compile(r'^noticias_tecnologia_(\d{8})_\d{6}\.html$')
+SUMMARY_FILE = re.compile(r'^resumo_diario_(\d{8})\.json$')
+ARCHIVE_FILE = re.compile(r'^noticias_(\d{6}|\d{8})\.jsonl\.gz$')
+
+# Preferência de formato ao ler os dados de uma execução
+_DATA_FORMATS = ('csv', 'json')
+
+
+def _merge_key(record: Dict):
+    return record['hash_id'], record.get('collected_at') or ''
+
+
+class OutputCompactor:
+    """Compacta as execuções antigas de output/ em archive/
+
+    Os arquivos compactados são JSON Lines (gzip) ordenados por hash_id. A
+    junção é um k-way merge (heapq.merge) entre o arquivo já existente, lido
+    em streaming, e no máximo max_open_runs execuções por vez, então notícias
+    repetidas ficam adjacentes e são descartadas sem um índice em memória.
+    Entre duplicatas, fica a coletada primeiro.
+    """
+
+    def __init__(self, output_dir: str, archive_dir: str, period: str = 'monthly',
+                 compact_after_days: int = 2, archive_retention_days: int = 0,
+                 summary_retention_days: int = 0, report_retention_days: int = 0,
+                 max_open_runs: int = 32, manifest=None):
+        if period not in ('daily', 'monthly'):
+            raise ValueError(f"Período de arquivamento desconhecido: {period}")
+        self.output_dir = output_dir
+        self.archive_dir = archive_dir
+        self.period = period
+        self.compact_after_days = compact_after_days
+        self.archive_retention_days = archive_retention_days
+        self.summary_retention_days = summary_retention_days
+        self.report_retention_days = report_retention_days
+        self.max_open_runs = max(1, max_open_runs)
+        self.manifest = manifest
+        self._lock = threading.Lock()
+
+    def run(self, now: datetime = None) -> Dict[str, int]:
+        """Compacta as execuções antigas e aplica a retenção; devolve as contagens"""
+        now = now or datetime.now()
+        with self._lock:
+            stats = self.compact(now)
+            stats.update(self.apply_retention(now))
+        logger.info(
+            f"Manutenção de output/: {stats['runs_compacted']} execuções compactadas, "
+            f"{stats['articles_archived']} notícias nos arquivos, {stats['files_removed']} arquivos removidos"
+        )
+        return stats
+
+    def compact(self, now: datetime) -> Dict[str, int]:
+        """Incorpora aos arquivos compactados as execuções com mais de compact_after_days"""
+        stats = {'runs_compacted': 0, 'articles_archived': 0, 'files_removed': 0}
+        cutoff = now - timedelta(days=self.compact_after_days)
+
+        runs: Dict[str, Dict[str, str]] = {}
+        for filename in os.listdir(self.output_dir):
+            match = RUN_FILE.match(filename)
+            if not match:
+                continue
+            run_id = f"{match.group(1)}_{match.group(2)}"
+            if datetime.strptime(run_id, '%Y%m%d_%H%M%S') >= cutoff:
+                continue
+            runs.setdefault(run_id, {})[match.group(3)] = os.path.join(self.output_dir, filename)
+        if not runs:
+            return stats
+
+        os.makedirs(self.archive_dir, exist_ok=True)
+        removed: Dict[str, List[str]] = {}
+        for label, period_runs in groupby(sorted(runs), key=self._period_label):
+            period_runs = list(period_runs)
+            archive_path = os.path.join(self.archive_dir, f"noticias_{label}.jsonl.gz")
+            existed = os.path.exists(archive_path)
+
+            count = None
+            for start in range(0, len(period_runs), self.max_open_runs):
+                chunk = period_runs[start:start + self.max_open_runs]
+                loaded = {run_id: self._load_run(runs[run_id]) for run_id in chunk}
+                chunk = [run_id for run_id in chunk if loaded[run_id] is not None]
+                if any(loaded[run_id] for run_id in chunk):
+                    count = self._merge_into(archive_path, [loaded[run_id] for run_id in chunk])
+
+                # Só remove os arquivos das execuções depois que o arquivo compactado foi gravado
+                for run_id in chunk:
+                    for file_format, path in runs[run_id].items():
+                        os.remove(path)
+                        removed.setdefault(file_format, []).append(path)
+                        stats['files_removed'] += 1
+                stats['runs_compacted'] += len(chunk)
+
+            if count is None:
+                continue
+            stats['articles_archived'] += count
+            if self.manifest is not None:
+                self.manifest.record_file('archive', archive_path, count, new_file=not existed)
+
+        self._forget(removed)
+        return stats
+
+    def apply_retention(self, now: datetime) -> Dict[str, int]:
+        """Remove arquivos compactados, resumos diários e relatórios HTML mais antigos que a retenção"""
+        removed: Dict[str, List[str]] = {'archive': [], 'summary': [], 'html': []}
+        if self.archive_retention_days and os.path.isdir(self.archive_dir):
+            cutoff = (now - timedelta(days=self.archive_retention_days)).strftime('%Y%m%d')
+            for filename in os.listdir(self.archive_dir):
+                match = ARCHIVE_FILE.match(filename)
+                # Arquivos mensais expiram quando o último dia do mês passa da retenção
+                if match and match.group(1).ljust(8, '9') < cutoff:
+                    removed['archive'].append(os.path.join(self.archive_dir, filename))
+
+        for kind, pattern, retention_days in (('summary', SUMMARY_FILE, self.summary_retention_days),
+                                              ('html', REPORT_FILE, self.report_retention_days)):
+            if not retention_days:
+                continue
+            cutoff = (now - timedelta(days=retention_days)).strftime('%Y%m%d')
+            for filename in os.listdir(self.output_dir):
+                match = pattern.match(filename)
+                if match and match.group(1) < cutoff:
+                    removed[kind].append(os.path.join(self.output_dir, filename))
+
+        for paths in removed.values():
+            for path in paths:
+                os.remove(path)
+        self._forget(removed)
+        return {
+            'archives_removed': len(removed['archive']),
+            'summaries_removed': len(removed['summary']),
+            'reports_removed': len(removed['html'])
+        }
+
+    def _forget(self, removed: Dict[str, List[str]]):
+        """Atualiza o manifesto com os arquivos removidos"""
+        if self.manifest is None:
+            return
+        for kind, paths in removed.items():
+            self.manifest.record_removed(kind, paths)
+
+    @staticmethod
+    def iter_archive(path: str) -> Iterator[Dict]:
+        """Lê em streaming as notícias de um arquivo compactado"""
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def _merge_into(self, archive_path: str, runs: List[List[Dict]]) -> int:
+        """Grava archive_path com a junção do conteúdo atual e das execuções, sem duplicatas"""
+        sources: List[Iterable[Dict]] = list(runs)
+        if os.path.exists(archive_path):
+            sources.append(self.iter_archive(archive_path))
+
+        tmp_path = f"{archive_path}.tmp"
+        count = 0
+        last_hash = None
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            for record in heapq.merge(*sources, key=_merge_key):
+                if record['hash_id'] == last_hash:
+                    continue
+                last_hash = record['hash_id']
+                f.write(json.dumps(record, ensure_ascii=False))
+                f.write('\n')
+                count += 1
+        os.replace(tmp_path, archive_path)
+        return count
+
+    @staticmethod
+    def _load_run(files: Dict[str, str]) -> Optional[List[Dict]]:
+        """Notícias de uma execução ordenadas pela chave de junção
+
+        Arquivos ilegíveis devolvem None e a execução fica em output/.
+        """
+        path = next(files[file_format] for file_format in _DATA_FORMATS if file_format in files)
+        try:
+            if path.endswith('.csv'):
+                batch = ArticleBatch(pd.read_csv(path, encoding='utf-8-sig', dtype=str))
+            else:
+                with open(path, 'r', encoding='utf-8') as f:
+                    batch = ArticleBatch.from_records(json.load(f))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Execução ignorada na compactação ({path}): {e}")
+            return None
+        return sorted(batch.to_records(), key=_merge_key)
+
+    def _period_label(self, run_id: str) -> str:
+        return run_id[:8] if self.period == 'daily' else run_id[:6]
@@ -0,0 +1,104 @@
+"""
+Manifesto do diretório de saída
+Mantém em um único arquivo JSON o arquivo mais recente de cada tipo, a
+contagem de arquivos existentes e os metadados das últimas execuções, para
+que status e buscas pelo último arquivo não precisem listar o diretório
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class OutputManifest:
+    """Índice dos arquivos gravados em output/
+
+    Cada atualização relê o manifesto, aplica a mudança e grava o arquivo de
+    forma atômica (arquivo temporário + os.replace).
+    """
+
+    def __init__(self, output_dir: str, filename: str = 'manifest.json', max_runs: int = 100):
+        self.output_dir = output_dir
+        self.path = os.path.join(output_dir, filename)
+        self.max_runs = max_runs
+        self._lock = threading.Lock()
+
+    def record_file(self, kind: str, path: str, articles: int = None, new_file: bool = True):
+        """Registra um arquivo gravado como o mais recente do seu tipo
+
+        new_file=False indica que um arquivo já contado foi reescrito.
+        """
+        entry = {
+            'file': os.path.relpath(path, self.output_dir),
+            'written_at': datetime.now().isoformat(),
+            'articles': articles
+        }
+        with self._lock:
+            manifest = self.load()
+            manifest['latest'][kind] = entry
+            if new_file:
+                manifest['counts'][kind] = manifest['counts'].get(kind, 0) + 1
+            self._save(manifest)
+
+    def record_removed(self, kind: str, paths: List[str]):
+        """Desconta da contagem os arquivos removidos (compactação e retenção)"""
+        if not paths:
+            return
+        removed = {os.path.relpath(path, self.output_dir) for path in paths}
+        with self._lock:
+            manifest = self.load()
+            manifest['counts'][kind] = max(0, manifest['counts'].get(kind, 0) - len(removed))
+            latest = manifest['latest'].get(kind)
+            if latest and latest['file'] in removed:
+                del manifest['latest'][kind]
+            self._save(manifest)
+
+    def record_run(self, run_id: str, articles: int, files: Dict[str, Optional[str]]):
+        """Registra os metadados de uma execução (notícias e arquivos por destino)"""
+        run = {
+            'run_id': run_id,
+            'finished_at': datetime.now().isoformat(),
+            'articles': articles,
+            'files': {kind: value for kind, value in files.items() if value}
+        }
+        with self._lock:
+            manifest = self.load()
+            manifest['runs'] = (manifest['runs'] + [run])[-self.max_runs:]
+            self._save(manifest)
+
+    def latest(self, kind: str) -> Optional[str]:
+        """Caminho do arquivo mais recente do tipo, ou None se não registrado ou removido"""
+        entry = self.load()['latest'].get(kind)
+        if not entry:
+            return None
+        path = os.path.join(self.output_dir, entry['file'])
+        return path if os.path.exists(path) else None
+
+    def load(self) -> Dict:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            manifest = {}
+        manifest.setdefault('latest', {})
+        manifest.setdefault('counts', {})
+        manifest.setdefault('runs', [])
+        return manifest
+
+    def recent_runs(self, limit: int = 5) -> List[Dict]:
+        return self.load()['runs'][-limit:][::-1]
+
+    def _save(self, manifest: Dict):
+        manifest['updated_at'] = datetime.now().isoformat()
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Não foi possível atualizar o manifesto de saída: {e}")
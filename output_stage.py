@@ -0,0 +1,152 @@
+"""
+Etapa de saída do sistema de coleta de notícias
+Materializa uma única vez os registros e o relatório HTML de uma coleta e
+entrega os dados aos destinos (histórico, diário e arquivos) em paralelo
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+import logging
+
+from config import OUTPUT_CONFIG
+from news_collector import ArticleBatch
+
+logger = logging.getLogger(__name__)
+
+# Formatos aceitos em OUTPUT_CONFIG['file_format']
+OUTPUT_FORMATS = ('csv', 'json', 'html', 'parquet')
+
+SINK_LABELS = {
+    'store': 'Histórico (coleta)',
+    'journal': 'Diário',
+    'csv': 'CSV',
+    'json': 'JSON',
+    'html': 'HTML',
+    'parquet': 'Parquet'
+}
+
+
+# Antes da lista, FILE_FORMAT tinha um único valor e as execuções gravavam sempre estes três
+LEGACY_FORMATS = ['csv', 'json', 'html']
+
+
+def configured_formats() -> List[str]:
+    """Formatos de arquivo configurados, na ordem em que devem ser gravados
+
+    Um valor único antigo (ex.: FILE_FORMAT=html) mantém a saída anterior
+    (csv, json e html), da qual dependem a compactação e os artefatos do
+    workflow; para gravar um só formato, termine a lista com vírgula ("html,").
+    """
+    value = OUTPUT_CONFIG['file_format']
+    formats = [name.strip().lower() for name in value.split(',') if name.strip()]
+    if ',' not in value and len(formats) == 1 and formats[0] in LEGACY_FORMATS:
+        logger.warning(f"FILE_FORMAT={value} é um valor antigo: gravando {','.join(LEGACY_FORMATS)} "
+                       f"(use \"{formats[0]},\" para gravar só esse formato)")
+        return list(LEGACY_FORMATS)
+    unknown = [name for name in formats if name not in OUTPUT_FORMATS]
+    if unknown:
+        logger.warning(f"Formatos de saída desconhecidos ignorados: {', '.join(unknown)}")
+    return [name for name in formats if name in OUTPUT_FORMATS]
+
+
+def default_sinks(include_files: bool = True) -> List[str]:
+    """Histórico e diário sempre; arquivos em output/ conforme a configuração"""
+    return ['store', 'journal'] + (configured_formats() if include_files else [])
+
+
+class CollectionOutput:
+    """Dados de uma coleta prontos para gravação
+
+    Registros e HTML são gerados na primeira vez que algum destino os pede e
+    reaproveitados pelos demais (inclusive pelo envio de e-mail).
+    """
+
+    def __init__(self, articles, data_processor):
+        self.batch = ArticleBatch.from_articles(articles)
+        self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self._data_processor = data_processor
+        self._records = None
+        self._html = None
+        self._records_lock = threading.Lock()
+        self._html_lock = threading.Lock()
+        self.failed_sinks: List[str] = []
+
+    @property
+    def records(self) -> List[Dict]:
+        with self._records_lock:
+            if self._records is None:
+                self._records = self.batch.to_records()
+            return self._records
+
+    @property
+    def html(self) -> str:
+        with self._html_lock:
+            if self._html is None:
+                self._html = self._data_processor.render_html_report(self.batch)
+            return self._html
+
+    def filename(self, extension: str) -> str:
+        return f"noticias_tecnologia_{self.timestamp}.{extension}"
+
+
+# Destinos: recebem o DataProcessor e a saída materializada e devolvem o
+# caminho gravado (ou o identificador da coleta, no caso do histórico)
+OUTPUT_SINKS: Dict[str, Callable] = {
+    'store': lambda processor, output: processor.save_to_store(output.batch),
+    'journal': lambda processor, output: processor.append_to_journal(output.batch, records=output.records),
+    'csv': lambda processor, output: processor.save_to_csv(output.batch, output.filename('csv')),
+    'json': lambda processor, output: processor.save_to_json(output.batch, output.filename('json'), records=output.records),
+    'html': lambda processor, output: processor.save_to_html(output.batch, output.filename('html'), html_content=output.html),
+    'parquet': lambda processor, output: processor.save_to_parquet(output.batch)
+}
+
+
+class OutputStage:
+    """Grava uma coleta em vários destinos ao mesmo tempo
+
+    A falha de um destino é registrada no log e não impede os demais.
+    """
+
+    def __init__(self, data_processor, max_workers: int = None, on_delivered: Callable = None):
+        self.data_processor = data_processor
+        self.max_workers = max_workers or OUTPUT_CONFIG['output_workers']
+        # Chamado com o lote quando todos os destinos gravaram sem erro
+        self.on_delivered = on_delivered
+
+    def run(self, articles, sinks: List[str] = None) -> Tuple[CollectionOutput, Dict[str, Optional[str]]]:
+        """Materializa a coleta e grava nos destinos
+
+        Retorna a saída materializada e um dicionário destino -> resultado
+        (None quando o destino está desativado ou falhou), na ordem pedida.
+        Destinos com erro ficam em output.failed_sinks.
+        """
+        output = CollectionOutput(articles, self.data_processor)
+        sinks = default_sinks() if sinks is None else sinks
+        unknown = [name for name in sinks if name not in OUTPUT_SINKS]
+        if unknown:
+            raise ValueError(f"Destinos de saída desconhecidos: {', '.join(unknown)}")
+
+        max_workers = min(self.max_workers, len(sinks))
+        if max_workers <= 1:
+            written = {name: self._write(name, output) for name in sinks}
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='saida') as executor:
+                futures = {name: executor.submit(self._write, name, output) for name in sinks}
+                written = {name: future.result() for name, future in futures.items()}
+
+        results = {name: result for name, (result, _) in written.items()}
+        output.failed_sinks = [name for name, (_, ok) in written.items() if not ok]
+        self.data_processor.manifest.record_run(output.timestamp, len(output.batch), results)
+
+        if self.on_delivered is not None and not output.failed_sinks:
+            self.on_delivered(output.batch)
+        return output, results
+
+    def _write(self, name: str, output: CollectionOutput) -> Tuple[Optional[str], bool]:
+        try:
+            return OUTPUT_SINKS[name](self.data_processor, output), True
+        except Exception as e:
+            logger.error(f"Erro ao gravar destino {name}: {e}")
+            return None, False
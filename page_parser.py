@@ -0,0 +1,230 @@
+"""
+Motores de parsing de páginas para o sistema de coleta de notícias
+Extraem links de notícias com título, data e resumo do contêiner imediato,
+evitando construir a árvore completa do html.parser para portais grandes
+"""
+
+from typing import Callable, Iterator, List, NamedTuple, Optional
+import logging
+import re
+
+from bs4 import BeautifulSoup, SoupStrainer
+from lxml import etree, html as lxml_html
+
+logger = logging.getLogger(__name__)
+
+# Padrões usados quando a fonte não define regras próprias
+DEFAULT_SUMMARY_CLASS_PATTERN = r'summary|resumo|desc'
+DEFAULT_DATE_TAGS = ['time']
+DEFAULT_SUMMARY_TAGS = ['p', 'div']
+
+# Tags que costumam envolver diretamente os links de manchetes
+DEFAULT_CONTAINER_TAGS = ['article', 'li', 'h1', 'h2', 'h3', 'h4', 'figure']
+
+
+def _normalize_whitespace(text: str) -> str:
+    return ' '.join(text.split())
+
+
+def _tag_test(tags: List[str]) -> str:
+    """Monta o predicado XPath que aceita qualquer uma das tags"""
+    return ' or '.join(f'self::{tag}' for tag in tags)
+
+
+class LinkCandidate(NamedTuple):
+    """Link de notícia com os dados encontrados no seu contêiner"""
+    href: str
+    title: str
+    published_date: Optional[str]
+    summary: Optional[str]
+
+
+LinkFilter = Callable[[str], bool]
+
+
+def html_to_text(fragment: str) -> str:
+    """Converte um trecho HTML (ex.: resumo de feed) em texto simples"""
+    if not fragment or '<' not in fragment:
+        return _normalize_whitespace(fragment or '')
+    try:
+        return _normalize_whitespace(lxml_html.fragment_fromstring(fragment, create_parent='div').text_content())
+    except (etree.ParserError, ValueError):
+        return _normalize_whitespace(fragment)
+
+
+class _Frame:
+    """Primeiros elementos de data e resumo na subárvore de um elemento"""
+
+    __slots__ = ('time', 'summary', 'links')
+
+    def __init__(self):
+        self.time = None
+        self.summary = None
+        self.links = None
+
+
+class LxmlPageParser:
+    """Parser baseado em lxml que extrai os links em uma única passada pela árvore
+
+    A árvore é percorrida uma vez com iterwalk: ao fechar cada elemento, o
+    primeiro <time> e o primeiro resumo da sua subárvore sobem para o pai, e
+    os links pendentes do elemento recebem esses valores. O resultado é o
+    mesmo de buscar data e resumo no pai de cada link, sem revisitar subárvores.
+    """
+
+    name = 'lxml'
+
+    def __init__(self, date_tags: List[str] = None, summary_tags: List[str] = None,
+                 summary_class_pattern: str = None, **kwargs):
+        self._date_tags = frozenset(date_tags or DEFAULT_DATE_TAGS)
+        self._summary_tags = frozenset(summary_tags or DEFAULT_SUMMARY_TAGS)
+        self._summary_class = re.compile(summary_class_pattern or DEFAULT_SUMMARY_CLASS_PATTERN)
+
+    def iter_articles(self, content: bytes, encoding: Optional[str] = None,
+                      link_filter: Optional[LinkFilter] = None) -> Iterator[LinkCandidate]:
+        """Itera, em ordem do documento, sobre os links aceitos por link_filter"""
+        try:
+            parser = lxml_html.HTMLParser(encoding=encoding) if encoding else None
+            root = lxml_html.document_fromstring(content, parser=parser)
+        except (etree.ParserError, ValueError) as e:
+            logger.warning(f"Página não pôde ser interpretada: {e}")
+            return iter([])
+        return iter(self._walk(root, link_filter))
+
+    def _walk(self, root, link_filter: Optional[LinkFilter]) -> List[LinkCandidate]:
+        results = []
+        stack = []
+        for event, element in etree.iterwalk(root, events=('start', 'end')):
+            if event == 'start':
+                stack.append(_Frame())
+                continue
+
+            # Neste ponto o frame guarda apenas os descendentes, como nas buscas a partir do pai
+            frame = stack.pop()
+            if frame.links:
+                self._resolve(results, frame)
+
+            if not stack:
+                continue
+            parent = stack[-1]
+            tag = element.tag
+            if isinstance(tag, str):
+                # O próprio elemento vem antes dos seus descendentes na ordem do documento
+                if tag in self._date_tags:
+                    frame.time = element
+                elif tag in self._summary_tags and self._summary_class.search(element.get('class') or ''):
+                    frame.summary = element
+            if parent.time is None:
+                parent.time = frame.time
+            if parent.summary is None:
+                parent.summary = frame.summary
+
+            if tag == 'a':
+                href = element.get('href')
+                if href and not href.startswith('#') and (link_filter is None or link_filter(href)):
+                    # Data e resumo vêm do contêiner: resolvidos quando o pai fechar
+                    if parent.links is None:
+                        parent.links = []
+                    parent.links.append((len(results), href, element))
+                    results.append(None)
+
+        return [candidate for candidate in results if candidate is not None]
+
+    @staticmethod
+    def _resolve(results: List, frame: _Frame):
+        published_date = None
+        if frame.time is not None:
+            published_date = frame.time.get('datetime') or _normalize_whitespace(frame.time.text_content())
+        summary = frame.summary.text_content() if frame.summary is not None else None
+        for position, href, element in frame.links:
+            results[position] = LinkCandidate(href, _normalize_whitespace(element.text_content()),
+                                              published_date, summary)
+
+
+class SoupPageParser:
+    """Parser BeautifulSoup com backend lxml restrito aos contêineres de links"""
+
+    name = 'soup'
+
+    def __init__(self, date_tags: List[str] = None, summary_tags: List[str] = None,
+                 summary_class_pattern: str = None, container_tags: List[str] = None, **kwargs):
+        self._date_tags = date_tags or DEFAULT_DATE_TAGS
+        self._summary_tags = summary_tags or DEFAULT_SUMMARY_TAGS
+        self._summary_class = re.compile(summary_class_pattern or DEFAULT_SUMMARY_CLASS_PATTERN)
+        self._strainer = SoupStrainer((container_tags or DEFAULT_CONTAINER_TAGS) + ['a'])
+
+    def iter_articles(self, content: bytes, encoding: Optional[str] = None,
+                      link_filter: Optional[LinkFilter] = None) -> Iterator[LinkCandidate]:
+        """Itera, em ordem do documento, sobre os links aceitos por link_filter"""
+        soup = BeautifulSoup(content, 'lxml', parse_only=self._strainer, from_encoding=encoding)
+        for link in soup.find_all('a', href=True):
+            href = link['href']
+            if href.startswith('#') or (link_filter is not None and not link_filter(href)):
+                continue
+            yield LinkCandidate(href, _normalize_whitespace(link.get_text(' ')),
+                                self.find_published_date(link), self.find_summary(link))
+
+    def find_published_date(self, link) -> Optional[str]:
+        """Busca elemento <time> no contêiner do link"""
+        parent = self._container(link)
+        if parent is None:
+            return None
+        time_element = parent.find(self._date_tags)
+        if not time_element:
+            return None
+        return time_element.get('datetime') or time_element.get_text(strip=True)
+
+    def find_summary(self, link) -> Optional[str]:
+        """Busca parágrafo de resumo no contêiner do link"""
+        parent = self._container(link)
+        if parent is None:
+            return None
+        summary_element = parent.find(self._summary_tags, class_=self._summary_class)
+        return summary_element.get_text() if summary_element else None
+
+    @staticmethod
+    def _container(link):
+        # Links fora de contêineres conhecidos ficam pendurados na raiz do
+        # documento filtrado; buscar nela varreria a página inteira
+        parent = link.parent
+        if parent is None or parent.name == BeautifulSoup.ROOT_TAG_NAME:
+            return None
+        return parent
+
+
+class LinkCounter:
+    """Conta links de notícias durante o download para interrompê-lo cedo
+
+    Usado como stop_condition do cliente HTTP: recebe cada bloco baixado,
+    alimenta um parser incremental e retorna True ao encontrar limit links
+    aceitos por is_news_link.
+    """
+
+    def __init__(self, is_news_link: Callable[[str], bool], limit: int):
+        self.is_news_link = is_news_link
+        self.limit = limit
+        self.count = 0
+        self._parser = etree.HTMLPullParser(events=('start',), tag='a')
+
+    def __call__(self, chunk: bytes) -> bool:
+        self._parser.feed(chunk)
+        for _, element in self._parser.read_events():
+            href = element.get('href')
+            if href and self.is_news_link(href):
+                self.count += 1
+        return self.count >= self.limit
+
+
+PAGE_PARSERS = {
+    LxmlPageParser.name: LxmlPageParser,
+    SoupPageParser.name: SoupPageParser
+}
+
+
+def get_page_parser(engine: str = 'lxml', **options):
+    """Retorna uma instância do motor de parsing configurado"""
+    try:
+        parser_class = PAGE_PARSERS[engine]
+    except KeyError:
+        raise ValueError(f"Motor de parsing desconhecido: {engine}")
+    return parser_class(**options)
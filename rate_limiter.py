@@ -0,0 +1,80 @@
+"""
+Limitador de taxa por host para o sistema de coleta de notícias
+Implementa token bucket por hostname, substituindo pausas fixas entre fontes
+"""
+
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+
+class TokenBucket:
+    """Balde de tokens thread-safe para um único host"""
+
+    def __init__(self, requests_per_second: float, burst: int = 1):
+        self.rate = float(requests_per_second)
+        self.capacity = max(1, int(burst))
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Reserva um token e retorna quantos segundos esperar antes de usá-lo"""
+        if self.rate <= 0:
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+
+            # Saldo negativo funciona como fila: cada chamada espera sua vez
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def acquire(self) -> float:
+        """Bloqueia até haver token disponível e retorna o tempo esperado"""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class HostRateLimiter:
+    """Registro de token buckets indexado por hostname"""
+
+    def __init__(self, requests_per_second: float = 0.5, burst: int = 1):
+        self.default_rate = requests_per_second
+        self.default_burst = burst
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, host: str, requests_per_second: Optional[float] = None, burst: Optional[int] = None):
+        """Define limites de um host; se já configurado, mantém o mais restritivo"""
+        rate = self.default_rate if requests_per_second is None else requests_per_second
+        burst = self.default_burst if burst is None else burst
+        host = host.lower()
+
+        with self._lock:
+            current = self._buckets.get(host)
+            if current is not None and current.rate > 0 and (rate <= 0 or current.rate <= rate):
+                current.capacity = min(current.capacity, max(1, int(burst)))
+                return
+            self._buckets[host] = TokenBucket(rate, burst)
+
+    def acquire(self, url: str) -> float:
+        """Aguarda a vez de requisitar a URL respeitando o limite do seu host"""
+        host = (urlparse(url).hostname or '').lower()
+        return self._bucket_for(host).acquire()
+
+    def _bucket_for(self, host: str) -> TokenBucket:
+        """Retorna o bucket do host, criando um com os limites padrão se preciso"""
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.default_rate, self.default_burst)
+                self._buckets[host] = bucket
+            return bucket
@@ -0,0 +1,178 @@
+"""
+Renderização do relatório HTML de notícias
+Modelos pré-compilados (string.Template), saída em blocos unidos com join ou
+gravados direto em um arquivo, e cache de relatórios por conjunto de notícias
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from html import escape
+from string import Template
+from typing import IO, Iterator
+import logging
+
+from news_collector import ArticleBatch
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_LENGTH = 200
+
+# Blocos do relatório: CSS e rodapé são fixos, cabeçalho e notícias são preenchidos
+HEADER = Template("""<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Relatório de Notícias de Tecnologia</title>
+    <style>
+        body { font-family: Arial, sans-serif; margin: 20px; background-color: #f5f5f5; }
+        .container { max-width: 800px; margin: 0 auto; background: white; padding: 20px; border-radius: 10px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }
+        .header { text-align: center; border-bottom: 3px solid #007bff; padding-bottom: 20px; margin-bottom: 30px; }
+        .header h1 { color: #007bff; margin: 0; }
+        .header .timestamp { color: #666; font-size: 14px; }
+        .stats { background: #f8f9fa; padding: 15px; border-radius: 5px; margin-bottom: 20px; }
+        .stats h3 { margin-top: 0; color: #495057; }
+        .article { border-left: 4px solid #007bff; padding: 15px; margin: 15px 0; background: #f8f9fa; border-radius: 0 5px 5px 0; }
+        .article h3 { margin: 0 0 10px 0; color: #212529; }
+        .article .source { color: #6c757d; font-size: 12px; margin-bottom: 5px; }
+        .article .url { color: #007bff; text-decoration: none; }
+        .article .url:hover { text-decoration: underline; }
+        .footer { text-align: center; margin-top: 30px; padding-top: 20px; border-top: 1px solid #dee2e6; color: #6c757d; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>📰 Resumo Diário de Tecnologia</h1>
+            <div class="timestamp">Gerado em: $timestamp</div>
+        </div>
+
+        <div class="stats">
+            <h3>📊 Estatísticas da Coleta</h3>
+            <p><strong>Total de notícias:</strong> $total</p>
+            <p><strong>Fontes consultadas:</strong> G1, Folha, UOL Tilt</p>
+            <p><strong>Período:</strong> $period</p>
+        </div>
+
+        <h2>🔍 Notícias Coletadas</h2>
+""")
+
+ARTICLE = Template("""        <div class="article">
+            <div class="source">📰 Fonte: $source</div>
+            <h3>$index. $title</h3>
+            <p>$summary</p>
+            <a href="$url" class="url" target="_blank">🔗 Ler notícia completa</a>
+        </div>
+""")
+
+FOOTER = """        <div class="footer">
+            <p>📧 Sistema de Coleta Automatizada de Notícias</p>
+            <p>🤖 Coletado automaticamente via Python</p>
+        </div>
+    </div>
+</body>
+</html>
+"""
+
+
+def _summary_text(summary) -> str:
+    if not isinstance(summary, str) or not summary:
+        return 'Resumo não disponível'
+    return summary[:SUMMARY_LENGTH] + '...' if len(summary) > SUMMARY_LENGTH else summary
+
+
+def article_set_key(batch: ArticleBatch, period: str) -> str:
+    """Identifica o relatório pelas notícias (na ordem) e pelo período informado"""
+    digest = hashlib.md5(period.encode('utf-8'))
+    digest.update('\n'.join(batch.frame['hash_id'].astype(str)).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class ReportRenderer:
+    """Gera o relatório HTML de um conjunto de notícias
+
+    O corpo dos relatórios já gerados fica em cache (até cache_size) e é
+    reaproveitado enquanto o conjunto de notícias e o período forem os mesmos.
+    """
+
+    def __init__(self, cache_size: int = 8):
+        self.cache_size = cache_size
+        self._cache: 'OrderedDict[str, str]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def iter_chunks(self, articles, period: str) -> Iterator[str]:
+        """Produz o relatório em blocos (cabeçalho, uma notícia por bloco, rodapé)"""
+        batch = ArticleBatch.from_articles(articles)
+        yield self._header(batch, period)
+        yield from self._iter_body(batch)
+
+    def render(self, articles, period: str) -> str:
+        """Relatório completo como texto, usando o cache quando possível
+
+        Só o corpo (notícias e rodapé) fica em cache; o cabeçalho, com o
+        horário de geração, é preenchido a cada chamada.
+        """
+        batch = ArticleBatch.from_articles(articles)
+        key = article_set_key(batch, period)
+        body = self._cached(key)
+        if body is None:
+            body = ''.join(self._iter_body(batch))
+            self._store(key, body)
+        return self._header(batch, period) + body
+
+    def render_to(self, file: IO[str], articles, period: str):
+        """Grava o relatório direto no arquivo, bloco a bloco, guardando o corpo no cache"""
+        batch = ArticleBatch.from_articles(articles)
+        key = article_set_key(batch, period)
+        file.write(self._header(batch, period))
+
+        body = self._cached(key)
+        if body is not None:
+            file.write(body)
+            return
+
+        chunks = [] if self.cache_size else None
+        for chunk in self._iter_body(batch):
+            file.write(chunk)
+            if chunks is not None:
+                chunks.append(chunk)
+        if chunks is not None:
+            self._store(key, ''.join(chunks))
+
+    @staticmethod
+    def _header(batch: ArticleBatch, period: str) -> str:
+        return HEADER.substitute(
+            timestamp=datetime.now().strftime("%d/%m/%Y %H:%M:%S"),
+            total=len(batch),
+            period=escape(period)
+        )
+
+    @staticmethod
+    def _iter_body(batch: ArticleBatch) -> Iterator[str]:
+        rows = batch.frame[['source', 'title', 'summary', 'url']].itertuples(index=False, name=None)
+        for index, (source, title, summary, url) in enumerate(rows, 1):
+            yield ARTICLE.substitute(
+                source=escape(str(source)),
+                index=index,
+                title=escape(str(title)),
+                summary=escape(_summary_text(summary)),
+                url=escape(str(url))
+            )
+        yield FOOTER
+
+    def _cached(self, key: str):
+        with self._lock:
+            body = self._cache.get(key)
+            if body is not None:
+                self._cache.move_to_end(key)
+            return body
+
+    def _store(self, key: str, body: str):
+        if not self.cache_size:
+            return
+        with self._lock:
+            self._cache[key] = body
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
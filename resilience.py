@@ -0,0 +1,139 @@
+"""
+Camada de resiliência para as requisições do sistema de coleta de notícias
+Retentativas com backoff exponencial e jitter, e circuit breaker por fonte
+com estado persistido entre execuções do agendador
+"""
+
+import json
+import os
+import random
+import threading
+import time
+from typing import Dict, Iterable, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class RetryPolicy:
+    """Política de retentativas com backoff exponencial e jitter completo"""
+
+    def __init__(self, max_retries: int = 3, backoff_base: float = 1.0, backoff_max: float = 30.0,
+                 retry_statuses: Iterable[int] = (429, 500, 502, 503, 504)):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_statuses = frozenset(retry_statuses)
+
+    def should_retry_status(self, status_code: int) -> bool:
+        return status_code in self.retry_statuses
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Tempo de espera antes da retentativa número attempt (a partir de 0)"""
+        if retry_after:
+            try:
+                return min(self.backoff_max, max(0.0, float(retry_after)))
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+
+class CircuitBreaker:
+    """Circuit breaker de uma fonte: fechado, aberto ou meio-aberto"""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name: str, registry: 'CircuitBreakerRegistry'):
+        self.name = name
+        self._registry = registry
+
+    @property
+    def state(self) -> str:
+        return self._registry.get_state(self.name)['state']
+
+    def allow_request(self) -> bool:
+        """Indica se a fonte pode ser consultada agora"""
+        return self._registry.allow_request(self.name)
+
+    def record_success(self):
+        self._registry.record_success(self.name)
+
+    def record_failure(self):
+        self._registry.record_failure(self.name)
+
+
+class CircuitBreakerRegistry:
+    """Estado de todos os circuit breakers, salvo em arquivo JSON
+
+    Após failure_threshold falhas seguidas o circuito abre e a fonte é ignorada
+    por recovery_timeout segundos; depois disso o circuito fica meio-aberto e o
+    resultado da próxima tentativa fecha ou reabre o circuito.
+    """
+
+    def __init__(self, state_file: str, failure_threshold: int = 3, recovery_timeout: float = 1800):
+        self.state_file = state_file
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._lock = threading.Lock()
+        self._states: Dict[str, Dict] = self._load()
+
+    def get(self, name: str) -> CircuitBreaker:
+        return CircuitBreaker(name, self)
+
+    def get_state(self, name: str) -> Dict:
+        with self._lock:
+            return dict(self._state(name))
+
+    def allow_request(self, name: str) -> bool:
+        with self._lock:
+            state = self._state(name)
+            if state['state'] != CircuitBreaker.OPEN:
+                return True
+            if time.time() - state['opened_at'] >= self.recovery_timeout:
+                state['state'] = CircuitBreaker.HALF_OPEN
+                self._save()
+                logger.info(f"Circuito de {name} meio-aberto: liberando tentativa")
+                return True
+            return False
+
+    def record_success(self, name: str):
+        with self._lock:
+            state = self._state(name)
+            if state['state'] != CircuitBreaker.CLOSED or state['failures']:
+                if state['state'] != CircuitBreaker.CLOSED:
+                    logger.info(f"Circuito de {name} fechado")
+                state.update(state=CircuitBreaker.CLOSED, failures=0, opened_at=None)
+                self._save()
+
+    def record_failure(self, name: str):
+        with self._lock:
+            state = self._state(name)
+            state['failures'] += 1
+            if state['state'] == CircuitBreaker.HALF_OPEN or state['failures'] >= self.failure_threshold:
+                state.update(state=CircuitBreaker.OPEN, opened_at=time.time())
+                logger.warning(f"Circuito de {name} aberto após {state['failures']} falhas seguidas")
+            self._save()
+
+    def _state(self, name: str) -> Dict:
+        if name not in self._states:
+            self._states[name] = {'state': CircuitBreaker.CLOSED, 'failures': 0, 'opened_at': None}
+        return self._states[name]
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        """Grava o estado de forma atômica"""
+        tmp_path = f"{self.state_file}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._states, f, indent=2)
+            os.replace(tmp_path, self.state_file)
+        except OSError as e:
+            logger.warning(f"Não foi possível salvar o estado dos circuit breakers: {e}")
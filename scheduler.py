@@ -11,9 +11,10 @@ import logging
 import os
 from typing import Optional
 
-from config import COLLECTION_CONFIG, OUTPUT_CONFIG, LOG_CONFIG
+from config import COLLECTION_CONFIG, OUTPUT_CONFIG, LOG_CONFIG, ARCHIVE_CONFIG
 from news_collector import NewsCollectionManager
 from data_processor import DataProcessor
+from output_stage import OutputStage, SINK_LABELS
 
 logger = logging.getLogger(__name__)
 
@@ -24,9 +25,12 @@ class NewsScheduler:
     def __init__(self):
         self.collection_manager = NewsCollectionManager()
         self.data_processor = DataProcessor()
+        # Notícias só contam como entregues depois que todos os destinos gravaram
+        self.output_stage = OutputStage(self.data_processor, on_delivered=self.collection_manager.mark_delivered)
         self.is_running = False
         self.last_collection = None
         self.collection_count = 0
+        self.maintenance_thread = None
         
         # Configurações
         self.collection_interval = COLLECTION_CONFIG['collection_interval_hours']
@@ -49,6 +53,10 @@ class NewsScheduler:
         # Agenda resumo diário
         schedule.every().day.at(self.daily_summary_time).do(self.run_daily_summary)
         
+        # Agenda manutenção de output/ (compactação e retenção)
+        if self.data_processor.compactor is not None:
+            schedule.every().day.at(ARCHIVE_CONFIG['maintenance_time']).do(self.run_maintenance)
+        
         # Executa coleta inicial
         self.run_collection()
         
@@ -98,45 +106,44 @@ class NewsScheduler:
         except Exception as e:
             logger.error(f"Erro durante a coleta: {e}")
     
+    def run_maintenance(self):
+        """Compacta e aplica a retenção em segundo plano, sem atrasar as coletas"""
+        if self.maintenance_thread is not None and self.maintenance_thread.is_alive():
+            logger.warning("Manutenção anterior ainda em execução")
+            return
+        
+        self.maintenance_thread = threading.Thread(target=self._run_maintenance, name='manutencao', daemon=True)
+        self.maintenance_thread.start()
+    
+    def _run_maintenance(self):
+        try:
+            logger.info("Iniciando manutenção dos arquivos de saída")
+            self.data_processor.compact_outputs()
+        except Exception as e:
+            logger.error(f"Erro na manutenção dos arquivos de saída: {e}")
+    
     def run_daily_summary(self):
         """Executa resumo diário"""
         try:
             logger.info("Gerando resumo diário")
             
-            # Busca arquivo mais recente de coleta
-            latest_file = self._find_latest_collection_file()
+            # Consulta no histórico as notícias coletadas nas últimas 24 horas
+            articles = self.data_processor.load_recent_articles(hours=24)
             
-            if not latest_file:
-                logger.warning("Nenhum arquivo de coleta encontrado para resumo diário")
-                return
-            
-            # Carrega dados existentes
-            existing_data = self.data_processor.load_existing_data(latest_file)
+            if not articles:
+                # Sem histórico: usa o arquivo mais recente de coleta
+                latest_file = self._find_latest_collection_file()
+                
+                if not latest_file:
+                    logger.warning("Nenhum arquivo de coleta encontrado para resumo diário")
+                    return
+                
+                articles = self.data_processor.load_existing_batch(latest_file)
             
-            if not existing_data:
+            if not articles:
                 logger.warning("Dados existentes não puderam ser carregados")
                 return
             
-            # Converte para objetos NewsArticle
-            articles = []
-            for data in existing_data:
-                try:
-                    from news_collector import NewsArticle
-                    article = NewsArticle(
-                        title=data['title'],
-                        url=data['url'],
-                        source=data['source'],
-                        published_date=data.get('published_date'),
-                        summary=data.get('summary'),
-                        content=data.get('content')
-                    )
-                    article.collected_at = datetime.fromisoformat(data['collected_at'])
-                    article.hash_id = data['hash_id']
-                    articles.append(article)
-                except Exception as e:
-                    logger.warning(f"Erro ao converter artigo: {e}")
-                    continue
-            
             # Gera resumo diário
             summary = self.data_processor.generate_daily_summary(articles)
             
@@ -155,15 +162,13 @@ class NewsScheduler:
     def _save_collection_results(self, articles):
         """Salva resultados da coleta"""
         try:
-            # Salva em múltiplos formatos
-            csv_file = self.data_processor.save_to_csv(articles)
-            json_file = self.data_processor.save_to_json(articles)
-            html_file = self.data_processor.save_to_html(articles)
+            # Histórico, diário e formatos configurados, gravados em paralelo
+            _, results = self.output_stage.run(articles)
             
             logger.info(f"Resultados salvos em:")
-            logger.info(f"  CSV: {csv_file}")
-            logger.info(f"  JSON: {json_file}")
-            logger.info(f"  HTML: {html_file}")
+            for sink, result in results.items():
+                if result:
+                    logger.info(f"  {SINK_LABELS[sink]}: {result}")
             
         except Exception as e:
             logger.error(f"Erro ao salvar resultados: {e}")
@@ -171,6 +176,11 @@ class NewsScheduler:
     def _find_latest_collection_file(self) -> Optional[str]:
         """Encontra o arquivo de coleta mais recente"""
         try:
+            # Consulta o manifesto; a listagem do diretório fica como alternativa
+            latest_file = self.data_processor.manifest.latest('csv')
+            if latest_file:
+                return latest_file
+            
             output_dir = OUTPUT_CONFIG['output_directory']
             if not os.path.exists(output_dir):
                 return None
@@ -236,10 +246,8 @@ def run_single_collection():
             logger.warning("Nenhuma notícia foi coletada")
             return
         
-        # Salva resultados
-        csv_file = data_processor.save_to_csv(articles)
-        json_file = data_processor.save_to_json(articles)
-        html_file = data_processor.save_to_html(articles)
+        # Salva resultados (e registra as notícias como entregues)
+        _, results = OutputStage(data_processor, on_delivered=collection_manager.mark_delivered).run(articles)
         
         # Gera resumo
         summary = data_processor.generate_daily_summary(articles)
@@ -248,9 +256,9 @@ def run_single_collection():
         logger.info(f"Coleta única concluída:")
         logger.info(f"  Total de notícias: {len(articles)}")
         logger.info(f"  Arquivos gerados:")
-        logger.info(f"    CSV: {csv_file}")
-        logger.info(f"    JSON: {json_file}")
-        logger.info(f"    HTML: {html_file}")
+        for sink, result in results.items():
+            if result:
+                logger.info(f"    {SINK_LABELS[sink]}: {result}")
         logger.info(f"    Resumo: {summary_file}")
         
     except Exception as e:
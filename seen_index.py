@@ -0,0 +1,82 @@
+"""
+Índice persistente de notícias já coletadas
+Evita reenviar em execuções seguintes notícias já entregues, usando SQLite
+com chave primária no hash e expiração (TTL) das entradas antigas
+"""
+
+import sqlite3
+import threading
+import time
+from typing import Iterable, Set
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Limite de parâmetros por consulta (SQLITE_MAX_VARIABLE_NUMBER antigo = 999)
+_QUERY_CHUNK_SIZE = 900
+
+
+class SeenArticleIndex:
+    """Conjunto persistente de hashes de notícias já vistas"""
+
+    def __init__(self, db_path: str, ttl_days: int = 30):
+        self.db_path = db_path
+        self.ttl_days = ttl_days
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        # auto_vacuum só tem efeito se definido antes da criação das tabelas
+        self._conn.execute('PRAGMA auto_vacuum = INCREMENTAL')
+        self._conn.execute('PRAGMA journal_mode = WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS seen_articles ('
+            '  hash_id TEXT PRIMARY KEY,'
+            '  first_seen REAL NOT NULL'
+            ') WITHOUT ROWID'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_seen_first_seen ON seen_articles (first_seen)')
+        self._conn.commit()
+
+    def find_seen(self, hash_ids: Iterable[str]) -> Set[str]:
+        """Retorna quais dos hashes informados já estão no índice"""
+        hash_ids = list(hash_ids)
+        seen = set()
+        with self._lock:
+            for start in range(0, len(hash_ids), _QUERY_CHUNK_SIZE):
+                chunk = hash_ids[start:start + _QUERY_CHUNK_SIZE]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self._conn.execute(
+                    f'SELECT hash_id FROM seen_articles WHERE hash_id IN ({placeholders})', chunk
+                )
+                seen.update(row[0] for row in rows)
+        return seen
+
+    def add(self, hash_ids: Iterable[str]):
+        """Registra os hashes como vistos (mantém a data da primeira vez)"""
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                'INSERT OR IGNORE INTO seen_articles (hash_id, first_seen) VALUES (?, ?)',
+                ((hash_id, now) for hash_id in hash_ids)
+            )
+            self._conn.commit()
+
+    def compact(self) -> int:
+        """Remove entradas mais antigas que o TTL e devolve o espaço ao disco"""
+        cutoff = time.time() - self.ttl_days * 86400
+        with self._lock:
+            deleted = self._conn.execute('DELETE FROM seen_articles WHERE first_seen < ?', (cutoff,)).rowcount
+            self._conn.commit()
+            if deleted:
+                self._conn.execute('PRAGMA incremental_vacuum')
+        if deleted:
+            logger.info(f"Índice de notícias vistas: {deleted} entradas expiradas removidas")
+        return deleted
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM seen_articles').fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,144 @@
+"""
+Estado incremental por fonte para o sistema de coleta de notícias
+Guarda os identificadores das últimas notícias vistas e a data de publicação
+mais recente de cada fonte, para que a coleta processe apenas o que é novo
+"""
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, Optional, Set
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def url_id(url: str) -> str:
+    """Identificador curto e estável de uma notícia a partir da URL canônica"""
+    return hashlib.md5(url.encode('utf-8')).hexdigest()[:16]
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Converte datas ISO 8601 com fuso; outros formatos são ignorados"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+    return parsed if parsed.tzinfo is not None else None
+
+
+class SourceState:
+    """Marcas de uma fonte durante uma coleta
+
+    Uma notícia é conhecida quando sua URL já foi vista. Em fontes ordenadas
+    (feeds) também é conhecida a notícia publicada antes da data mais recente
+    registrada, e após stop_after notícias conhecidas seguidas a varredura pode
+    parar: o restante da página já foi processado.
+    """
+
+    def __init__(self, known_ids: Set[str], last_published: Optional[str], stop_after: int = 0,
+                 ordered: bool = False):
+        self.known_ids = known_ids
+        self.last_published = _parse_timestamp(last_published)
+        self.ordered = ordered
+        self.stop_after = stop_after if ordered else 0
+        self.known_streak = 0
+        self.new_ids = []
+        self.newest_published = self.last_published
+
+    @property
+    def exhausted(self) -> bool:
+        return bool(self.stop_after) and self.known_streak >= self.stop_after
+
+    def has_seen(self, url: str) -> bool:
+        """Indica se a URL já foi coletada, sem alterar a sequência de conhecidas"""
+        return url_id(url) in self.known_ids
+
+    def is_known(self, url: str, published_date: Optional[str] = None) -> bool:
+        """Verifica se a notícia já foi coletada, atualizando a sequência de conhecidas"""
+        known = self.has_seen(url)
+        if not known and self.ordered and self.last_published is not None:
+            published = _parse_timestamp(published_date)
+            known = published is not None and published < self.last_published
+        self.known_streak = self.known_streak + 1 if known else 0
+        return known
+
+    def record(self, url: str, published_date: Optional[str] = None):
+        """Registra uma notícia nova desta coleta"""
+        self.new_ids.append(url_id(url))
+        published = _parse_timestamp(published_date)
+        if published is not None and (self.newest_published is None or published > self.newest_published):
+            self.newest_published = published
+
+
+class SourceStateStore:
+    """Estado incremental de todas as fontes, salvo em arquivo JSON
+
+    begin() entrega as marcas atuais de uma fonte; as notícias registradas só
+    passam a contar como conhecidas depois de save(), chamado quando os
+    resultados da coleta foram entregues.
+    """
+
+    def __init__(self, state_file: str, max_ids: int = 500, stop_after: int = 5, enabled: bool = True):
+        self.state_file = state_file
+        self.max_ids = max_ids
+        self.stop_after = stop_after
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._states: Dict[str, Dict] = self._load() if enabled else {}
+        self._pending: Dict[str, SourceState] = {}
+
+    def begin(self, name: str, ordered: bool = False) -> SourceState:
+        """Inicia a coleta incremental de uma fonte
+
+        A data de publicação e a parada após stop_after notícias conhecidas só
+        valem para fontes em ordem cronológica (feeds); páginas HTML misturam
+        menus e "mais lidas" com as manchetes, então nelas só a URL decide e
+        as conhecidas são apenas puladas.
+        """
+        if not self.enabled:
+            return SourceState(set(), None)
+
+        with self._lock:
+            stored = self._states.get(name, {})
+            state = SourceState(set(stored.get('ids', [])), stored.get('last_published'),
+                                self.stop_after, ordered)
+            self._pending[name] = state
+            return state
+
+    def save(self):
+        """Incorpora as notícias novas de cada fonte e grava o estado de forma atômica"""
+        if not self.enabled:
+            return
+
+        with self._lock:
+            for name, state in self._pending.items():
+                if not state.new_ids:
+                    continue
+                stored = self._states.setdefault(name, {'ids': [], 'last_published': None})
+                new_ids = set(state.new_ids)
+                ids = [known for known in stored['ids'] if known not in new_ids] + state.new_ids
+                stored['ids'] = ids[-self.max_ids:]
+                if state.newest_published is not None:
+                    stored['last_published'] = state.newest_published.isoformat()
+                stored['updated_at'] = datetime.now().isoformat()
+            self._pending.clear()
+
+            tmp_path = f"{self.state_file}.tmp"
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(self._states, f, indent=2)
+                os.replace(tmp_path, self.state_file)
+            except OSError as e:
+                logger.warning(f"Não foi possível salvar o estado incremental das fontes: {e}")
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
@@ -0,0 +1,56 @@
+"""
+Testes do histórico SQLite de notícias (article_store)
+Execute com: python -m pytest -q test_article_store.py
+"""
+
+from datetime import datetime
+
+import pytest
+
+from article_store import ArticleStore
+from news_collector import ArticleBatch
+
+
+def _record(hash_id, source='G1', collected_at='2024-05-15T10:00:00'):
+    return {
+        'title': f"Notícia {hash_id}",
+        'url': f"https://exemplo.com/{hash_id}",
+        'source': source,
+        'published_date': None,
+        'summary': None,
+        'content': None,
+        'collected_at': collected_at,
+        'hash_id': hash_id
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ArticleStore(str(tmp_path / 'historico.db'))
+    yield store
+    store.close()
+
+
+def test_coletas_e_consultas(store):
+    first = store.add(ArticleBatch.from_records([_record('a'), _record('b', 'Folha')]))
+    second = store.add(ArticleBatch.from_records([_record('b', 'Folha', '2024-05-16T10:00:00'), _record('c')]))
+
+    assert first != second and second > first
+    assert len(store) == 3
+    assert store.latest_collection_id() == second
+    assert store.find_existing(['a', 'c', 'x']) == {'a', 'c'}
+
+    # Repetida: mantém a data de coleta original e passa para a coleta mais recente
+    latest = store.load_latest_collection()
+    assert [article.hash_id for article in latest] == ['b', 'c']
+    assert latest[0].to_dict()['collected_at'] == '2024-05-15T10:00:00'
+
+    assert [article.hash_id for article in store.load(source='Folha')] == ['b']
+    assert len(store.load(since=datetime(2024, 5, 16))) == 0
+
+
+def test_historico_vazio(store):
+    assert store.latest_collection_id() is None
+    assert len(store.load_latest_collection()) == 0
+    store.add(ArticleBatch.from_articles([]))
+    assert len(store) == 0
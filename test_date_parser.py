@@ -0,0 +1,56 @@
+"""
+Testes da normalização de datas de publicação (date_parser)
+Execute com: python -m pytest -q test_date_parser.py
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from date_parser import BRT, normalize_published_date, parse_published_date
+
+NOW = datetime(2024, 5, 15, 14, 30, tzinfo=BRT)
+
+
+@pytest.mark.parametrize('text, expected', [
+    # Formatos absolutos em português, sem fuso: horário de Brasília
+    ('12/05/2024 10h30', datetime(2024, 5, 12, 10, 30, tzinfo=BRT)),
+    ('12/05/2024 às 10:30', datetime(2024, 5, 12, 10, 30, tzinfo=BRT)),
+    ('12.05.24', datetime(2024, 5, 12, tzinfo=BRT)),
+    ('12 de maio de 2024', datetime(2024, 5, 12, tzinfo=BRT)),
+    ('Publicado em 3 de março de 2024 - 08h05', datetime(2024, 3, 3, 8, 5, tzinfo=BRT)),
+    ('5 fev. 2024', datetime(2024, 2, 5, tzinfo=BRT)),
+    # Datas relativas a partir de NOW
+    ('há 3 horas', NOW - timedelta(hours=3)),
+    ('Há 15 min', NOW - timedelta(minutes=15)),
+    ('há uma semana', NOW - timedelta(weeks=1)),
+    ('agora', NOW),
+    ('hoje às 09h15', datetime(2024, 5, 15, 9, 15, tzinfo=BRT)),
+    ('ontem às 22h', datetime(2024, 5, 14, 22, 0, tzinfo=BRT)),
+    ('anteontem', NOW - timedelta(days=2)),
+])
+def test_formatos_em_portugues(text, expected):
+    assert parse_published_date(text, NOW) == expected
+
+
+def test_iso_e_rfc_2822_mantem_o_fuso_informado():
+    assert parse_published_date('2024-05-12T13:30:00Z', NOW) == datetime(2024, 5, 12, 13, 30, tzinfo=timezone.utc)
+    assert parse_published_date('Sun, 12 May 2024 10:30:00 -0300', NOW) == datetime(2024, 5, 12, 10, 30, tzinfo=BRT)
+    # Sem fuso: horário de Brasília
+    assert parse_published_date('2024-05-12T10:30:00', NOW).utcoffset() == timedelta(hours=-3)
+
+
+def test_relativas_usam_o_horario_de_brasilia():
+    now_utc = datetime(2024, 5, 15, 1, 0, tzinfo=timezone.utc)  # 14/05 22h em Brasília
+    assert parse_published_date('hoje às 10h', now_utc) == datetime(2024, 5, 14, 10, 0, tzinfo=BRT)
+    assert parse_published_date('ontem', now_utc).date() == datetime(2024, 5, 13).date()
+
+
+@pytest.mark.parametrize('text', ['', None, 'Tecnologia', '31/02/2024', '12 de brumário de 2024'])
+def test_textos_nao_reconhecidos(text):
+    assert parse_published_date(text, NOW) is None
+
+
+def test_normalize_published_date():
+    assert normalize_published_date('12/05/2024 10h30', NOW) == '2024-05-12T10:30:00-03:00'
+    assert normalize_published_date('Tecnologia', NOW) == 'Tecnologia'
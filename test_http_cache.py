@@ -0,0 +1,92 @@
+"""
+Testes do cache HTTP em disco (http_cache)
+Execute com: python -m pytest -q test_http_cache.py
+"""
+
+import itertools
+
+import pytest
+import requests
+
+import http_cache
+from http_cache import HTTPCache
+
+
+def _response(body: bytes, **headers) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response._content = body
+    response.encoding = 'utf-8'
+    response.headers.update({'Content-Type': 'text/html; charset=utf-8', **headers})
+    return response
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # Relógio que sempre avança, para a ordem LRU não depender da resolução do sistema
+    ticks = itertools.count(1000)
+    monkeypatch.setattr(http_cache.time, 'time', lambda: float(next(ticks)))
+
+
+def test_reaproveita_resposta_apos_304(tmp_path):
+    cache = HTTPCache(str(tmp_path), max_size_bytes=10_000)
+    url = 'https://exemplo.com/tecnologia'
+    assert cache.conditional_headers(url) == {}
+
+    cache.store(url, _response(b'<html>noticias</html>', ETag='"v1"', **{'Last-Modified': 'Wed, 15 May 2024 10:00:00 GMT'}))
+    assert cache.conditional_headers(url) == {
+        'If-None-Match': '"v1"',
+        'If-Modified-Since': 'Wed, 15 May 2024 10:00:00 GMT'
+    }
+
+    # Servidor respondeu 304: o corpo vem do disco
+    cached = cache.load_response(url)
+    assert cached.status_code == 200
+    assert cached.text == '<html>noticias</html>'
+    assert cached.from_cache
+    assert cache.get_stats()['hits'] == 1 and cache.get_stats()['misses'] == 1
+
+
+def test_resultado_processado_acompanha_a_versao(tmp_path):
+    cache = HTTPCache(str(tmp_path), max_size_bytes=10_000)
+    url = 'https://exemplo.com/tecnologia'
+    cache.store(url, _response(b'v1', ETag='"v1"'))
+    cache.store_parsed(url, [{'title': 'Notícia'}])
+    assert cache.get_parsed(url) == [{'title': 'Notícia'}]
+
+    # Nova versão da página invalida o resultado processado
+    cache.store(url, _response(b'v2', ETag='"v2"'))
+    assert cache.get_parsed(url) is None
+
+
+def test_resposta_sem_validadores_nao_fica_no_cache(tmp_path):
+    cache = HTTPCache(str(tmp_path), max_size_bytes=10_000)
+    url = 'https://exemplo.com/tecnologia'
+    cache.store(url, _response(b'v1', ETag='"v1"'))
+    cache.store(url, _response(b'v2'))
+    assert cache.conditional_headers(url) == {}
+    assert cache.load_response(url) is None
+
+
+def test_remocao_lru_por_tamanho(tmp_path, clock):
+    cache = HTTPCache(str(tmp_path), max_size_bytes=250)
+    urls = [f'https://exemplo.com/{name}' for name in ('a', 'b', 'c')]
+    cache.store(urls[0], _response(b'a' * 100, ETag='"a"'))
+    cache.store(urls[1], _response(b'b' * 100, ETag='"b"'))
+    # Acesso recente protege a primeira entrada
+    cache.load_response(urls[0])
+    cache.store(urls[2], _response(b'c' * 100, ETag='"c"'))
+
+    assert cache.load_response(urls[1]) is None
+    assert cache.load_response(urls[0]) is not None
+    assert cache.load_response(urls[2]) is not None
+    assert cache.get_stats()['entries'] == 2
+    assert cache.get_stats()['size_bytes'] == 200
+
+
+def test_indice_persiste_entre_instancias(tmp_path):
+    url = 'https://exemplo.com/tecnologia'
+    HTTPCache(str(tmp_path), max_size_bytes=10_000).store(url, _response(b'corpo', ETag='"v1"'))
+    reopened = HTTPCache(str(tmp_path), max_size_bytes=10_000)
+    assert reopened.conditional_headers(url) == {'If-None-Match': '"v1"'}
+    assert reopened.load_response(url).content == b'corpo'
@@ -0,0 +1,87 @@
+"""
+Testes do cliente HTTP compartilhado (http_client)
+Execute com: python -m pytest -q test_http_client.py
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from http_client import HTTPClient
+
+BODY = b'<html>' + b'x' * 200_000 + b'</html>'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.connections.add(self.client_address)
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(BODY)))
+        self.end_headers()
+        try:
+            self.wfile.write(BODY)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+class _Handler11(_Handler):
+    protocol_version = 'HTTP/1.1'
+
+
+@pytest.fixture
+def server(request):
+    """Servidor local; o parâmetro escolhe HTTP/1.1 (keep-alive) ou HTTP/1.0"""
+    handler = _Handler11 if getattr(request, 'param', '1.1') == '1.1' else _Handler
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    httpd.connections = set()
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _url(server):
+    return f"http://127.0.0.1:{server.server_address[1]}/"
+
+
+def test_keep_alive_reutiliza_a_conexao(server):
+    client = HTTPClient('teste')
+    for _ in range(4):
+        assert client.get(_url(server)).content == BODY
+
+    stats = client.get_stats()
+    assert stats['requests'] == 4
+    assert stats['connections_opened'] == len(server.connections) == 1
+    assert stats['connection_reuse_rate'] == 0.75
+    client.close()
+
+
+@pytest.mark.parametrize('server', ['1.0'], indirect=True)
+def test_servidor_http_1_0_reconecta_a_cada_requisicao(server):
+    client = HTTPClient('teste')
+    for _ in range(4):
+        client.get(_url(server))
+
+    stats = client.get_stats()
+    assert stats['connections_opened'] == len(server.connections) == 4
+    assert stats['connection_reuse_rate'] == 0.0
+    client.close()
+
+
+def test_download_interrompido_conta_a_reconexao(server):
+    client = HTTPClient('teste')
+    for _ in range(3):
+        response = client.get(_url(server), max_bytes=1024)
+        assert response.truncated and len(response.content) == 1024
+
+    stats = client.get_stats()
+    assert stats['truncated_downloads'] == 3
+    assert stats['connections_opened'] == len(server.connections) == 3
+    assert stats['connection_reuse_rate'] == 0.0
+    client.close()
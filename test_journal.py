@@ -0,0 +1,48 @@
+"""
+Testes do diário JSON Lines de notícias (journal)
+Execute com: python -m pytest -q test_journal.py
+"""
+
+import gzip
+from datetime import date
+
+import pytest
+
+from journal import ArticleJournal
+
+
+def _record(hash_id):
+    return {'title': f"Notícia {hash_id}", 'url': f"https://exemplo.com/{hash_id}", 'source': 'G1', 'hash_id': hash_id}
+
+
+@pytest.mark.parametrize('compression', [None, 'gzip'])
+def test_diario_acrescenta_e_le_por_periodo(tmp_path, compression):
+    journal = ArticleJournal(str(tmp_path / 'diario'), compression=compression)
+    journal.append([_record('a'), _record('b')], day=date(2024, 5, 14))
+    journal.append([_record('c')], day=date(2024, 5, 14))
+    journal.append([_record('d')], day=date(2024, 5, 15))
+
+    assert len(journal.files()) == 2
+    assert [record['hash_id'] for record in journal.iter_records()] == ['a', 'b', 'c', 'd']
+    assert [record['hash_id'] for record in journal.iter_records(start=date(2024, 5, 15))] == ['d']
+    assert [record['hash_id'] for record in journal.iter_records(end=date(2024, 5, 14))] == ['a', 'b', 'c']
+
+
+def test_diario_truncado_e_linhas_invalidas(tmp_path):
+    journal = ArticleJournal(str(tmp_path / 'diario'), compression='gzip')
+    path = journal.append([_record('a'), _record('b')], day=date(2024, 5, 14))
+    with open(path, 'rb') as f:
+        data = f.read()
+    with open(path, 'wb') as f:
+        f.write(data[:-6])
+    with gzip.open(journal.path_for(date(2024, 5, 15)), 'wt', encoding='utf-8') as f:
+        f.write('{inválida\n')
+
+    # Lê o que for possível sem interromper a iteração
+    records = list(journal.iter_records())
+    assert all(record['hash_id'] in ('a', 'b') for record in records)
+
+
+def test_compressao_desconhecida(tmp_path):
+    with pytest.raises(ValueError):
+        ArticleJournal(str(tmp_path), compression='bz2')
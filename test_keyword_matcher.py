@@ -0,0 +1,51 @@
+"""
+Testes do casamento de palavras-chave (keyword_matcher)
+Execute com: python -m pytest -q test_keyword_matcher.py
+"""
+
+from keyword_matcher import KeywordMatcher, fold_text
+
+
+def test_fold_text_remove_acentos():
+    assert fold_text("Inovação") == "inovacao"
+    assert fold_text("INTELIGÊNCIA") == "inteligencia"
+
+
+def test_acentos_ignorados_nos_dois_lados():
+    matcher = KeywordMatcher(['inovação'])
+    assert matcher.matches("Nova onda de inovacao no setor")
+    assert KeywordMatcher(['inovacao']).matches("Prêmio de Inovação")
+
+
+def test_palavra_curta_exige_limite_de_palavra():
+    matcher = KeywordMatcher(['IA'])
+    assert matcher.matches("Empresa aposta em IA generativa")
+    assert matcher.matches("IAs generativas avançam")
+    assert not matcher.matches("Mercado da Bahia cresce")
+    assert not matcher.matches("Nova mídia digital")
+    assert not matcher.matches("Iate de luxo")
+
+
+def test_palavra_longa_casa_flexoes_apenas_no_inicio():
+    matcher = KeywordMatcher(['startup', 'inteligência'])
+    assert matcher.find("Startups e inteligências") == ['startup', 'inteligência']
+    assert not matcher.matches("Empresa superstartup")
+    # Plural que muda o radical não é prefixo da palavra-chave
+    assert not KeywordMatcher(['inovação']).matches("Novas inovações")
+
+
+def test_find_na_ordem_da_configuracao_sem_repeticao():
+    matcher = KeywordMatcher(['5G', 'tecnologia', 'IA'])
+    text = "IA e 5G: a tecnologia da IA no 5G"
+    assert matcher.find(text) == ['5G', 'tecnologia', 'IA']
+
+
+def test_sem_limites_de_palavra():
+    matcher = KeywordMatcher(['ia'], word_boundaries=False)
+    assert matcher.matches("Bahia")
+
+
+def test_texto_vazio():
+    matcher = KeywordMatcher(['tecnologia'])
+    assert not matcher.matches("")
+    assert matcher.find(None) == []
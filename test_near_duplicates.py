@@ -0,0 +1,66 @@
+"""
+Testes da detecção de notícias quase duplicadas (near_duplicates)
+Execute com: python -m pytest -q test_near_duplicates.py
+"""
+
+from types import SimpleNamespace
+
+from near_duplicates import (NearDuplicateDetector, jaccard, near_duplicate_mask,
+                             normalize_tokens, remove_near_duplicates)
+
+
+def _article(title, summary=None):
+    return SimpleNamespace(title=title, summary=summary)
+
+
+def test_normalize_tokens_sem_acentos_e_stopwords():
+    assert normalize_tokens("A Inovação das Startups") == frozenset(['inovacao', 'startups'])
+    assert normalize_tokens(None) == frozenset()
+
+
+def test_jaccard():
+    assert jaccard(frozenset('ab'), frozenset('ab')) == 1.0
+    assert jaccard(frozenset('abc'), frozenset('bcd')) == 0.5
+    assert jaccard(frozenset(), frozenset('a')) == 0.0
+
+
+def test_manchetes_quase_iguais_de_fontes_diferentes():
+    titles = [
+        "Governo anuncia novo plano nacional de inteligência artificial",
+        "Governo anuncia o novo plano nacional para inteligência artificial",
+        "Apple apresenta novo iPhone com câmera melhorada"
+    ]
+    assert near_duplicate_mask(titles, [None] * 3) == [True, False, True]
+
+
+def test_limiar_de_similaridade():
+    # 8 palavras em comum de 10: similaridade 0.8
+    first = "alfa beta gama delta epsilon zeta eta teta iota"
+    second = "alfa beta gama delta epsilon zeta eta teta kapa"
+    assert jaccard(normalize_tokens(first), normalize_tokens(second)) == 0.8
+    assert near_duplicate_mask([first, second], [None, None], threshold=0.7) == [True, False]
+    assert near_duplicate_mask([first, second], [None, None], threshold=0.9) == [True, True]
+
+
+def test_resumo_detecta_duplicata_com_titulo_diferente():
+    summary = "Empresa brasileira levanta investimento de cem milhões para expandir operação na América Latina"
+    detector = NearDuplicateDetector()
+    assert detector.check_and_add("Startup capta R$ 100 milhões", summary, 'g1') is None
+    assert detector.check_and_add("Rodada bilionária agita mercado", summary, 'folha') == 'g1'
+
+
+def test_resumo_curto_nao_e_comparado():
+    detector = NearDuplicateDetector()
+    assert detector.check_and_add("Primeira manchete sobre chips", "Leia mais", 1) is None
+    assert detector.check_and_add("Outra notícia sobre satélites", "Leia mais", 2) is None
+
+
+def test_remove_near_duplicates_mantem_a_primeira():
+    articles = [
+        _article("Anatel libera nova faixa do 5G em todo o país"),
+        _article("Anatel libera a nova faixa do 5G em todo país"),
+        _article("Banco Central testa moeda digital")
+    ]
+    unique, removed = remove_near_duplicates(articles)
+    assert removed == 1
+    assert unique == [articles[0], articles[2]]
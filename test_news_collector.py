@@ -0,0 +1,141 @@
+"""
+Testes do lote colunar e do pipeline de coleta (news_collector)
+Execute com: python -m pytest -q test_news_collector.py
+"""
+
+import pytest
+import requests
+
+import news_collector
+from news_collector import ArticleBatch, NewsArticle, NewsCollectionManager
+from resilience import CircuitBreaker, CircuitBreakerRegistry
+from source_state import SourceState, url_id
+
+
+class _StubCollector:
+    """Coletor que devolve uma lista fixa de notícias, sem acessar a rede"""
+
+    def __init__(self, articles=()):
+        self.articles = list(articles)
+
+    def collect_news(self):
+        return list(self.articles)
+
+
+def _article(title, url, summary=None, published_date=None):
+    return NewsArticle(title=title, url=url, source='Exemplo', summary=summary,
+                       published_date=published_date)
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    monkeypatch.setitem(news_collector.DEDUP_CONFIG, 'persistent_index', False)
+    return NewsCollectionManager()
+
+
+def test_lote_vazio_tem_colunas_de_texto():
+    batch = ArticleBatch.from_articles([])
+    assert len(batch) == 0 and not batch
+    assert all(dtype == object for dtype in batch.frame.dtypes)
+    assert batch.to_records() == []
+    assert list(ArticleBatch.from_records([])) == []
+
+
+def test_lote_ida_e_volta_com_filtro():
+    articles = [
+        _article("Startup lança chip", "https://exemplo.com/1", "Resumo"),
+        _article("Receita de bolo", "https://exemplo.com/2"),
+        _article("Startup lança chip", "https://exemplo.com/1", "Resumo")
+    ]
+    batch = ArticleBatch.from_articles(articles)
+    assert len(batch.drop_duplicates()) == 2
+
+    filtered = batch.filter([True, False, False])
+    records = filtered.to_records()
+    assert len(records) == 1
+    assert records[0]['title'] == "Startup lança chip"
+    assert records[0]['hash_id'] == articles[0].hash_id
+    assert records[0]['published_date'] is None
+
+    restored = ArticleBatch.from_records(records)
+    assert [article.url for article in restored] == ["https://exemplo.com/1"]
+    assert restored[0].hash_id == articles[0].hash_id
+
+    empty = batch.filter([False, False, False])
+    assert len(empty) == 0
+    assert empty.to_records() == []
+
+
+@pytest.mark.parametrize('collectors', [
+    {'g1': _StubCollector()},
+    {'g1': _StubCollector(), 'folha': _StubCollector()},
+])
+def test_coleta_sem_noticias_novas(manager, collectors):
+    # Ex.: todas as páginas responderam 304 ou todos os circuitos estão abertos
+    manager.collectors = collectors
+    result = manager.collect_all_news()
+    assert len(result) == 0
+    assert result.to_records() == []
+
+
+def test_coleta_com_tudo_filtrado(manager):
+    manager.collectors = {'g1': _StubCollector([_article("Receita de bolo de cenoura", "https://exemplo.com/bolo")])}
+    assert len(manager.collect_all_news()) == 0
+
+
+def test_coleta_filtra_por_palavras_chave(manager):
+    manager.collectors = {'g1': _StubCollector([
+        _article("Nova startup de inteligência artificial", "https://exemplo.com/ia"),
+        _article("Receita de bolo de cenoura", "https://exemplo.com/bolo")
+    ])}
+    result = manager.collect_all_news()
+    assert [article.url for article in result] == ["https://exemplo.com/ia"]
+    assert 'startup' in result[0].matched_keywords
+
+
+def _links_page(hrefs):
+    items = ''.join(f'<li><a href="{href}">Manchete {index}</a></li>' for index, href in enumerate(hrefs))
+    return f'<html><body><ul>{items}</ul></body></html>'.encode('utf-8')
+
+
+def test_interrupcao_do_download_ignora_links_conhecidos(monkeypatch):
+    monkeypatch.setitem(news_collector.COLLECTION_CONFIG, 'early_abort_link_factor', 3)
+    source = dict(news_collector.NEWS_SOURCES['uol_tilt'], max_articles=2)
+    collector = news_collector.create_collector(source)
+    known = [f"https://www.uol.com.br/tilt/noticias/antiga-{index}.htm" for index in range(10)]
+    fresh = [f"/tilt/noticias/nova-{index}.htm" for index in range(3)]
+    page = _links_page(known + fresh)
+
+    # Com as 10 primeiras já coletadas, só as 3 novas contam para o limite (2 x 3)
+    state = SourceState({url_id(collector.rules.canonical_url(url)) for url in known}, None)
+    counter = collector._link_counter_factory(state)()
+    assert not any(counter(page[start:start + 256]) for start in range(0, len(page), 256))
+    assert counter.count == 3
+
+    # Sem estado incremental o download para nos primeiros links
+    counter = collector._link_counter_factory(SourceState(set(), None))()
+    assert any(counter(page[start:start + 256]) for start in range(0, len(page), 256))
+
+
+def test_feed_quebrado_nao_bloqueia_a_coleta_html(monkeypatch, tmp_path):
+    monkeypatch.setattr(news_collector, 'circuit_breakers',
+                        CircuitBreakerRegistry(str(tmp_path / 'circuitos.json'), failure_threshold=2))
+    monkeypatch.setattr(news_collector.retry_policy, 'max_retries', 0)
+    collector = news_collector.create_collector(news_collector.NEWS_SOURCES['g1_tecnologia'])
+    page = _links_page(["/tecnologia/noticia/2024/05/15/startup-lanca-chip-de-inteligencia-artificial.ghtml"])
+
+    def fetch(url, stop_condition=None):
+        if url == collector.source_config['feed_url']:
+            raise requests.ConnectionError("feed fora do ar")
+        response = requests.Response()
+        response.status_code = 200
+        response._content = page
+        return response
+
+    monkeypatch.setattr(collector, '_fetch', fetch)
+    for _ in range(3):
+        articles = collector.collect_news()
+
+    assert collector.feed_circuit_breaker.state == CircuitBreaker.OPEN
+    assert collector.circuit_breaker.state == CircuitBreaker.CLOSED
+    assert len(articles) == 1
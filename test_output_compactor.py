@@ -0,0 +1,162 @@
+"""
+Testes da compactação e retenção de output/ (output_compactor)
+Execute com: python -m pytest -q test_output_compactor.py
+"""
+
+import gzip
+import json
+import os
+from datetime import datetime
+
+import pytest
+
+from output_compactor import OutputCompactor
+from output_manifest import OutputManifest
+
+NOW = datetime(2024, 3, 20, 12, 0, 0)
+
+
+def _record(hash_id, collected_at, title=None):
+    return {
+        'title': title or f"Notícia {hash_id}",
+        'url': f"https://exemplo.com/{hash_id}",
+        'source': 'Exemplo',
+        'published_date': None,
+        'summary': None,
+        'content': None,
+        'collected_at': collected_at,
+        'hash_id': hash_id
+    }
+
+
+def _write_run(directory, run_id, records, extension='json'):
+    path = os.path.join(directory, f"noticias_tecnologia_{run_id}.{extension}")
+    with open(path, 'w', encoding='utf-8') as f:
+        if extension == 'json':
+            json.dump(records, f, ensure_ascii=False)
+        else:
+            f.write('conteúdo')
+    return path
+
+
+def _read_archive(path):
+    return list(OutputCompactor.iter_archive(path))
+
+
+@pytest.fixture
+def dirs(tmp_path):
+    output_dir = tmp_path / 'output'
+    output_dir.mkdir()
+    return str(output_dir), str(tmp_path / 'archive')
+
+
+def test_duplicatas_entre_execucoes(dirs):
+    output_dir, archive_dir = dirs
+    _write_run(output_dir, '20240301_080000', [_record('b', '2024-03-01T08:00'), _record('a', '2024-03-01T08:00')])
+    _write_run(output_dir, '20240302_080000', [_record('a', '2024-03-02T08:00'), _record('c', '2024-03-02T08:00')])
+    recent = _write_run(output_dir, '20240319_080000', [_record('d', '2024-03-19T08:00')])
+
+    stats = OutputCompactor(output_dir, archive_dir).compact(NOW)
+
+    records = _read_archive(os.path.join(archive_dir, 'noticias_202403.jsonl.gz'))
+    assert [record['hash_id'] for record in records] == ['a', 'b', 'c']
+    # Entre duplicatas fica a coletada primeiro
+    assert records[0]['collected_at'] == '2024-03-01T08:00'
+    assert stats == {'runs_compacted': 2, 'articles_archived': 3, 'files_removed': 2}
+    assert os.listdir(output_dir) == [os.path.basename(recent)]
+
+
+def test_junta_com_arquivo_existente(dirs):
+    output_dir, archive_dir = dirs
+    os.makedirs(archive_dir)
+    archive_path = os.path.join(archive_dir, 'noticias_202403.jsonl.gz')
+    with gzip.open(archive_path, 'wt', encoding='utf-8') as f:
+        for record in (_record('a', '2024-03-01T08:00', 'Original'), _record('x', '2024-03-01T08:00')):
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+    _write_run(output_dir, '20240310_080000', [_record('a', '2024-03-10T08:00', 'Repetida'), _record('m', '2024-03-10T08:00')])
+
+    stats = OutputCompactor(output_dir, archive_dir).compact(NOW)
+
+    records = _read_archive(archive_path)
+    assert [record['hash_id'] for record in records] == ['a', 'm', 'x']
+    assert records[0]['title'] == 'Original'
+    assert stats['articles_archived'] == 3
+
+
+def test_execucoes_em_lotes_de_max_open_runs(dirs):
+    output_dir, archive_dir = dirs
+    for day in range(1, 6):
+        _write_run(output_dir, f"202403{day:02d}_080000",
+                   [_record('comum', f"2024-03-{day:02d}T08:00"), _record(f"dia{day}", f"2024-03-{day:02d}T08:00")])
+
+    stats = OutputCompactor(output_dir, archive_dir, max_open_runs=2).compact(NOW)
+
+    records = _read_archive(os.path.join(archive_dir, 'noticias_202403.jsonl.gz'))
+    assert [record['hash_id'] for record in records] == ['comum'] + [f"dia{day}" for day in range(1, 6)]
+    assert records[0]['collected_at'] == '2024-03-01T08:00'
+    assert stats['runs_compacted'] == 5
+    assert stats['articles_archived'] == 6
+
+
+def test_execucao_ilegivel_fica_em_output(dirs):
+    output_dir, archive_dir = dirs
+    broken = os.path.join(output_dir, 'noticias_tecnologia_20240301_080000.json')
+    with open(broken, 'w', encoding='utf-8') as f:
+        f.write('{não é json')
+
+    stats = OutputCompactor(output_dir, archive_dir).compact(NOW)
+
+    assert os.path.exists(broken)
+    assert stats['runs_compacted'] == 0
+    assert not os.path.exists(os.path.join(archive_dir, 'noticias_202403.jsonl.gz'))
+
+
+def test_relatorios_html_tem_retencao_propria(dirs):
+    output_dir, archive_dir = dirs
+    _write_run(output_dir, '20240101_080000', [_record('a', '2024-01-01T08:00')])
+    old_report = _write_run(output_dir, '20240101_080000', None, 'html')
+    new_report = _write_run(output_dir, '20240315_080000', None, 'html')
+
+    compactor = OutputCompactor(output_dir, archive_dir)
+    compactor.compact(NOW)
+    # A compactação não mexe nos relatórios
+    assert os.path.exists(old_report) and os.path.exists(new_report)
+    assert compactor.apply_retention(NOW)['reports_removed'] == 0
+
+    stats = OutputCompactor(output_dir, archive_dir, report_retention_days=30).apply_retention(NOW)
+    assert stats['reports_removed'] == 1
+    assert not os.path.exists(old_report)
+    assert os.path.exists(new_report)
+
+
+def test_retencao_dos_arquivos_mensais(dirs):
+    output_dir, archive_dir = dirs
+    os.makedirs(archive_dir)
+    for label in ('202401', '202402'):
+        with gzip.open(os.path.join(archive_dir, f"noticias_{label}.jsonl.gz"), 'wt', encoding='utf-8'):
+            pass
+
+    # Corte em 2024-02-19: janeiro inteiro expirou, fevereiro ainda não
+    stats = OutputCompactor(output_dir, archive_dir, archive_retention_days=30).apply_retention(NOW)
+
+    assert stats['archives_removed'] == 1
+    assert os.listdir(archive_dir) == ['noticias_202402.jsonl.gz']
+
+
+def test_manifesto_acompanha_remocoes(dirs):
+    output_dir, archive_dir = dirs
+    manifest = OutputManifest(output_dir)
+    for run_id in ('20240301_080000', '20240302_080000'):
+        path = _write_run(output_dir, run_id, [_record(run_id, '2024-03-01T08:00')])
+        manifest.record_file('json', path, 1)
+    report = _write_run(output_dir, '20240101_080000', None, 'html')
+    manifest.record_file('html', report)
+
+    compactor = OutputCompactor(output_dir, archive_dir, report_retention_days=30, manifest=manifest)
+    compactor.run(NOW)
+    compactor.run(NOW)
+
+    counts = manifest.load()['counts']
+    assert counts == {'json': 0, 'html': 0, 'archive': 1}
+    assert manifest.latest('json') is None
+    assert os.path.normpath(manifest.latest('archive')) == os.path.join(archive_dir, 'noticias_202403.jsonl.gz')
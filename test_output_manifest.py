@@ -0,0 +1,69 @@
+"""
+Testes do manifesto do diretório de saída (output_manifest)
+Execute com: python -m pytest -q test_output_manifest.py
+"""
+
+import os
+
+from output_manifest import OutputManifest
+
+
+def _touch(path):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('x')
+    return path
+
+
+def test_mais_recente_e_contagens(tmp_path):
+    manifest = OutputManifest(str(tmp_path))
+    first = _touch(tmp_path / 'noticias_tecnologia_20240514_100000.csv')
+    second = _touch(tmp_path / 'noticias_tecnologia_20240515_100000.csv')
+    manifest.record_file('csv', str(first), 3)
+    manifest.record_file('csv', str(second), 5)
+    # Reescrita de um arquivo já contado
+    manifest.record_file('csv', str(second), 6, new_file=False)
+
+    assert manifest.latest('csv') == str(second)
+    assert manifest.load()['counts'] == {'csv': 2}
+    assert manifest.load()['latest']['csv']['articles'] == 6
+    assert manifest.latest('json') is None
+
+
+def test_remocoes_atualizam_contagem_e_mais_recente(tmp_path):
+    manifest = OutputManifest(str(tmp_path))
+    paths = [str(_touch(tmp_path / f"noticias_tecnologia_2024051{day}_100000.json")) for day in (4, 5)]
+    for path in paths:
+        manifest.record_file('json', path, 1)
+
+    manifest.record_removed('json', paths[:1])
+    assert manifest.load()['counts']['json'] == 1
+    assert manifest.latest('json') == paths[1]
+
+    manifest.record_removed('json', paths[1:])
+    assert manifest.load()['counts']['json'] == 0
+    assert 'json' not in manifest.load()['latest']
+
+
+def test_arquivo_removido_fora_do_manifesto(tmp_path):
+    manifest = OutputManifest(str(tmp_path))
+    path = str(_touch(tmp_path / 'noticias_tecnologia_20240515_100000.html'))
+    manifest.record_file('html', path)
+    os.remove(path)
+    assert manifest.latest('html') is None
+
+
+def test_execucoes_recentes_limitadas(tmp_path):
+    manifest = OutputManifest(str(tmp_path), max_runs=3)
+    for index in range(5):
+        manifest.record_run(f"run{index}", index, {'csv': f"run{index}.csv", 'html': None})
+
+    runs = manifest.recent_runs(10)
+    assert [run['run_id'] for run in runs] == ['run4', 'run3', 'run2']
+    assert runs[0]['files'] == {'csv': 'run4.csv'}
+
+
+def test_manifesto_corrompido_recomeca_vazio(tmp_path):
+    manifest = OutputManifest(str(tmp_path))
+    with open(manifest.path, 'w', encoding='utf-8') as f:
+        f.write('{corrompido')
+    assert manifest.load() == {'latest': {}, 'counts': {}, 'runs': []}
@@ -0,0 +1,119 @@
+"""
+Testes da etapa de saída (output_stage)
+Execute com: python -m pytest -q test_output_stage.py
+"""
+
+import threading
+
+import pytest
+
+import output_stage
+from news_collector import NewsArticle
+from output_manifest import OutputManifest
+from output_stage import OutputStage
+
+
+class _FakeProcessor:
+    """DataProcessor mínimo: registra as chamadas e pode falhar em um destino"""
+
+    def __init__(self, manifest, failing=()):
+        self.manifest = manifest
+        self.failing = set(failing)
+        self.calls = []
+        self.renders = 0
+        self._lock = threading.Lock()
+
+    def _call(self, name, result):
+        with self._lock:
+            self.calls.append(name)
+        if name in self.failing:
+            raise IOError(f"falha em {name}")
+        return result
+
+    def render_html_report(self, batch):
+        with self._lock:
+            self.renders += 1
+        return '<html></html>'
+
+    def save_to_store(self, batch):
+        return self._call('store', 'coleta-1')
+
+    def append_to_journal(self, batch, records=None):
+        assert records is not None
+        return self._call('journal', 'diario.jsonl.gz')
+
+    def save_to_csv(self, batch, filename):
+        return self._call('csv', filename)
+
+    def save_to_json(self, batch, filename, records=None):
+        assert records is not None
+        return self._call('json', filename)
+
+    def save_to_html(self, batch, filename, html_content=None):
+        assert html_content == '<html></html>'
+        return self._call('html', filename)
+
+    def send_email_report(self, batch, html_content=None):
+        return True
+
+
+ARTICLES = [NewsArticle(title="Startup lança chip", url="https://exemplo.com/1", source='G1')]
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    return OutputManifest(str(tmp_path))
+
+
+@pytest.mark.parametrize('max_workers', [1, 4])
+def test_grava_todos_os_destinos(manifest, max_workers):
+    delivered = []
+    processor = _FakeProcessor(manifest)
+    stage = OutputStage(processor, max_workers=max_workers, on_delivered=delivered.append)
+
+    output, results = stage.run(ARTICLES, ['store', 'journal', 'csv', 'json', 'html'])
+
+    assert list(results) == ['store', 'journal', 'csv', 'json', 'html']
+    assert results['csv'] == output.filename('csv')
+    assert sorted(processor.calls) == ['csv', 'html', 'journal', 'json', 'store']
+    assert output.failed_sinks == []
+    assert delivered == [output.batch]
+    # O HTML é gerado uma única vez e reaproveitado (ex.: pelo e-mail)
+    assert output.html == '<html></html>' and processor.renders == 1
+    assert manifest.recent_runs(1)[0]['articles'] == 1
+
+
+def test_falha_de_um_destino_nao_impede_os_demais(manifest):
+    delivered = []
+    processor = _FakeProcessor(manifest, failing=['journal'])
+    output, results = OutputStage(processor, max_workers=4, on_delivered=delivered.append).run(
+        ARTICLES, ['store', 'journal', 'json'])
+
+    assert results['journal'] is None
+    assert results['store'] == 'coleta-1' and results['json']
+    assert output.failed_sinks == ['journal']
+    # Sem entrega completa as notícias não são marcadas como entregues
+    assert delivered == []
+    assert manifest.recent_runs(1)[0]['files'] == {'store': 'coleta-1', 'json': results['json']}
+
+
+def test_destino_desconhecido(manifest):
+    with pytest.raises(ValueError):
+        OutputStage(_FakeProcessor(manifest)).run(ARTICLES, ['store', 'xml'])
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('', ['csv', 'json', 'html']),
+    ('csv,json,html,parquet', ['csv', 'json', 'html', 'parquet']),
+    ('parquet', ['parquet']),
+    ('json, HTML', ['json', 'html']),
+    ('csv,xml', ['csv']),
+    # Valor único antigo: mantém a saída anterior
+    ('html', ['csv', 'json', 'html']),
+    ('CSV', ['csv', 'json', 'html']),
+    # Vírgula final: lista com um só formato
+    ('html,', ['html']),
+])
+def test_formatos_configurados(monkeypatch, value, expected):
+    monkeypatch.setitem(output_stage.OUTPUT_CONFIG, 'file_format', value or 'csv,json,html')
+    assert output_stage.configured_formats() == expected
@@ -0,0 +1,93 @@
+"""
+Testes dos motores de parsing de páginas (page_parser)
+Execute com: python -m pytest -q test_page_parser.py
+"""
+
+import pytest
+
+from page_parser import LinkCounter, LxmlPageParser, SoupPageParser, get_page_parser, html_to_text
+
+PAGE = """<!DOCTYPE html>
+<html lang="pt-BR">
+<head><meta charset="utf-8"><title>Tecnologia</title></head>
+<body>
+  <nav><a href="/">Início</a><a href="#conteudo">Pular</a></nav>
+  <main id="conteudo">
+    <article>
+      <h2><a href="/tecnologia/noticia/2024/05/chip.ghtml">Startup lança   chip de IA</a></h2>
+      <time datetime="2024-05-15T10:00:00-03:00">15/05/2024</time>
+      <p class="resumo">Empresa brasileira apresenta processador.</p>
+    </article>
+    <ul>
+      <li>
+        <a href="/tecnologia/noticia/2024/05/satelite.ghtml">Satélite nacional entra em órbita</a>
+        <time>há 2 horas</time>
+        <div class="summary-text">Lançamento ocorreu na madrugada.</div>
+      </li>
+      <li><a href="/tecnologia/noticia/2024/05/sem-data.ghtml">Notícia sem data</a></li>
+    </ul>
+    <article>
+      <a href="https://outro.com/tecnologia/noticia/externa.ghtml">Notícia externa</a>
+      <p>Parágrafo sem classe de resumo.</p>
+    </article>
+  </main>
+</body>
+</html>""".encode('utf-8')
+
+
+def _is_news(href):
+    return '/noticia/' in href
+
+
+@pytest.mark.parametrize('parser_class', [LxmlPageParser, SoupPageParser])
+def test_extrai_links_com_data_e_resumo(parser_class):
+    candidates = list(parser_class().iter_articles(PAGE, 'utf-8', _is_news))
+    assert [candidate.title for candidate in candidates] == [
+        'Startup lança chip de IA',
+        'Satélite nacional entra em órbita',
+        'Notícia sem data',
+        'Notícia externa'
+    ]
+    # O link do <h2> usa o próprio <h2> como contêiner, sem data nem resumo
+    assert candidates[0].published_date is None
+    assert candidates[1].published_date == 'há 2 horas'
+    assert candidates[1].summary == 'Lançamento ocorreu na madrugada.'
+    assert candidates[2].published_date is None and candidates[2].summary is None
+    assert candidates[3].summary is None
+
+
+def test_motores_produzem_o_mesmo_resultado():
+    lxml_result = list(LxmlPageParser().iter_articles(PAGE, 'utf-8', _is_news))
+    soup_result = list(SoupPageParser().iter_articles(PAGE, 'utf-8', _is_news))
+    assert lxml_result == soup_result
+
+    # Sem filtro: todos os links, exceto âncoras internas
+    assert (list(LxmlPageParser().iter_articles(PAGE, 'utf-8'))
+            == list(SoupPageParser().iter_articles(PAGE, 'utf-8')))
+
+
+def test_regras_da_fonte():
+    options = {'date_tags': ['time'], 'summary_tags': ['p'], 'summary_class_pattern': 'resumo'}
+    page = b'<div><a href="/noticia/1">Titulo</a><time>ontem</time><p class="resumo">Texto</p></div>'
+    for engine in ('lxml', 'soup'):
+        candidates = list(get_page_parser(engine, container_tags=['div'], **options).iter_articles(page, 'utf-8'))
+        assert [tuple(candidate) for candidate in candidates] == [('/noticia/1', 'Titulo', 'ontem', 'Texto')]
+
+
+def test_motor_desconhecido():
+    with pytest.raises(ValueError):
+        get_page_parser('regex')
+
+
+def test_html_to_text():
+    assert html_to_text('<p>Resumo <b>em</b>\n negrito</p>') == 'Resumo em negrito'
+    assert html_to_text('texto  simples') == 'texto simples'
+    assert html_to_text(None) == ''
+
+
+def test_link_counter_para_no_limite():
+    counter = LinkCounter(_is_news, limit=2)
+    chunks = [PAGE[i:i + 64] for i in range(0, len(PAGE), 64)]
+    stopped_at = next(index for index, chunk in enumerate(chunks) if counter(chunk))
+    assert counter.count == 2
+    assert stopped_at < len(chunks) - 1
@@ -0,0 +1,91 @@
+"""
+Testes do dataset Parquet particionado (DataProcessor.save_to_parquet/read_parquet)
+Execute com: python -m pytest -q test_parquet_output.py
+"""
+
+import os
+from datetime import date
+
+import pytest
+
+import data_processor
+from data_processor import DataProcessor
+from news_collector import ArticleBatch
+
+
+def _record(hash_id, source, collected_at):
+    return {
+        'title': f"Notícia {hash_id}",
+        'url': f"https://exemplo.com/{hash_id}",
+        'source': source,
+        'published_date': None,
+        'summary': 'Resumo',
+        'content': None,
+        'collected_at': collected_at,
+        'hash_id': hash_id
+    }
+
+
+@pytest.fixture
+def processor(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_processor, 'OUTPUT_DIR', str(tmp_path / 'output'))
+    monkeypatch.setattr(data_processor, 'DATA_DIR', str(tmp_path / 'data'))
+    os.makedirs(tmp_path / 'data')
+    return DataProcessor()
+
+
+@pytest.fixture
+def dataset(processor, tmp_path):
+    directory = str(tmp_path / 'parquet')
+    processor.save_to_parquet(ArticleBatch.from_records([
+        _record('a', 'G1', '2024-05-14T09:00:00'),
+        _record('b', 'Folha', '2024-05-14T10:00:00'),
+    ]), directory)
+    processor.save_to_parquet(ArticleBatch.from_records([
+        _record('c', 'G1', '2024-05-15T09:00:00'),
+        _record('d', 'UOL', '2024-05-15T11:00:00'),
+    ]), directory)
+    return directory
+
+
+def test_gravacao_cria_particoes_por_data_e_fonte(dataset):
+    partitions = sorted(os.path.relpath(root, dataset) for root, _, files in os.walk(dataset) if files)
+    assert partitions == [
+        os.path.join('date=2024-05-14', 'source=Folha'),
+        os.path.join('date=2024-05-14', 'source=G1'),
+        os.path.join('date=2024-05-15', 'source=G1'),
+        os.path.join('date=2024-05-15', 'source=UOL'),
+    ]
+
+
+def test_leitura_completa(processor, dataset):
+    frame = processor.read_parquet(directory=dataset)
+    assert sorted(frame['hash_id']) == ['a', 'b', 'c', 'd']
+    assert frame.loc[frame['hash_id'] == 'a', 'title'].item() == 'Notícia a'
+
+
+def test_leitura_filtra_particoes_e_colunas(processor, dataset):
+    frame = processor.read_parquet(start=date(2024, 5, 15), sources=['G1'],
+                                   columns=['hash_id', 'title'], directory=dataset)
+    assert frame.to_dict('records') == [{'hash_id': 'c', 'title': 'Notícia c'}]
+
+    frame = processor.read_parquet(end=date(2024, 5, 14), directory=dataset)
+    assert sorted(frame['hash_id']) == ['a', 'b']
+
+
+def test_leitura_nao_abre_particoes_descartadas(processor, dataset):
+    # Um arquivo corrompido fora do filtro só quebraria a leitura se fosse aberto
+    broken = os.path.join(dataset, 'date=2024-05-15', 'source=UOL')
+    for filename in os.listdir(broken):
+        with open(os.path.join(broken, filename), 'wb') as f:
+            f.write(b'corrompido')
+
+    frame = processor.read_parquet(end=date(2024, 5, 14), directory=dataset)
+    assert sorted(frame['hash_id']) == ['a', 'b']
+    with pytest.raises(Exception):
+        processor.read_parquet(directory=dataset)
+
+
+def test_dataset_inexistente(processor, tmp_path):
+    frame = processor.read_parquet(columns=['hash_id'], directory=str(tmp_path / 'vazio'))
+    assert list(frame.columns) == ['hash_id'] and frame.empty
@@ -0,0 +1,68 @@
+"""
+Testes do limitador de taxa por host (rate_limiter)
+Execute com: python -m pytest -q test_rate_limiter.py
+"""
+
+import pytest
+
+import rate_limiter
+from rate_limiter import HostRateLimiter, TokenBucket
+
+
+class _Clock:
+    """Relógio falso: sleep apenas avança o tempo"""
+
+    def __init__(self):
+        self.now = 100.0
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = _Clock()
+    monkeypatch.setattr(rate_limiter.time, 'monotonic', fake.monotonic)
+    monkeypatch.setattr(rate_limiter.time, 'sleep', fake.sleep)
+    return fake
+
+
+def test_rajada_e_fila(clock):
+    bucket = TokenBucket(requests_per_second=2, burst=2)
+    assert [bucket.reserve() for _ in range(4)] == [0.0, 0.0, 0.5, 1.0]
+
+
+def test_tokens_repostos_com_o_tempo(clock):
+    bucket = TokenBucket(requests_per_second=1, burst=1)
+    assert bucket.acquire() == 0.0
+    assert bucket.acquire() == 1.0
+    clock.now += 5
+    # A capacidade limita o acúmulo: só um token volta
+    assert bucket.acquire() == 0.0
+    assert bucket.acquire() == 1.0
+    assert clock.slept == [1.0, 1.0]
+
+
+def test_taxa_zero_desativa_o_limite(clock):
+    bucket = TokenBucket(requests_per_second=0)
+    assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+
+
+def test_hosts_independentes(clock):
+    limiter = HostRateLimiter(requests_per_second=1, burst=1)
+    assert limiter.acquire('https://g1.globo.com/a') == 0.0
+    assert limiter.acquire('https://www.folha.uol.com.br/b') == 0.0
+    assert limiter.acquire('https://G1.globo.com/c') == 1.0
+
+
+def test_configure_mantem_o_limite_mais_restritivo(clock):
+    limiter = HostRateLimiter(requests_per_second=10, burst=5)
+    limiter.configure('exemplo.com', requests_per_second=0.5, burst=1)
+    limiter.configure('exemplo.com', requests_per_second=2, burst=3)
+    assert limiter.acquire('https://exemplo.com/') == 0.0
+    assert limiter.acquire('https://exemplo.com/') == 2.0
@@ -0,0 +1,70 @@
+"""
+Testes da renderização do relatório HTML (report_renderer)
+Execute com: python -m pytest -q test_report_renderer.py
+"""
+
+import io
+from datetime import datetime
+
+import report_renderer
+from news_collector import ArticleBatch, NewsArticle
+from report_renderer import ReportRenderer
+
+ARTICLES = [
+    NewsArticle(title="Startup <lança> chip", url="https://exemplo.com/1?a=1&b=2", source='G1',
+                summary="x" * 250),
+    NewsArticle(title="Satélite em órbita", url="https://exemplo.com/2", source='Folha')
+]
+
+
+class _FrozenDatetime(datetime):
+    moment = datetime(2024, 5, 15, 10, 0, 0)
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.moment
+
+
+def test_conteudo_escapado_e_resumo_truncado():
+    html = ReportRenderer().render(ARTICLES, 'Últimas 24 horas')
+    assert 'Startup &lt;lança&gt; chip' in html
+    assert 'href="https://exemplo.com/1?a=1&amp;b=2"' in html
+    assert 'x' * 200 + '...' in html and 'x' * 201 not in html
+    assert 'Resumo não disponível' in html
+    assert '<strong>Total de notícias:</strong> 2' in html
+    assert html.rstrip().endswith('</html>')
+
+
+def test_render_to_igual_a_render_e_iter_chunks():
+    renderer = ReportRenderer(cache_size=0)
+    buffer = io.StringIO()
+    renderer.render_to(buffer, ARTICLES, 'Hoje')
+    chunks = list(renderer.iter_chunks(ARTICLES, 'Hoje'))
+    assert len(chunks) == len(ARTICLES) + 2
+    # Ignora a linha do horário, que muda entre chamadas
+    strip = lambda html: [line for line in html.splitlines() if 'Gerado em' not in line]
+    assert strip(buffer.getvalue()) == strip(renderer.render(ARTICLES, 'Hoje')) == strip(''.join(chunks))
+
+
+def test_cache_nao_congela_o_horario(monkeypatch):
+    renderer = ReportRenderer(cache_size=2)
+    monkeypatch.setattr(report_renderer, 'datetime', _FrozenDatetime)
+    monkeypatch.setattr(_FrozenDatetime, 'moment', datetime(2024, 5, 15, 10, 0, 0))
+    first = renderer.render(ARTICLES, 'Hoje')
+    assert 'Gerado em: 15/05/2024 10:00:00' in first
+
+    _FrozenDatetime.moment = datetime(2024, 5, 15, 11, 0, 0)
+    second = renderer.render(ARTICLES, 'Hoje')
+    assert 'Gerado em: 15/05/2024 11:00:00' in second
+    assert first.replace('10:00:00', '11:00:00') == second
+
+
+def test_render_to_preenche_o_cache():
+    renderer = ReportRenderer(cache_size=1)
+    renderer.render_to(io.StringIO(), ARTICLES, 'Hoje')
+    assert len(renderer._cache) == 1
+
+    # Outro conjunto ou outro período geram outra entrada (LRU de tamanho 1)
+    renderer.render(ARTICLES[:1], 'Hoje')
+    assert len(renderer._cache) == 1
+    assert renderer.render(ArticleBatch.from_articles(ARTICLES[:1]), 'Hoje').count('class="article"') == 1
@@ -0,0 +1,96 @@
+"""
+Testes das retentativas e do circuit breaker (resilience)
+Execute com: python -m pytest -q test_resilience.py
+"""
+
+import pytest
+
+import resilience
+from resilience import CircuitBreaker, CircuitBreakerRegistry, RetryPolicy
+
+
+class _Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = _Clock()
+    monkeypatch.setattr(resilience.time, 'time', fake)
+    return fake
+
+
+@pytest.fixture
+def registry(tmp_path, clock):
+    return CircuitBreakerRegistry(str(tmp_path / 'circuitos.json'), failure_threshold=3, recovery_timeout=60)
+
+
+def test_circuito_abre_apos_falhas_seguidas(registry):
+    breaker = registry.get('g1')
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED and breaker.allow_request()
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+
+
+def test_sucesso_zera_as_falhas(registry):
+    breaker = registry.get('g1')
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_meio_aberto_fecha_com_sucesso(registry, clock):
+    breaker = registry.get('g1')
+    for _ in range(3):
+        breaker.record_failure()
+
+    clock.now += 59
+    assert not breaker.allow_request()
+    clock.now += 1
+    assert breaker.allow_request()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert registry.get_state('g1')['failures'] == 0
+
+
+def test_meio_aberto_reabre_com_uma_falha(registry, clock):
+    breaker = registry.get('g1')
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now += 60
+    assert breaker.allow_request()
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+
+
+def test_estado_persiste_e_fontes_sao_independentes(tmp_path, clock):
+    state_file = str(tmp_path / 'circuitos.json')
+    registry = CircuitBreakerRegistry(state_file, failure_threshold=1, recovery_timeout=60)
+    registry.get('g1').record_failure()
+
+    reopened = CircuitBreakerRegistry(state_file, failure_threshold=1, recovery_timeout=60)
+    assert reopened.get('g1').state == CircuitBreaker.OPEN
+    assert reopened.get('folha').allow_request()
+
+
+def test_backoff_com_jitter_e_retry_after():
+    policy = RetryPolicy(max_retries=3, backoff_base=1.0, backoff_max=5.0)
+    for attempt in range(6):
+        assert 0 <= policy.delay(attempt) <= min(5.0, 2 ** attempt)
+    assert policy.delay(0, retry_after='3') == 3.0
+    assert policy.delay(0, retry_after='120') == 5.0
+    assert policy.should_retry_status(503) and not policy.should_retry_status(404)
@@ -0,0 +1,62 @@
+"""
+Testes do estado incremental por fonte (source_state)
+Execute com: python -m pytest -q test_source_state.py
+"""
+
+import news_collector
+from news_collector import NewsArticle
+from source_state import SourceState, SourceStateStore, url_id
+
+LAST_PUBLISHED = '2024-05-15T10:00:00-03:00'
+OLDER = '2024-05-14T10:00:00-03:00'
+NEWER = '2024-05-16T10:00:00-03:00'
+
+
+def test_fonte_ordenada_usa_url_e_data():
+    state = SourceState({url_id('https://exemplo.com/vista')}, LAST_PUBLISHED, stop_after=2, ordered=True)
+    assert state.is_known('https://exemplo.com/vista')
+    assert state.is_known('https://exemplo.com/antiga', OLDER)
+    assert state.exhausted
+    assert not state.is_known('https://exemplo.com/nova', NEWER)
+    assert not state.exhausted
+
+
+def test_fonte_html_usa_apenas_a_url():
+    state = SourceState({url_id('https://exemplo.com/vista')}, LAST_PUBLISHED, stop_after=2)
+    assert state.is_known('https://exemplo.com/vista')
+    # Data antiga não torna conhecida uma URL nunca vista, e não há parada antecipada
+    assert not state.is_known('https://exemplo.com/antiga', OLDER)
+    assert state.is_known('https://exemplo.com/vista') and state.is_known('https://exemplo.com/vista')
+    assert not state.exhausted
+
+
+def test_has_seen_nao_altera_a_sequencia():
+    state = SourceState({url_id('https://exemplo.com/vista')}, None, stop_after=1, ordered=True)
+    assert state.has_seen('https://exemplo.com/vista')
+    assert not state.exhausted
+
+
+def test_novas_so_contam_depois_do_save(tmp_path):
+    store = SourceStateStore(str(tmp_path / 'fontes.json'), max_ids=2)
+    state = store.begin('g1')
+    for name in ('a', 'b', 'c'):
+        state.record(f'https://exemplo.com/{name}', NEWER)
+    assert not SourceStateStore(str(tmp_path / 'fontes.json')).begin('g1').has_seen('https://exemplo.com/c')
+
+    store.save()
+    reopened = SourceStateStore(str(tmp_path / 'fontes.json'), max_ids=2).begin('g1', ordered=True)
+    assert reopened.has_seen('https://exemplo.com/c')
+    assert not reopened.has_seen('https://exemplo.com/a')
+    assert reopened.is_known('https://exemplo.com/outra', LAST_PUBLISHED)
+
+
+def test_pagina_em_cache_da_o_mesmo_resultado_que_a_coleta_ao_vivo():
+    collector = news_collector.create_collector(news_collector.NEWS_SOURCES['uol_tilt'])
+    articles = [
+        NewsArticle(title="Notícia vista", url='https://exemplo.com/vista', source='UOL', published_date=NEWER),
+        NewsArticle(title="Notícia com data antiga", url='https://exemplo.com/antiga', source='UOL',
+                    published_date=OLDER)
+    ]
+    state = SourceState({url_id('https://exemplo.com/vista')}, LAST_PUBLISHED, stop_after=1)
+    new = collector._only_new(articles, state)
+    assert [article.url for article in new] == ['https://exemplo.com/antiga']
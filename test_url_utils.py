@@ -0,0 +1,66 @@
+"""
+Testes da canonicalização de URLs (url_utils)
+Execute com: python -m pytest -q test_url_utils.py
+"""
+
+import re
+
+import pytest
+
+from url_utils import canonicalize_url
+
+
+@pytest.mark.parametrize('url, expected', [
+    # Esquema, host e porta padrão
+    ('HTTP://WWW.Exemplo.com.br:80/Noticia', 'https://www.exemplo.com.br/Noticia'),
+    ('https://exemplo.com:8443/a', 'https://exemplo.com:8443/a'),
+    ('https://exemplo.com./a', 'https://exemplo.com/a'),
+    # Rastreamento, fragmento e ordem da query
+    ('https://exemplo.com/a?utm_source=x&b=2&fbclid=y&a=1#topo', 'https://exemplo.com/a?a=1&b=2'),
+    ('https://exemplo.com/a?q=', 'https://exemplo.com/a?q='),
+    # Barras
+    ('https://exemplo.com/a//b/', 'https://exemplo.com/a/b'),
+    ('https://exemplo.com', 'https://exemplo.com/'),
+    # Variantes AMP
+    ('https://exemplo.com/noticia/amp', 'https://exemplo.com/noticia'),
+    ('https://exemplo.com/noticia/amp/', 'https://exemplo.com/noticia'),
+    ('https://exemplo.com/noticia.amp.html', 'https://exemplo.com/noticia.html'),
+    ('https://exemplo.com/noticia?outputType=amp', 'https://exemplo.com/noticia'),
+    ('https://amp.exemplo.com/noticia', 'https://exemplo.com/noticia'),
+    ('https://exemplo.com/blog/amp/noticia', 'https://exemplo.com/blog/amp/noticia'),
+    ('https://amp.com/noticia', 'https://amp.com/noticia'),
+    ('https://exemplo.com/sample/x', 'https://exemplo.com/sample/x'),
+    # IPv6
+    ('http://[::1]:8080/x', 'https://[::1]:8080/x'),
+    ('http://[2001:db8::1]/x', 'https://[2001:db8::1]/x'),
+])
+def test_canonicalize_url(url, expected):
+    assert canonicalize_url(url) == expected
+
+
+@pytest.mark.parametrize('url', [
+    'mailto:redacao@exemplo.com',
+    'javascript:void(0)',
+    'http://[::1/x',
+    'https://exemplo.com:porta/x',
+])
+def test_urls_nao_http_ou_invalidas_ficam_como_estao(url):
+    assert canonicalize_url(url) == url
+
+
+def test_sem_forcar_https():
+    assert canonicalize_url('http://exemplo.com/a', force_https=False) == 'http://exemplo.com/a'
+
+
+def test_reescritas_da_fonte_antes_da_normalizacao():
+    rewrites = [(re.compile(r'^https?://m\.'), 'https://www.')]
+    assert canonicalize_url('http://m.exemplo.com/a/?utm_medium=x', rewrites) == 'https://www.exemplo.com/a'
+
+
+def test_mesma_noticia_mesma_url():
+    variants = [
+        'http://g1.globo.com/tecnologia/noticia/x.ghtml?utm_source=twitter',
+        'https://g1.globo.com/tecnologia/noticia/x.ghtml#comentarios',
+        'https://G1.globo.com:443/tecnologia/noticia/x.ghtml/',
+    ]
+    assert len({canonicalize_url(url) for url in variants}) == 1
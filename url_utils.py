@@ -0,0 +1,87 @@
+"""
+Canonicalização de URLs para o sistema de coleta de notícias
+Remove parâmetros de rastreamento, fragmentos e variantes AMP (segmento /amp
+final, sufixo .amp e host amp.) para que a mesma notícia gere sempre a mesma
+URL (e o mesmo hash)
+"""
+
+import re
+from typing import Iterable, Pattern, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Parâmetros que só identificam campanha/origem do clique
+TRACKING_PARAMS = frozenset([
+    'fbclid', 'gclid', 'dclid', 'gbraid', 'wbraid', 'msclkid', 'yclid', 'igshid',
+    'mc_cid', 'mc_eid', '_ga', '_gl', 'ref', 'ref_src', 'cmpid', 'xtor'
+])
+TRACKING_PREFIXES = ('utm_', 'pk_', 'hsa_')
+
+# Parâmetros que apenas selecionam a versão AMP da página
+AMP_PARAMS = frozenset(['amp', 'outputtype', 'usqp'])
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+_AMP_SUFFIX = re.compile(r'\.amp(?=\.[a-z0-9]+$)|\.amp$', re.IGNORECASE)
+
+
+def _is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMS or name in AMP_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def _canonical_path(path: str) -> str:
+    """Remove o segmento /amp final, o sufixo .amp e a barra final
+
+    Segmentos "amp" no meio do caminho (ex.: /blog/amp/noticia) fazem parte
+    da URL da notícia e são mantidos.
+    """
+    path = re.sub(r'/{2,}', '/', path)
+    if len(path) > 1:
+        path = path.rstrip('/')
+    segments = path.split('/')
+    if len(segments) > 1 and segments[-1].lower() == 'amp':
+        segments.pop()
+    segments[-1] = _AMP_SUFFIX.sub('', segments[-1])
+    path = '/'.join(segments)
+    return path or '/'
+
+
+def canonicalize_url(url: str, rewrites: Iterable[Tuple[Pattern, str]] = (),
+                     force_https: bool = True) -> str:
+    """Retorna a forma canônica da URL
+
+    Aplica primeiro as regras de reescrita da fonte (pares padrão compilado /
+    substituição, escritos contra a URL como aparece na página) e depois
+    normaliza esquema e host (minúsculas, sem porta padrão), remove fragmento,
+    parâmetros de rastreamento e variantes AMP e ordena a query.
+    """
+    for pattern, replacement in rewrites:
+        url = pattern.sub(replacement, url)
+
+    try:
+        parts = urlsplit(url.strip())
+        port = parts.port
+    except ValueError:
+        return url
+
+    scheme = parts.scheme.lower()
+    if scheme not in DEFAULT_PORTS:
+        return url
+
+    if force_https:
+        scheme = 'https'
+
+    host = (parts.hostname or '').rstrip('.')
+    if host.startswith('amp.') and host.count('.') > 1:
+        host = host[len('amp.'):]
+    if ':' in host:
+        # IPv6: hostname vem sem colchetes
+        host = f"[{host}]"
+    netloc = host if port is None or port == DEFAULT_PORTS.get(parts.scheme.lower()) else f"{host}:{port}"
+
+    query = urlencode(sorted(
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _is_tracking_param(name)
+    ))
+
+    return urlunsplit((scheme, netloc, _canonical_path(parts.path), query, ''))